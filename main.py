@@ -1,17 +1,138 @@
 import sys
 import os
+import argparse
+import multiprocessing
+import time
 
 # Add the current directory to sys.path so we can import src
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Start the profiler before anything else is imported so import costs are captured
+from src.utils.profiling import startup_profiler
+if "--profile-startup" in sys.argv:
+    startup_profiler.install()
+
 from src import storage
-from src.bot import bot, TOKEN
+from src.bot import create_bot, get_token
+from src.utils.sharding import get_sharding_config, get_clusters, parse_shard_range
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Hypixel Account Shop bot")
+    parser.add_argument("--profile-startup", action="store_true", help="Report import and setup_hook timings once ready")
+    parser.add_argument("--shards", help="Run only these shards in this process, e.g. 0-3 or 0,2")
+    parser.add_argument("--shard-count", type=int, help="Total number of shards across all clusters")
+    parser.add_argument("--cluster", action="store_true", help="Launch one process per cluster configured in config.json")
+    parser.add_argument("--memory-benchmark", type=int, nargs="?", const=1000, metavar="GUILDS",
+                        help="Report memory per 1000 guilds for each runtime profile (offline) and exit")
+    return parser.parse_args()
+
+def run_bot(token, shard_ids=None, shard_count=None):
+    """Run a bot in this process"""
+    storage.ensure_files()
+    create_bot(shard_ids=shard_ids, shard_count=shard_count).run(token)
+
+# Seconds before restarting a crashed cluster, doubled after each quick crash
+RESTART_DELAY = 5
+MAX_RESTART_DELAY = 300
+# A cluster that crashes within this many seconds of starting crashed "quickly"
+QUICK_CRASH_SECONDS = 60
+# Consecutive quick crashes (a bad token, a startup error) after which a cluster is given up on
+MAX_QUICK_CRASHES = 5
+
+def launch_clusters(token, clusters, shard_count):
+    """Run each cluster in its own process and restart clusters that crash, with backoff"""
+    ctx = multiprocessing.get_context("spawn")
+    processes = {}
+    # Structure: {cluster_index: start time (monotonic)}
+    started_at = {}
+    # Structure: {cluster_index: consecutive quick crashes}
+    quick_crashes = {}
+    # Structure: {cluster_index: restart time (monotonic)}
+    restarts = {}
+
+    def start(index):
+        shard_ids = clusters[index]
+        process = ctx.Process(
+            target=run_bot,
+            args=(token, shard_ids, shard_count),
+            name=f"cluster-{index}",
+            daemon=False
+        )
+        process.start()
+        processes[index] = process
+        started_at[index] = time.monotonic()
+        print(f"🚀 Started cluster {index} (PID {process.pid}) with shards {shard_ids} of {shard_count}")
+
+    for index in range(len(clusters)):
+        start(index)
+
+    try:
+        while processes or restarts:
+            time.sleep(1)
+            now = time.monotonic()
+            for index, process in list(processes.items()):
+                if process.is_alive():
+                    continue
+                del processes[index]
+                if process.exitcode == 0:
+                    print(f"Cluster {index} exited")
+                    continue
+
+                if now - started_at[index] < QUICK_CRASH_SECONDS:
+                    quick_crashes[index] = quick_crashes.get(index, 0) + 1
+                else:
+                    quick_crashes[index] = 1
+                if quick_crashes[index] >= MAX_QUICK_CRASHES:
+                    print(f"❌ Cluster {index} crashed {quick_crashes[index]} times in a row right after starting, giving up on it")
+                    continue
+                delay = min(RESTART_DELAY * 2 ** (quick_crashes[index] - 1), MAX_RESTART_DELAY)
+                print(f"⚠️ Cluster {index} crashed (exit code {process.exitcode}), restarting in {delay}s...")
+                restarts[index] = now + delay
+
+            for index, restart_at in list(restarts.items()):
+                if now >= restart_at:
+                    del restarts[index]
+                    start(index)
+    except KeyboardInterrupt:
+        for process in processes.values():
+            process.terminate()
+        for process in processes.values():
+            process.join()
 
 if __name__ == "__main__":
+    args = parse_args()
     storage.ensure_files()
+    if args.memory_benchmark:
+        from src.utils.memory_bench import run_benchmark
+        print(run_benchmark(guilds=args.memory_benchmark))
+        sys.exit(0)
+
+    TOKEN = get_token()
     if not TOKEN:
         print("Error: DISCORD_TOKEN is not set in .env or config.json")
         sys.exit(1)
-    
-    print("Starting bot...")
-    bot.run(TOKEN)
\ No newline at end of file
+
+    if args.cluster:
+        sharding_cfg = get_sharding_config()
+        if args.shard_count:
+            sharding_cfg["shard_count"] = args.shard_count
+        try:
+            clusters = get_clusters(sharding_cfg)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        if not clusters:
+            print("Error: no clusters configured under sharding.clusters in config.json")
+            sys.exit(1)
+        print(f"Starting {len(clusters)} cluster(s)...")
+        launch_clusters(TOKEN, clusters, sharding_cfg["shard_count"])
+    elif args.shards:
+        shard_count = args.shard_count or get_sharding_config()["shard_count"]
+        if not shard_count:
+            print("Error: --shard-count (or sharding.shard_count in config.json) is required with --shards")
+            sys.exit(1)
+        print(f"Starting bot with shards {args.shards} of {shard_count}...")
+        run_bot(TOKEN, parse_shard_range(args.shards), shard_count)
+    else:
+        print("Starting bot...")
+        run_bot(TOKEN)
@@ -17,117 +17,197 @@ from src import storage
 from src.ui.views import TicketPanel, MFAPanel, CoinPanel, AccountBuyPanel
 from src.ui.ticket_views import OpenedTicketView
 from src.ui.vouch_views import VouchButtonView
+from src.utils.deferral import interaction_budget
+from src.utils.http_scheduler import http_scheduler
 from src.utils.logging import BotLogger
+from src.utils.members import member_cache
+from src.utils.metrics import metrics
+from src.utils.profiling import startup_profiler
+from src.utils.runtime_profile import build_intents, get_runtime_profile
+from src.utils.sharding import get_sharding_config
+from src.utils.watchdog import loop_watchdog
 
 load_dotenv()
-app_cfg = storage.load_app_config()
 
-TOKEN = os.getenv("DISCORD_TOKEN") or app_cfg.get("token")
+def get_token():
+    """Resolve the bot token from the environment or config.json"""
+    return os.getenv("DISCORD_TOKEN") or storage.load_app_config().get("token")
 
-intents = discord.Intents.default()
-intents.message_content = True
-intents.guilds = True
-intents.members = True
+EXTENSIONS = [
+    "src.cogs.owner",
+    "src.cogs.panel",
+    "src.cogs.tickets",
+    "src.cogs.vouch",
+    "src.cogs.pricing",
+    "src.cogs.backup",
+    "src.cogs.moderation",
+    "src.cogs.wallet",
+    "src.cogs.utility",
+    "src.cogs.status",
+    "src.cogs.stock",
+]
 
-class ShopBot(commands.Bot):
-    def __init__(self):
-        super().__init__(command_prefix="!", intents=intents)
+class ShopBotMixin:
+    """Behaviour shared by the single-shard and auto-sharded bots"""
+    
+    def __init__(self, **options):
+        # Resolved here rather than at import so importing this module doesn't read config.json
+        runtime_profile = get_runtime_profile()
+        options = {
+            "max_messages": runtime_profile["max_messages"],
+            "http_trace": http_scheduler.trace_config(),
+            **member_cache.client_options(),
+            **options
+        }
+        super().__init__(command_prefix="!", intents=build_intents(runtime_profile), **options)
+        self.runtime_profile = runtime_profile
+        self.tree.on_error = self.on_app_command_error
+        self.add_listener(self.count_interaction, "on_interaction")
+        self.add_listener(self.count_message, "on_message")
     
     async def setup_hook(self):
+        loop_watchdog.start()
+        
         # Add persistent views
-        self.add_view(TicketPanel())
-        self.add_view(MFAPanel())
-        self.add_view(CoinPanel())
-        self.add_view(AccountBuyPanel())
-        self.add_view(OpenedTicketView())
-        self.add_view(VouchButtonView())
+        with startup_profiler.phase("persistent views"):
+            self.add_view(TicketPanel())
+            self.add_view(MFAPanel())
+            self.add_view(CoinPanel())
+            self.add_view(AccountBuyPanel())
+            self.add_view(OpenedTicketView())
+            self.add_view(VouchButtonView())
         
         # Load cogs
-        await self.load_extension("src.cogs.owner")
-        await self.load_extension("src.cogs.panel")
-        await self.load_extension("src.cogs.tickets")
-        await self.load_extension("src.cogs.vouch")
-        await self.load_extension("src.cogs.pricing")
-        await self.load_extension("src.cogs.backup")
-        await self.load_extension("src.cogs.moderation")
-        await self.load_extension("src.cogs.wallet")
-        await self.load_extension("src.cogs.utility")
-        await self.load_extension("src.cogs.status")
-        await self.load_extension("src.cogs.stock")
+        for extension in EXTENSIONS:
+            with startup_profiler.phase(f"load {extension}"):
+                await self.load_extension(extension)
         
         # Sync commands globally first to register new commands
+        with startup_profiler.phase("global command sync"):
+            try:
+                synced = await self.tree.sync()
+                print(f"✅ Synced {len(synced)} command(s) globally")
+            except Exception as e:
+                print(f"⚠️ Error syncing globally: {e}")
+    
+    async def close(self):
+        loop_watchdog.stop()
+        await super().close()
+    
+    async def count_interaction(self, interaction: discord.Interaction):
+        shard_id = interaction.guild.shard_id if interaction.guild else None
+        metrics.incr("interactions", shard_id=shard_id)
+        interaction_budget.watch(interaction)
+        http_scheduler.note_interactive()
+        if interaction.guild:
+            member_cache.note_interaction(interaction)
+    
+    async def count_message(self, message: discord.Message):
+        if message.guild:
+            metrics.incr("messages", shard_id=message.guild.shard_id)
+    
+    async def on_shard_ready(self, shard_id: int):
+        guild_count = sum(1 for g in self.guilds if g.shard_id == shard_id)
+        print(f"✅ Shard {shard_id} ready ({guild_count} guild(s))")
+    
+    async def on_ready(self):
+        print(f"\n{'='*50}")
+        print(f"Bot is ready!")
+        print(f"Logged in as: {self.user} (ID: {self.user.id})")
+        print(f"Connected to {len(self.guilds)} guild(s)")
+        print(f"Runtime profile: {self.runtime_profile['name']}")
+        if self.shard_count:
+            shard_ids = getattr(self, "shard_ids", None)
+            print(f"Shards: {shard_ids if shard_ids is not None else 'all'} of {self.shard_count}")
+
+        startup_profiler.mark_ready()
+        if startup_profiler.enabled and not startup_profiler.reported:
+            startup_profiler.reported = True
+            print(startup_profiler.report())
+
+        # Sync commands to all guilds (guild-specific, faster)
+        print("\nSyncing commands to guilds...")
         try:
-            synced = await self.tree.sync()
-            print(f"✅ Synced {len(synced)} command(s) globally")
+            # Wait a bit for commands to be fully registered
+            await asyncio.sleep(1)
+            
+            for guild in self.guilds:
+                synced = await self.tree.sync(guild=guild)
+                print(f"✅ Synced {len(synced)} command(s) to {guild.name} (ID: {guild.id})")
+                if synced:
+                    for cmd in synced:
+                        print(f"   - {cmd.name}")
+                else:
+                    print(f"   ⚠️ No commands synced (may need to wait or sync globally)")
         except Exception as e:
-            print(f"⚠️ Error syncing globally: {e}")
-
-bot = ShopBot()
-
-@bot.event
-async def on_ready():
-    print(f"\n{'='*50}")
-    print(f"Bot is ready!")
-    print(f"Logged in as: {bot.user} (ID: {bot.user.id})")
-    print(f"Connected to {len(bot.guilds)} guild(s)")
-
-    # Sync commands to all guilds (guild-specific, faster)
-    print("\nSyncing commands to guilds...")
-    try:
-        # Wait a bit for commands to be fully registered
-        await asyncio.sleep(1)
-        
-        for guild in bot.guilds:
-            synced = await bot.tree.sync(guild=guild)
-            print(f"✅ Synced {len(synced)} command(s) to {guild.name} (ID: {guild.id})")
-            if synced:
-                for cmd in synced:
-                    print(f"   - {cmd.name}")
-            else:
-                print(f"   ⚠️ No commands synced (may need to wait or sync globally)")
-    except Exception as e:
-        print(f"❌ Error syncing commands: {e}")
-        traceback.print_exc()
+            print(f"❌ Error syncing commands: {e}")
+            traceback.print_exc()
 
-    print(f"{'='*50}\n")
+        print(f"{'='*50}\n")
 
-@bot.event
-async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
-    """Handle command errors and log them"""
-    if interaction.guild:
-        await BotLogger.log_error(interaction.guild, error, f"Command: {interaction.command.name if interaction.command else 'Unknown'}")
-    
-    if isinstance(error, app_commands.CommandOnCooldown):
-        await interaction.response.send_message(f"⏳ This command is on cooldown. Try again in {error.retry_after:.2f} seconds.", ephemeral=True)
-    elif isinstance(error, app_commands.MissingPermissions):
-        await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
-    elif isinstance(error, app_commands.BotMissingPermissions):
-        await interaction.response.send_message("❌ I don't have the required permissions to execute this command.", ephemeral=True)
-    else:
-        error_msg = f"❌ An error occurred: {str(error)}"
-        if len(error_msg) > 2000:
-            error_msg = error_msg[:1997] + "..."
-        
-        try:
-            if interaction.response.is_done():
-                await interaction.followup.send(error_msg, ephemeral=True)
-            else:
-                await interaction.response.send_message(error_msg, ephemeral=True)
-        except:
-            pass
+    async def on_app_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        """Handle command errors and log them"""
+        if interaction.guild:
+            await BotLogger.log_error(interaction.guild, error, f"Command: {interaction.command.name if interaction.command else 'Unknown'}")
         
-        print(f"Command error: {error}")
+        if isinstance(error, app_commands.CommandOnCooldown):
+            await interaction.response.send_message(f"⏳ This command is on cooldown. Try again in {error.retry_after:.2f} seconds.", ephemeral=True)
+        elif isinstance(error, app_commands.MissingPermissions):
+            await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
+        elif isinstance(error, app_commands.BotMissingPermissions):
+            await interaction.response.send_message("❌ I don't have the required permissions to execute this command.", ephemeral=True)
+        else:
+            error_msg = f"❌ An error occurred: {str(error)}"
+            if len(error_msg) > 2000:
+                error_msg = error_msg[:1997] + "..."
+            
+            try:
+                if interaction.response.is_done():
+                    await interaction.followup.send(error_msg, ephemeral=True)
+                else:
+                    await interaction.response.send_message(error_msg, ephemeral=True)
+            except:
+                pass
+            
+            print(f"Command error: {error}")
+            traceback.print_exc()
+
+    async def on_error(self, event, *args, **kwargs):
+        """Handle general errors"""
+        print(f"Error in event {event}:")
         traceback.print_exc()
 
-@bot.event
-async def on_error(event, *args, **kwargs):
-    """Handle general errors"""
-    print(f"Error in event {event}:")
-    traceback.print_exc()
+class ShopBot(ShopBotMixin, commands.Bot):
+    """Single process, single shard bot"""
+
+class ShardedShopBot(ShopBotMixin, commands.AutoShardedBot):
+    """Auto-sharded bot, optionally limited to a range of shards (one cluster)"""
+
+def create_bot(shard_ids=None, shard_count=None):
+    """Create the bot for the configured sharding mode
+
+    Without sharding enabled in config.json this is a plain single-shard bot.
+    With sharding enabled, the bot runs the given shards (or lets Discord pick
+    the shard count) and guild data is stored per guild so clusters never
+    load or overwrite each other's state.
+    """
+    sharding_cfg = get_sharding_config()
+    if not sharding_cfg["enabled"] and shard_ids is None:
+        storage.enable_guild_partitioning(False)
+        return ShopBot()
+    
+    storage.enable_guild_partitioning(True)
+    shard_count = shard_count or sharding_cfg["shard_count"]
+    if shard_ids is not None:
+        if not shard_count:
+            raise ValueError("A shard count is required when running a range of shards")
+        return ShardedShopBot(shard_ids=list(shard_ids), shard_count=shard_count)
+    return ShardedShopBot(shard_count=shard_count)
 
 if __name__ == "__main__":
+    storage.ensure_files()
+    TOKEN = get_token()
     if not TOKEN:
         print("Error: DISCORD_TOKEN is not set in .env or config.json")
         sys.exit(1)
-    storage.ensure_files()
-    bot.run(TOKEN)
+    create_bot().run(TOKEN)
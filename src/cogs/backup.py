@@ -5,6 +5,7 @@ import json
 import os
 import uuid
 from datetime import datetime
+from src.utils.http_scheduler import http_scheduler
 from src.utils.permissions import is_owner
 
 class Backup(commands.Cog):
@@ -33,8 +34,14 @@ class Backup(commands.Cog):
         
         # Fetch all messages
         messages_data = []
+        fetched = 0
         try:
             async for message in channel.history(limit=None, oldest_first=True):
+                # History comes 100 messages per request; give way to interactive traffic between pages
+                fetched += 1
+                if fetched % 100 == 0:
+                    await http_scheduler.wait_turn()
+                
                 # Skip system messages
                 if message.type != discord.MessageType.default:
                     continue
@@ -198,21 +205,18 @@ class Backup(commands.Cog):
                     
                     embeds.append(embed)
                 
-                # Send via webhook
-                await webhook.send(
-                    content=content if content else None,
-                    embeds=embeds if embeds else None,
-                    username=author_name,
-                    avatar_url=author_avatar,
-                    wait=True
-                )
+                # Send via webhook, giving way to interactive traffic
+                async with http_scheduler.background():
+                    await webhook.send(
+                        content=content if content else None,
+                        embeds=embeds if embeds else None,
+                        username=author_name,
+                        avatar_url=author_avatar,
+                        wait=True
+                    )
                 
                 restored_count += 1
                 
-                # Small delay to avoid rate limits
-                import asyncio
-                await asyncio.sleep(0.5)
-                
             except Exception as e:
                 print(f"Error restoring message {msg_data.get('id')}: {e}")
                 failed_count += 1
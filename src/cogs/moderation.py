@@ -1,18 +1,55 @@
 import discord
-from discord.ext import commands
+import io
+from discord.ext import commands, tasks
 from discord import app_commands
 from src import storage
-from src.utils.permissions import is_owner, is_staff
+from src.utils.blacklist import blacklist as blacklist_cache
+from src.utils.bulk import MAX_TARGETS, parse_user_ids, resolve_members, run_bulk
+from src.utils.escalation import ACTIONS, escalation
+from src.utils.http_scheduler import http_scheduler
+from src.utils.permissions import is_bot_owner, is_owner, is_staff
 from src.utils.logging import BotLogger
+from src.utils.members import member_cache
+from src.utils.raid import raid_detector
 from src.utils.rate_limit import rate_limiter
 from datetime import datetime, timedelta
 import asyncio
 
+# Largest blacklist file /blacklist_import accepts
+MAX_IMPORT_SIZE = 2 * 1024 * 1024
+# Discord's bulk ban endpoint takes at most this many users per request
+BULK_BAN_CHUNK = 200
+
 class Moderation(commands.Cog):
     """Moderation commands and abuse prevention"""
     
     def __init__(self, bot):
         self.bot = bot
+        self.warning_expiry_task.start()
+    
+    def cog_unload(self):
+        self.warning_expiry_task.cancel()
+    
+    @tasks.loop(hours=1)
+    async def warning_expiry_task(self):
+        """Remove warnings that are older than each guild's decay window"""
+        for guild in self.bot.guilds:
+            try:
+                await escalation.expire(guild.id)
+            except Exception as e:
+                print(f"Error expiring warnings for {guild.id}: {e}")
+    
+    @warning_expiry_task.before_loop
+    async def before_warning_expiry_task(self):
+        await self.bot.wait_until_ready()
+    
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        raid_detector.record(member.guild, "join", member)
+    
+    @commands.Cog.listener()
+    async def on_raw_member_remove(self, payload: discord.RawMemberRemoveEvent):
+        member_cache.forget(payload.guild_id, payload.user.id)
     
     def has_mod_perms(self, interaction: discord.Interaction) -> bool:
         """Check if user has moderation permissions"""
@@ -34,8 +71,8 @@ class Moderation(commands.Cog):
         await interaction.response.defer()
         
         # Record warning
-        storage.add_warning(interaction.guild_id, user.id, interaction.user.id, reason)
-        warning_count = storage.get_warning_count(interaction.guild_id, user.id)
+        result = (await escalation.warn_many(interaction.guild_id, [user.id], interaction.user.id, reason))[0]
+        warning_count = result.active_warnings
         
         # Try to DM user
         try:
@@ -52,6 +89,9 @@ class Moderation(commands.Cog):
         except:
             pass  # User has DMs disabled
         
+        # Escalate after the DM, which a kicked or banned user could no longer receive
+        escalated = await escalation.apply(interaction.guild, user, result)
+        
         # Send confirmation
         embed = discord.Embed(
             title="⚠️ User Warned",
@@ -61,12 +101,16 @@ class Moderation(commands.Cog):
         )
         embed.add_field(name="Reason", value=reason, inline=False)
         embed.add_field(name="Total Warnings", value=str(warning_count), inline=True)
+        if escalated:
+            embed.add_field(name="Escalation", value=f"{user.mention} was {' and '.join(escalated)}.", inline=False)
         embed.set_footer(text=f"Warned by {interaction.user.name}")
         
         await interaction.followup.send(embed=embed)
         
         # Log warning
         await BotLogger.log_mod_action(interaction.guild, interaction.user, "warn", user, reason)
+        for action in escalated:
+            await BotLogger.log_mod_action(interaction.guild, interaction.user, "escalation", user, f"{action} after {warning_count} warnings")
     
     @app_commands.command(name="warnings", description="View warnings for a user (Staff only)")
     @app_commands.describe(user="User to check warnings for")
@@ -83,16 +127,22 @@ class Moderation(commands.Cog):
         if warning_count == 0:
             return await interaction.followup.send(f"✅ {user.mention} has no warnings.", ephemeral=True)
         
+        active_count = escalation.active_warnings(interaction.guild_id, user.id)
         embed = discord.Embed(
             title=f"Warnings for {user.name}",
-            description=f"Total: **{warning_count}**",
+            description=f"Total: **{warning_count}** (active: **{active_count}**)",
             color=0xff9900,
             timestamp=datetime.utcnow()
         )
         
-        # Show last 10 warnings
+        # Show last 10 warnings, looking up the moderators in one batch
+        moderators = await member_cache.resolve(
+            interaction.guild,
+            [warning.get('warned_by_id') for warning in warnings[-10:]],
+            interaction.client
+        )
         for i, warning in enumerate(warnings[-10:], start=1):
-            warned_by = interaction.guild.get_member(warning.get('warned_by_id'))
+            warned_by = moderators.get(warning.get('warned_by_id'))
             warned_by_name = warned_by.name if warned_by else "Unknown"
             timestamp = warning.get('timestamp', 'Unknown')
             embed.add_field(
@@ -212,7 +262,8 @@ class Moderation(commands.Cog):
         await interaction.response.defer()
         
         # Add to blacklist
-        storage.add_to_blacklist(interaction.guild_id, user.id, reason)
+        async with storage.transaction(interaction.guild_id) as tx:
+            tx.add_to_blacklist(user.id, reason)
         
         try:
             await user.ban(reason=reason, delete_message_days=delete_days)
@@ -237,20 +288,26 @@ class Moderation(commands.Cog):
     @app_commands.command(name="blacklist", description="Blacklist a user from using the bot (Owner only)")
     @app_commands.describe(
         user="User to blacklist",
-        reason="Reason for blacklist"
+        reason="Reason for blacklist",
+        global_list="Add the user to the global blacklist shared between guilds (bot owner only)"
     )
-    async def blacklist(self, interaction: discord.Interaction, user: discord.User, reason: str = "No reason provided"):
+    async def blacklist(self, interaction: discord.Interaction, user: discord.User, reason: str = "No reason provided", global_list: bool = False):
         """Blacklist a user from using the bot"""
-        if not is_owner(interaction):
+        if not is_owner(interaction) or (global_list and not is_bot_owner(interaction)):
             return await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
         
         await interaction.response.defer()
         
-        storage.add_to_blacklist(interaction.guild_id, user.id, reason)
+        if global_list:
+            await blacklist_cache.add_global({user.id: None}, reason, interaction.guild_id, interaction.user.id)
+        else:
+            async with storage.transaction(interaction.guild_id) as tx:
+                tx.add_to_blacklist(user.id, reason)
         
+        scope = "the global blacklist" if global_list else "using the bot"
         embed = discord.Embed(
             title="🚫 User Blacklisted",
-            description=f"{user.mention} has been blacklisted from using the bot.",
+            description=f"{user.mention} has been blacklisted from {scope}.",
             color=0xff0000,
             timestamp=datetime.utcnow()
         )
@@ -258,29 +315,372 @@ class Moderation(commands.Cog):
         embed.set_footer(text=f"Blacklisted by {interaction.user.name}")
         
         await interaction.followup.send(embed=embed)
-        await BotLogger.log_mod_action(interaction.guild, interaction.user, "blacklist", user, reason)
+        await BotLogger.log_mod_action(interaction.guild, interaction.user, "global blacklist" if global_list else "blacklist", user, reason)
     
     @app_commands.command(name="unblacklist", description="Remove a user from blacklist (Owner only)")
-    @app_commands.describe(user="User to unblacklist")
-    async def unblacklist(self, interaction: discord.Interaction, user: discord.User):
+    @app_commands.describe(
+        user="User to unblacklist",
+        global_list="Remove the user from the global blacklist instead (bot owner only)"
+    )
+    async def unblacklist(self, interaction: discord.Interaction, user: discord.User, global_list: bool = False):
         """Remove a user from blacklist"""
-        if not is_owner(interaction):
+        if not is_owner(interaction) or (global_list and not is_bot_owner(interaction)):
             return await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
         
         await interaction.response.defer()
         
-        if storage.remove_from_blacklist(interaction.guild_id, user.id):
+        if global_list:
+            removed = await blacklist_cache.remove_global(user.id)
+        else:
+            async with storage.transaction(interaction.guild_id) as tx:
+                removed = tx.remove_from_blacklist(user.id)
+        
+        if removed:
             embed = discord.Embed(
                 title="✅ User Unblacklisted",
-                description=f"{user.mention} has been removed from the blacklist.",
+                description=f"{user.mention} has been removed from the {'global ' if global_list else ''}blacklist.",
                 color=0x2ecc71,
                 timestamp=datetime.utcnow()
             )
             embed.set_footer(text=f"Unblacklisted by {interaction.user.name}")
             await interaction.followup.send(embed=embed)
-            await BotLogger.log_mod_action(interaction.guild, interaction.user, "unblacklist", user, "Removed from blacklist")
+            await BotLogger.log_mod_action(interaction.guild, interaction.user, "unblacklist", user, "Removed from global blacklist" if global_list else "Removed from blacklist")
+        else:
+            await interaction.followup.send(f"❌ {user.mention} is not {'globally ' if global_list else ''}blacklisted.", ephemeral=True)
+    
+    @app_commands.command(name="blacklist_import", description="Blacklist every user in a file (Owner only)")
+    @app_commands.describe(
+        file="A /blacklist_export file, a JSON list of user IDs, or text with one user ID per line",
+        reason="Reason for users the file gives no reason for",
+        global_list="Import into the global blacklist (bot owner only)"
+    )
+    async def blacklist_import(self, interaction: discord.Interaction, file: discord.Attachment, reason: str = "Imported", global_list: bool = False):
+        """Import a shared ban list"""
+        if not is_owner(interaction) or (global_list and not is_bot_owner(interaction)):
+            return await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
+        if file.size > MAX_IMPORT_SIZE:
+            return await interaction.response.send_message(f"❌ File is too large (max {MAX_IMPORT_SIZE // 1024 // 1024} MB).", ephemeral=True)
+        
+        await interaction.response.defer(ephemeral=True)
+        
+        try:
+            content = (await file.read()).decode("utf-8-sig")
+        except (discord.HTTPException, UnicodeDecodeError) as e:
+            return await interaction.followup.send(f"❌ Could not read file: {e}", ephemeral=True)
+        
+        entries = blacklist_cache.parse_import(content)
+        if not entries:
+            return await interaction.followup.send("❌ No user IDs found in the file.", ephemeral=True)
+        
+        # The whole list is saved with a single write
+        if global_list:
+            added = await blacklist_cache.add_global(entries, reason, interaction.guild_id, interaction.user.id)
+        else:
+            added = await blacklist_cache.add_many(interaction.guild_id, entries, reason)
+        
+        scope = "global blacklist" if global_list else "blacklist"
+        await interaction.followup.send(f"✅ Added {added} of {len(entries)} user(s) to the {scope} ({len(entries) - added} were already on it).", ephemeral=True)
+        await BotLogger.log_config_change(interaction.guild, interaction.user, f"{scope} import", None, f"{added} user(s) from {file.filename}")
+    
+    @app_commands.command(name="blacklist_export", description="Export the blacklist to share it (Owner only)")
+    @app_commands.describe(global_list="Export the global blacklist instead of this server's (bot owner only)")
+    async def blacklist_export(self, interaction: discord.Interaction, global_list: bool = False):
+        """Export a ban list as JSON"""
+        # The global list holds every guild's entries, reasons and moderators
+        if not is_owner(interaction) or (global_list and not is_bot_owner(interaction)):
+            return await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
+        
+        content = blacklist_cache.export(None if global_list else interaction.guild_id)
+        filename = "global_blacklist.json" if global_list else f"blacklist_{interaction.guild_id}.json"
+        await interaction.response.send_message(
+            "✅ Import this file with `/blacklist_import` in another server.",
+            file=discord.File(io.BytesIO(content.encode("utf-8")), filename=filename),
+            ephemeral=True
+        )
+    
+    @app_commands.command(name="use_global_blacklist", description="Also block users on the global blacklist in this server (Owner only)")
+    @app_commands.describe(enabled="Whether the global blacklist applies here")
+    async def use_global_blacklist(self, interaction: discord.Interaction, enabled: bool):
+        """Opt this guild in or out of the global blacklist"""
+        if not is_owner(interaction):
+            return await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
+        
+        async with storage.transaction(interaction.guild_id) as tx:
+            cfg = tx.get_config()
+            settings = cfg.get("blacklist_settings") or {}
+            old_value = settings.get("use_global", False)
+            settings["use_global"] = enabled
+            cfg["blacklist_settings"] = settings
+            tx.set_config(cfg)
+        
+        await interaction.response.send_message(f"✅ The global blacklist is now {'enabled' if enabled else 'disabled'} in this server.", ephemeral=True)
+        await BotLogger.log_config_change(interaction.guild, interaction.user, "blacklist_settings.use_global", str(old_value), str(enabled))
+    
+    @app_commands.command(name="escalation", description="Set automatic actions for repeated warnings (Owner only)")
+    @app_commands.describe(
+        rules="Warnings and action, e.g. '3:timeout:60, 5:blacklist' (timeout in minutes). Leave empty to remove",
+        decay_days="Days a warning counts for before it expires (0 keeps warnings forever)"
+    )
+    async def escalation_rules(self, interaction: discord.Interaction, rules: str = None, decay_days: app_commands.Range[int, 0, 3650] = None):
+        """Configure warning escalation"""
+        if not is_owner(interaction):
+            return await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
+        
+        parsed = []
+        for part in (rules or "").replace(",", " ").split():
+            pieces = part.split(":")
+            try:
+                rule = {"warnings": int(pieces[0]), "action": pieces[1].lower()}
+                if len(pieces) > 2:
+                    rule["duration"] = int(pieces[2])
+            except (IndexError, ValueError):
+                return await interaction.response.send_message(f"❌ Invalid rule `{part}`. Use `warnings:action` or `warnings:timeout:minutes`, e.g. `3:timeout:60`.", ephemeral=True)
+            parsed.append(rule)
+        if len(escalation.parse_rules(parsed)) != len(parsed):
+            return await interaction.response.send_message(f"❌ Warning counts must be above 0, each rule unique, and actions one of: {', '.join(sorted(ACTIONS))}.", ephemeral=True)
+        
+        async with storage.transaction(interaction.guild_id) as tx:
+            cfg = tx.get_config()
+            settings = cfg.get("moderation_settings") or {}
+            old_value = dict(settings)
+            settings["escalation"] = sorted(parsed, key=lambda r: r["warnings"])
+            if decay_days is not None:
+                settings["warning_decay_days"] = decay_days
+            cfg["moderation_settings"] = settings
+            tx.set_config(cfg)
+        
+        await BotLogger.log_config_change(interaction.guild, interaction.user, "Warning Escalation", str(old_value), str(settings))
+        
+        rule_lines = [
+            f"{rule.warnings} warnings: {rule.action}" + (f" ({rule.duration} min)" if rule.action == "timeout" else "")
+            for rule in escalation.settings(interaction.guild_id)[0]
+        ]
+        decay_text = f"Warnings expire after {settings.get('warning_decay_days')} days." if settings.get("warning_decay_days") else "Warnings never expire."
+        await interaction.response.send_message("✅ Escalation updated:\n" + "\n".join(rule_lines or ["No escalation rules."]) + f"\n{decay_text}", ephemeral=True)
+    
+    @app_commands.command(name="lockdown", description="Pause ticket panels during a raid (Staff only)")
+    @app_commands.describe(minutes="How long to pause tickets for (0 lifts the lockdown)")
+    async def lockdown(self, interaction: discord.Interaction, minutes: app_commands.Range[int, 0, 1440]):
+        """Start or lift a ticket lockdown"""
+        if not self.has_mod_perms(interaction):
+            return await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
+        
+        raid_detector.lock(interaction.guild_id, minutes * 60)
+        if minutes:
+            await interaction.response.send_message(f"🔒 Ticket panels are paused for {minutes} minute(s).", ephemeral=True)
         else:
-            await interaction.followup.send(f"❌ {user.mention} is not blacklisted.", ephemeral=True)
+            await interaction.response.send_message("✅ Lockdown lifted, ticket panels are open again.", ephemeral=True)
+        await BotLogger.log_config_change(interaction.guild, interaction.user, "Ticket Lockdown", None, f"{minutes} minute(s)" if minutes else "Lifted")
+    
+    # Bulk moderation
+    bulk_group = app_commands.Group(name="bulk", description="Moderate many users at once (Staff only)")
+    
+    @staticmethod
+    def bulk_embed(action: str, total: int, succeeded: int, failed: list, reason: str = None, finished: bool = False) -> discord.Embed:
+        """Build the progress/summary embed of a bulk action"""
+        done = succeeded + len(failed)
+        embed = discord.Embed(
+            title=f"{'✅' if finished else '⏳'} Bulk {action.title()}",
+            description=f"**{succeeded}** succeeded, **{len(failed)}** failed, {done}/{total} done.",
+            color=(0x2ecc71 if not failed else 0xff9900) if finished else 0x3498db,
+            timestamp=datetime.utcnow()
+        )
+        if reason:
+            embed.add_field(name="Reason", value=reason[:1024], inline=False)
+        if failed:
+            lines = [f"<@{target_id}>: {error}" for target_id, error in failed[:15]]
+            if len(failed) > 15:
+                lines.append(f"...and {len(failed) - 15} more")
+            embed.add_field(name="Failures", value="\n".join(lines)[:1024], inline=False)
+        return embed
+    
+    async def bulk_targets(self, interaction: discord.Interaction, users: str, role: discord.Role, joined_within: int):
+        """Resolve the members a bulk command acts on, leaving out anyone the moderator can't act on.
+        Returns (members, [(user_id, reason skipped)], IDs that aren't members)"""
+        members, missing = await resolve_members(interaction.guild, users, role, joined_within)
+        owner = is_owner(interaction)
+        targets, skipped = [], []
+        for member in members:
+            if member.bot or member.id in (interaction.user.id, interaction.guild.owner_id):
+                skipped.append((member.id, "Bot, yourself or the server owner"))
+            elif member.top_role >= interaction.user.top_role and not owner:
+                skipped.append((member.id, "Equal or higher role"))
+            else:
+                targets.append(member)
+        return targets, skipped, missing
+    
+    async def run_bulk_action(self, interaction: discord.Interaction, action: str, targets: list, skipped: list, reason: str, perform):
+        """Run perform(member) over the targets, keeping one summary message up to date"""
+        total = len(targets) + len(skipped)
+        message = await interaction.followup.send(embed=self.bulk_embed(action, total, 0, skipped, reason), wait=True)
+        
+        async def progress(succeeded: list, failed: list):
+            failures = skipped + [(member.id, error) for member, error in failed]
+            await message.edit(embed=self.bulk_embed(action, total, len(succeeded), failures, reason))
+        
+        succeeded, failed = await run_bulk(targets, perform, on_progress=progress)
+        failed = skipped + [(member.id, error) for member, error in failed]
+        await message.edit(embed=self.bulk_embed(action, total, len(succeeded), failed, reason, finished=True))
+        await BotLogger.log_bulk_action(interaction.guild, interaction.user, action, len(succeeded), total, reason)
+        return succeeded
+    
+    async def check_bulk(self, interaction: discord.Interaction, users: str, role: discord.Role, joined_within: int):
+        """Validate a bulk command's target options and defer. Returns (targets, skipped, missing) or None"""
+        if not self.has_mod_perms(interaction):
+            await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
+            return None
+        if not users and role is None and not joined_within:
+            await interaction.response.send_message("❌ Give user IDs or mentions, a role, or a join window.", ephemeral=True)
+            return None
+        
+        await interaction.response.defer()
+        targets, skipped, missing = await self.bulk_targets(interaction, users, role, joined_within)
+        if len(targets) > MAX_TARGETS:
+            await interaction.followup.send(f"❌ That matches {len(targets)} users; bulk commands act on at most {MAX_TARGETS}.", ephemeral=True)
+            return None
+        return targets, skipped, missing
+    
+    @bulk_group.command(name="warn", description="Warn many users, applying escalation rules (Staff only)")
+    @app_commands.describe(
+        users="User IDs or mentions, separated by spaces or commas",
+        role="Warn every member with this role",
+        joined_within="Warn every member who joined in the last N minutes",
+        reason="Reason for the warnings"
+    )
+    async def bulk_warn(self, interaction: discord.Interaction, reason: str, users: str = None, role: discord.Role = None,
+                        joined_within: app_commands.Range[int, 1, 10080] = None):
+        resolved = await self.check_bulk(interaction, users, role, joined_within)
+        if resolved is None:
+            return
+        targets, skipped, missing = resolved
+        skipped += [(user_id, "Not a member") for user_id in missing]
+        
+        # Every warning is recorded in one write; only the escalations need API calls
+        results = {
+            result.user_id: result
+            for result in await escalation.warn_many(interaction.guild_id, [member.id for member in targets], interaction.user.id, reason)
+        }
+        escalated = []
+        
+        async def apply(member: discord.Member):
+            for action in await escalation.apply(interaction.guild, member, results[member.id]):
+                escalated.append((member, action))
+        
+        await self.run_bulk_action(interaction, "warn", targets, skipped, reason, apply)
+        for member, action in escalated:
+            await BotLogger.log_mod_action(
+                interaction.guild, interaction.user, "escalation", member,
+                f"{action} after {results[member.id].active_warnings} warnings"
+            )
+    
+    @bulk_group.command(name="kick", description="Kick many users (Staff only)")
+    @app_commands.describe(
+        users="User IDs or mentions, separated by spaces or commas",
+        role="Kick every member with this role",
+        joined_within="Kick every member who joined in the last N minutes",
+        reason="Reason for the kicks"
+    )
+    async def bulk_kick(self, interaction: discord.Interaction, users: str = None, role: discord.Role = None,
+                        joined_within: app_commands.Range[int, 1, 10080] = None, reason: str = "No reason provided"):
+        resolved = await self.check_bulk(interaction, users, role, joined_within)
+        if resolved is None:
+            return
+        targets, skipped, missing = resolved
+        skipped += [(user_id, "Not a member") for user_id in missing]
+        await self.run_bulk_action(interaction, "kick", targets, skipped, reason, lambda member: member.kick(reason=reason))
+    
+    @bulk_group.command(name="timeout", description="Timeout many users (Staff only)")
+    @app_commands.describe(
+        duration="Duration in minutes (1-40320)",
+        users="User IDs or mentions, separated by spaces or commas",
+        role="Timeout every member with this role",
+        joined_within="Timeout every member who joined in the last N minutes",
+        reason="Reason for the timeouts"
+    )
+    async def bulk_timeout(self, interaction: discord.Interaction, duration: app_commands.Range[int, 1, 40320], users: str = None,
+                           role: discord.Role = None, joined_within: app_commands.Range[int, 1, 10080] = None,
+                           reason: str = "No reason provided"):
+        resolved = await self.check_bulk(interaction, users, role, joined_within)
+        if resolved is None:
+            return
+        targets, skipped, missing = resolved
+        skipped += [(user_id, "Not a member") for user_id in missing]
+        until = timedelta(minutes=duration)
+        await self.run_bulk_action(interaction, "timeout", targets, skipped, reason, lambda member: member.timeout(until, reason=reason))
+    
+    @bulk_group.command(name="ban", description="Ban many users and blacklist them (Staff only)")
+    @app_commands.describe(
+        users="User IDs or mentions, separated by spaces or commas (users who already left can be banned too)",
+        role="Ban every member with this role",
+        joined_within="Ban every member who joined in the last N minutes",
+        reason="Reason for the bans",
+        delete_days="Days of messages to delete (0-7)"
+    )
+    async def bulk_ban(self, interaction: discord.Interaction, users: str = None, role: discord.Role = None,
+                       joined_within: app_commands.Range[int, 1, 10080] = None, reason: str = "No reason provided",
+                       delete_days: app_commands.Range[int, 0, 7] = 0):
+        resolved = await self.check_bulk(interaction, users, role, joined_within)
+        if resolved is None:
+            return
+        targets, skipped, missing = resolved
+        # Users who already left can still be banned by ID
+        targets += [discord.Object(id=user_id) for user_id in missing]
+        total = len(targets) + len(skipped)
+        message = await interaction.followup.send(embed=self.bulk_embed("ban", total, 0, skipped, reason), wait=True)
+        
+        banned, failed = [], list(skipped)
+        for start in range(0, len(targets), BULK_BAN_CHUNK):
+            chunk = targets[start:start + BULK_BAN_CHUNK]
+            try:
+                # One request per 200 users
+                async with http_scheduler.background():
+                    result = await interaction.guild.bulk_ban(chunk, reason=reason, delete_message_seconds=delete_days * 86400)
+                banned += [user.id for user in result.banned]
+                failed += [(user.id, "Ban failed") for user in result.failed]
+            except discord.Forbidden:
+                # The bulk endpoint also needs Manage Server; fall back to banning one by one
+                succeeded, errors = await run_bulk(
+                    chunk, lambda user: interaction.guild.ban(user, reason=reason, delete_message_seconds=delete_days * 86400)
+                )
+                banned += [user.id for user in succeeded]
+                failed += [(user.id, error) for user, error in errors]
+            except discord.HTTPException as e:
+                failed += [(user.id, e.text or str(e)) for user in chunk]
+            await message.edit(embed=self.bulk_embed("ban", total, len(banned), failed, reason))
+        
+        # One blacklist write for the whole batch, like /ban does per user
+        if banned:
+            await blacklist_cache.add_many(interaction.guild_id, dict.fromkeys(banned), reason)
+        await message.edit(embed=self.bulk_embed("ban", total, len(banned), failed, reason, finished=True))
+        await BotLogger.log_bulk_action(interaction.guild, interaction.user, "ban", len(banned), total, reason)
+    
+    @bulk_group.command(name="blacklist", description="Blacklist many users (Owner only)")
+    @app_commands.describe(
+        users="User IDs or mentions, separated by spaces or commas (need not be members)",
+        role="Blacklist every member with this role",
+        joined_within="Blacklist every member who joined in the last N minutes",
+        reason="Reason for the blacklist"
+    )
+    async def bulk_blacklist(self, interaction: discord.Interaction, users: str = None, role: discord.Role = None,
+                             joined_within: app_commands.Range[int, 1, 10080] = None, reason: str = "No reason provided"):
+        if not is_owner(interaction):
+            return await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
+        if not users and role is None and not joined_within:
+            return await interaction.response.send_message("❌ Give user IDs or mentions, a role, or a join window.", ephemeral=True)
+        
+        await interaction.response.defer()
+        # No API calls per user, so the IDs don't need to be members
+        user_ids = set(parse_user_ids(users))
+        if role is not None or joined_within:
+            members, _ = await resolve_members(interaction.guild, None, role, joined_within)
+            user_ids.update(member.id for member in members if not member.bot)
+        user_ids.discard(interaction.user.id)
+        if not user_ids:
+            return await interaction.followup.send("❌ No users matched.", ephemeral=True)
+        
+        added = await blacklist_cache.add_many(interaction.guild_id, dict.fromkeys(user_ids), reason)
+        await interaction.followup.send(embed=self.bulk_embed("blacklist", len(user_ids), len(user_ids), [], reason, finished=True))
+        await BotLogger.log_bulk_action(interaction.guild, interaction.user, "blacklist", added, len(user_ids), reason)
     
     @app_commands.command(name="reset_ratelimit", description="Reset rate limit for a user (Owner only)")
     @app_commands.describe(user="User to reset rate limit for")
@@ -3,8 +3,8 @@ from discord.ext import commands
 from discord import app_commands
 from src import storage
 from src.utils.permissions import is_owner
-from src.ui.config_views import ConfigMainView
 from src.utils.logging import BotLogger
+from src.utils.metrics import metrics
 from typing import Optional
 
 class Owner(commands.Cog):
@@ -17,6 +17,9 @@ class Owner(commands.Cog):
     @config_group.command(name="config", description="Open interactive configuration menu")
     async def config_menu(self, interaction: discord.Interaction):
         """Open the interactive configuration menu with buttons"""
+        # Imported lazily: the config UI is large and only needed when an owner opens it
+        from src.ui.config_views import ConfigMainView
+        
         # Defer immediately to prevent timeout
         if not interaction.response.is_done():
             await interaction.response.defer(ephemeral=True)
@@ -104,5 +107,45 @@ class Owner(commands.Cog):
         
         await interaction.followup.send(embed=embed, ephemeral=True)
 
+    @config_group.command(name="shards", description="Show a per-shard breakdown of guilds, latency and traffic")
+    async def shards(self, interaction: discord.Interaction):
+        """Show per-shard metrics for this process"""
+        if not is_owner(interaction):
+            return await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
+        
+        # Single-shard bots report everything under shard 0
+        latencies = getattr(self.bot, "latencies", None) or [(0, self.bot.latency)]
+        guild_counts = {}
+        member_counts = {}
+        for guild in self.bot.guilds:
+            guild_counts[guild.shard_id] = guild_counts.get(guild.shard_id, 0) + 1
+            member_counts[guild.shard_id] = member_counts.get(guild.shard_id, 0) + (guild.member_count or 0)
+        
+        interactions = metrics.by_shard("interactions")
+        messages = metrics.by_shard("messages")
+        
+        embed = discord.Embed(
+            title="🧩 Shard Metrics",
+            description=f"Shard count: **{self.bot.shard_count or 1}**",
+            color=0x3498db,
+            timestamp=discord.utils.utcnow()
+        )
+        for shard_id, latency in latencies:
+            embed.add_field(
+                name=f"Shard {shard_id}",
+                value=(
+                    f"**Latency:** {latency * 1000:.0f}ms\n"
+                    f"**Guilds:** {guild_counts.get(shard_id, 0)}\n"
+                    f"**Members:** {member_counts.get(shard_id, 0)}\n"
+                    f"**Interactions:** {int(interactions.get(shard_id, 0))}\n"
+                    f"**Messages:** {int(messages.get(shard_id, 0))}"
+                ),
+                inline=True
+            )
+            if len(embed.fields) >= 25:
+                break
+        
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
 async def setup(bot):
     await bot.add_cog(Owner(bot))
@@ -2,6 +2,17 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from src import storage
+from src.utils.helpers import format_price
+from src.utils.logging import BotLogger
+from src.utils.permissions import is_owner
+from src.utils.pricing import RANKS, pricing
+
+PRODUCT_CHOICES = [
+    app_commands.Choice(name="Buy Coins", value="buy_coins"),
+    app_commands.Choice(name="Sell Coins", value="sell_coins"),
+    app_commands.Choice(name="Buy MFA", value="buy_mfa"),
+    app_commands.Choice(name="Sell MFA", value="sell_mfa"),
+]
 
 class Pricing(commands.Cog):
     def __init__(self, bot):
@@ -9,22 +20,67 @@ class Pricing(commands.Cog):
 
     @app_commands.command(name="view_prices")
     async def view_prices(self, interaction):
-        cfg = storage.get_config(interaction.guild_id)
-        p_buy = cfg["mfa_prices"].get("buy", {})
-        p_sell = cfg["mfa_prices"].get("sell", {})
+        g = interaction.guild_id
+        p_buy = " | ".join(f"{rank} {format_price(pricing.unit_price(g, 'buy_mfa', rank))}" for rank in RANKS)
+        p_sell = " | ".join(f"{rank} {format_price(pricing.unit_price(g, 'sell_mfa', rank))}" for rank in RANKS)
 
         desc = (
-            f"Coins\nBuy ${cfg['coins']['buy_base_price']}/mil\n"
-            f"Sell ${cfg['coins']['sell_base_price']}/mil\n\n"
-            f"MFA Buy Prices\nNON ${p_buy.get('NON', 0)} | VIP ${p_buy.get('VIP', 0)} | VIP+ ${p_buy.get('VIP+', 0)} | MVP ${p_buy.get('MVP', 0)} | MVP+ ${p_buy.get('MVP+', 0)}\n\n"
-            f"MFA Sell Prices\nNON ${p_sell.get('NON', 0)} | VIP ${p_sell.get('VIP', 0)} | VIP+ ${p_sell.get('VIP+', 0)} | MVP ${p_sell.get('MVP', 0)} | MVP+ ${p_sell.get('MVP+', 0)}"
+            f"Coins\nBuy ${pricing.unit_price(g, 'buy_coins'):g}/mil\n"
+            f"Sell ${pricing.unit_price(g, 'sell_coins'):g}/mil\n\n"
+            f"MFA Buy Prices\n{p_buy}\n\n"
+            f"MFA Sell Prices\n{p_sell}"
         )
 
+        for choice in PRODUCT_CHOICES:
+            tiers = pricing.tier_text(g, choice.value, "mil" if choice.value.endswith("coins") else "MFAs")
+            if tiers:
+                desc += f"\n\n{choice.name} Volume Tiers\n{tiers}"
+
         await interaction.response.send_message(
             embed=discord.Embed(title="Pricing", description=desc),
             ephemeral=True
         )
 
+    @app_commands.command(name="price_tiers", description="Set volume discounts for a product")
+    @app_commands.describe(
+        product="Product the tiers apply to",
+        tiers="Minimum quantity and percent off, e.g. '100:5, 500:10' (millions for coins). Leave empty to remove"
+    )
+    @app_commands.choices(product=PRODUCT_CHOICES)
+    async def price_tiers(self, interaction: discord.Interaction, product: app_commands.Choice[str], tiers: str = None):
+        if not is_owner(interaction):
+            return await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
+
+        parsed = []
+        for part in (tiers or "").replace(",", " ").split():
+            try:
+                minimum, discount = part.split(":")
+                parsed.append({"min": float(minimum), "discount": float(discount)})
+            except ValueError:
+                return await interaction.response.send_message(f"❌ Invalid tier `{part}`. Use `quantity:percent`, e.g. `100:5`.", ephemeral=True)
+        if len(pricing.parse_tiers(parsed)) != len(parsed):
+            return await interaction.response.send_message("❌ Quantities must be above 0, unique, and discounts below 100%.", ephemeral=True)
+
+        async with storage.transaction(interaction.guild_id) as tx:
+            cfg = tx.get_config()
+            all_tiers = cfg.setdefault("volume_tiers", {})
+            old_tiers = all_tiers.get(product.value, [])
+            all_tiers[product.value] = sorted(parsed, key=lambda t: t["min"])
+            # Saving the config recompiles the guild's quote table and updates live panels
+            tx.set_config(cfg)
+
+        await BotLogger.log_config_change(
+            interaction.guild,
+            interaction.user,
+            f"{product.name} Volume Tiers",
+            str(old_tiers),
+            str(all_tiers[product.value])
+        )
+
+        unit = "mil" if product.value.endswith("coins") else "MFAs"
+        text = pricing.tier_text(interaction.guild_id, product.value, unit) or "No volume tiers."
+        await interaction.response.send_message(f"✅ {product.name} volume tiers updated:\n{text}", ephemeral=True)
+
 
 async def setup(bot):
     await bot.add_cog(Pricing(bot))
@@ -1,50 +1,116 @@
 import discord
 from discord.ext import commands, tasks
-from discord import app_commands
 from src import storage
-from datetime import datetime
+from src.stock import stock_store
+from src.tickets.repository import ticket_repository
+from src.utils.stats import guild_stats
 import asyncio
-import random
+import time
+
+ACTIVITY_TYPES = {
+    "playing": discord.ActivityType.playing,
+    "watching": discord.ActivityType.watching,
+    "listening": discord.ActivityType.listening,
+    "competing": discord.ActivityType.competing,
+}
+
+# Used when config.json has no presence section
+DEFAULT_STATUSES = [
+    {"type": "watching", "text": "{guilds} Servers"},
+    {"type": "playing", "text": "Hypixel Account Shop"},
+    {"type": "listening", "text": "Ticket Requests"},
+    {"type": "watching", "text": "Stock Updates"},
+    {"type": "playing", "text": "Best Rates in Market 💸"},
+    {"type": "watching", "text": "Your Tickets 🎫"},
+]
+
+class _Fields(dict):
+    """Leave unknown {placeholders} in status text as they are"""
+    def __missing__(self, key):
+        return "{" + key + "}"
 
 class Status(commands.Cog):
     """Status rotator to market the shop"""
-    
+
     def __init__(self, bot):
         self.bot = bot
+        cfg = storage.load_app_config().get("presence", {}) or {}
+        self.statuses = [s for s in (cfg.get("statuses") or DEFAULT_STATUSES) if s.get("type") in ACTIVITY_TYPES]
+        # Seconds each status is shown for
+        self.interval = max(int(cfg.get("interval", 300)), 15)
+        # Never change presence more often than this, even when counters change
+        self.min_interval = max(int(cfg.get("min_interval", 60)), 15)
+        # Structure: {shard_id: (activity_type, text)}
+        self.last_sent = {}
+        # Structure: {shard_id: monotonic_time}
+        self.last_sent_at = {}
         self.status_task.start()
-        
+
     def cog_unload(self):
         self.status_task.cancel()
-        
-    @tasks.loop(seconds=10)
+
+    def collect_fields(self) -> dict:
+        """Get the values for status placeholders per shard ({None: ...} when not sharded)"""
+        sharded = isinstance(self.bot, commands.AutoShardedBot)
+        guilds_by_shard = {}
+        for guild in self.bot.guilds:
+            guilds_by_shard.setdefault(guild.shard_id if sharded else None, []).append(guild.id)
+        if not guilds_by_shard:
+            guilds_by_shard[None] = []
+
+        fields = {}
+        for shard_id, guild_ids in guilds_by_shard.items():
+            fields[shard_id] = _Fields(
+                guilds=len(guild_ids),
+                open_tickets=sum(ticket_repository.open_count(g, load=False) for g in guild_ids),
+                stock=int(guild_stats.total("stock", guild_ids)),
+                vouches=int(guild_stats.total("vouches", guild_ids)),
+            )
+        return fields
+
+    async def seed_stats(self):
+        """Read stock and vouch counts once at startup; afterwards they are kept up to date in memory"""
+        def load():
+            for guild in self.bot.guilds:
+                if not guild_stats.has("stock", guild.id):
+                    # Loading the stock store records the guild's stock count
+                    stock_store.total_quantity(guild.id)
+                if not guild_stats.has("vouches", guild.id):
+                    guild_stats.set("vouches", guild.id, len(storage.get_all_vouches(guild.id)))
+        await asyncio.to_thread(load)
+
+    @tasks.loop(seconds=15)
     async def status_task(self):
-        """Rotate through marketing statuses"""
+        """Rotate through marketing statuses, only sending a presence update when it changes"""
+        if not self.statuses:
+            return
         try:
-            # Get data for dynamic statuses
-            guild_count = len(self.bot.guilds)
-            
-            # Simple list of statuses
-            # In a real app, these could be configurable
-            statuses = [
-                discord.Activity(type=discord.ActivityType.watching, name=f"{guild_count} Servers"),
-                discord.Activity(type=discord.ActivityType.playing, name="Hypixel Account Shop"),
-                discord.Activity(type=discord.ActivityType.listening, name="Ticket Requests"),
-                discord.Activity(type=discord.ActivityType.watching, name="Stock Updates"),
-                discord.Activity(type=discord.ActivityType.playing, name="Best Rates in Market 💸"),
-                discord.Activity(type=discord.ActivityType.watching, name="Your Tickets 🎫")
-            ]
-            
-            # Choose one randomly or sequentially (using random here for variety)
-            new_status = random.choice(statuses)
-            
-            await self.bot.change_presence(activity=new_status, status=discord.Status.online)
-            
+            status = self.statuses[int(time.time() // self.interval) % len(self.statuses)]
+            activity_type = ACTIVITY_TYPES[status["type"]]
+            now = time.monotonic()
+
+            for shard_id, fields in self.collect_fields().items():
+                text = status["text"].format_map(fields)
+                if self.last_sent.get(shard_id) == (activity_type, text):
+                    continue
+                if now - self.last_sent_at.get(shard_id, -self.min_interval) < self.min_interval:
+                    continue
+
+                activity = discord.Activity(type=activity_type, name=text)
+                if shard_id is None:
+                    await self.bot.change_presence(activity=activity, status=discord.Status.online)
+                else:
+                    await self.bot.change_presence(activity=activity, status=discord.Status.online, shard_id=shard_id)
+                self.last_sent[shard_id] = (activity_type, text)
+                self.last_sent_at[shard_id] = now
+
         except Exception as e:
             print(f"Error in status task: {e}")
 
     @status_task.before_loop
     async def before_status_task(self):
         await self.bot.wait_until_ready()
+        await self.seed_stats()
 
 async def setup(bot):
     await bot.add_cog(Status(bot))
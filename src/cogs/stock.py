@@ -1,103 +1,138 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from src import storage
+from src.stock import stock_store
+from src.ui.stock_views import StockPageView, build_stock_embed
 from src.utils.permissions import is_owner, is_staff
-from typing import Optional, Literal
-import json
-import os
+from typing import Optional
+
+# Largest stock import file accepted (bytes)
+MAX_IMPORT_SIZE = 2 * 1024 * 1024
+
+def parse_import_line(line: str, default_category: Optional[str]):
+    """Parse "Category | Item | Quantity", "Category | Item" or just "Item" (with a default category)"""
+    parts = [part.strip() for part in line.split("|")]
+    quantity = 1
+    if len(parts) >= 3:
+        category, name = parts[0], " | ".join(parts[1:-1])
+        try:
+            quantity = int(parts[-1])
+        except ValueError:
+            category, name = parts[0], " | ".join(parts[1:])
+    elif len(parts) == 2:
+        category, name = parts
+    else:
+        category, name = default_category, parts[0]
+    if not category or not name or quantity < 1:
+        return None
+    return category.title(), name[:200], quantity
 
 class Stock(commands.Cog):
     """Stock management system"""
-    
+
     def __init__(self, bot):
         self.bot = bot
-        self.data_path = os.path.join(storage.DATA_DIR, "stock.json")
-        self.ensure_stock_file()
-        
-    def ensure_stock_file(self):
-        if not os.path.exists(self.data_path):
-            with open(self.data_path, "w", encoding="utf-8") as f:
-                json.dump({}, f)
-                
-    def load_stock(self):
-        with open(self.data_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-            
-    def save_stock(self, data):
-        with open(self.data_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
 
     stock_group = app_commands.Group(name="stock", description="Stock management commands")
 
     @stock_group.command(name="add", description="Add an item to the stock list")
     @app_commands.describe(
         category="Category of the item (e.g. Accounts, MFA, Coins)",
-        item="The item description or name"
+        item="The item description or name",
+        quantity="How many of this item are in stock (default 1)"
     )
-    async def add_stock(self, interaction: discord.Interaction, category: str, item: str):
+    async def add_stock(self, interaction: discord.Interaction, category: str, item: str, quantity: app_commands.Range[int, 1] = 1):
         if not is_staff(interaction) and not is_owner(interaction):
             return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
-        
-        data = self.load_stock()
-        guild_id = str(interaction.guild_id)
-        
-        if guild_id not in data:
-            data[guild_id] = {}
-            
+
         # Normalize category
         cat_key = category.strip().title()
-        
-        if cat_key not in data[guild_id]:
-            data[guild_id][cat_key] = []
-            
-        data[guild_id][cat_key].append(item)
-        self.save_stock(data)
-        
-        await interaction.response.send_message(f"✅ Added to **{cat_key}**: `{item}`", ephemeral=True)
-
-    @stock_group.command(name="remove", description="Remove an item from stock")
+        added = await stock_store.add(interaction.guild_id, cat_key, item, quantity, added_by=interaction.user.id)
+
+        quantity_text = f" (x{quantity})" if quantity > 1 else ""
+        await interaction.response.send_message(f"✅ Added to **{cat_key}** as `#{added['id']}`: `{item}`{quantity_text}", ephemeral=True)
+
+    @stock_group.command(name="import", description="Import stock items from a text file")
     @app_commands.describe(
-        category="Category to remove from",
-        index="The number of the item to remove (from /stock view)"
+        file="Text file with one item per line: 'Category | Item | Quantity', 'Category | Item' or 'Item'",
+        category="Category for lines that don't name one"
     )
-    async def remove_stock(self, interaction: discord.Interaction, category: str, index: int):
+    async def import_stock(self, interaction: discord.Interaction, file: discord.Attachment, category: str = None):
         if not is_staff(interaction) and not is_owner(interaction):
             return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
-        
-        data = self.load_stock()
-        guild_id = str(interaction.guild_id)
-        cat_key = category.strip().title()
-        
-        if guild_id not in data or cat_key not in data[guild_id]:
-            return await interaction.response.send_message("❌ Category not found.", ephemeral=True)
-            
-        items = data[guild_id][cat_key]
-        if index < 1 or index > len(items):
-            return await interaction.response.send_message("❌ Invalid item number.", ephemeral=True)
-            
-        removed = items.pop(index - 1)
-        
-        # Cleanup if empty
-        if not items:
-            del data[guild_id][cat_key]
-            
-        self.save_stock(data)
-        
-        await interaction.response.send_message(f"✅ Removed from **{cat_key}**: `{removed}`", ephemeral=True)
+        if file.size > MAX_IMPORT_SIZE:
+            return await interaction.response.send_message(f"❌ File is too large (max {MAX_IMPORT_SIZE // 1024 // 1024} MB).", ephemeral=True)
+
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            content = (await file.read()).decode("utf-8-sig")
+        except (discord.HTTPException, UnicodeDecodeError) as e:
+            return await interaction.followup.send(f"❌ Could not read file: {e}", ephemeral=True)
+
+        default_category = category.strip().title() if category else None
+        entries, skipped = [], 0
+        for line in content.splitlines():
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            entry = parse_import_line(line, default_category)
+            if entry:
+                entries.append(entry)
+            else:
+                skipped += 1
+
+        if not entries:
+            return await interaction.followup.send("❌ No items found in the file. Lines without a category need the `category` option.", ephemeral=True)
+
+        # All items are added with a single write
+        added = await stock_store.add_items(interaction.guild_id, entries, added_by=interaction.user.id)
+        skipped_text = f"\nSkipped {skipped} invalid line(s)." if skipped else ""
+        await interaction.followup.send(
+            f"✅ Imported {len(added)} item(s) (`#{added[0]['id']}` - `#{added[-1]['id']}`).{skipped_text}",
+            ephemeral=True
+        )
+
+    @stock_group.command(name="remove", description="Remove items from stock")
+    @app_commands.describe(item_ids="Item IDs from /stock view, separated by spaces or commas")
+    async def remove_stock(self, interaction: discord.Interaction, item_ids: str):
+        if not is_staff(interaction) and not is_owner(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+
+        try:
+            ids = [int(part.lstrip("#")) for part in item_ids.replace(",", " ").split()]
+        except ValueError:
+            return await interaction.response.send_message("❌ Invalid item ID. Use the IDs shown by /stock view.", ephemeral=True)
+
+        removed = await stock_store.remove(interaction.guild_id, ids)
+        if not removed:
+            return await interaction.response.send_message("❌ Item not found.", ephemeral=True)
+
+        if len(removed) == 1:
+            item = removed[0]
+            return await interaction.response.send_message(f"✅ Removed from **{item['category']}**: `{item['name']}`", ephemeral=True)
+        await interaction.response.send_message(f"✅ Removed {len(removed)} item(s).", ephemeral=True)
+
+    @stock_group.command(name="claim", description="Take sold units of an item out of stock")
+    @app_commands.describe(item_id="Item ID from /stock view", quantity="How many were sold (default 1)")
+    async def claim_stock(self, interaction: discord.Interaction, item_id: int, quantity: app_commands.Range[int, 1] = 1):
+        if not is_staff(interaction) and not is_owner(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+
+        claimed = await stock_store.claim(interaction.guild_id, item_id, quantity)
+        if not claimed:
+            return await interaction.response.send_message("❌ Item not found or not enough left in stock.", ephemeral=True)
+
+        remaining = stock_store.get(interaction.guild_id, item_id)
+        left_text = f"{remaining['quantity']} left" if remaining else "now out of stock"
+        await interaction.response.send_message(f"✅ Claimed {quantity}x `{claimed['name']}` from **{claimed['category']}** ({left_text}).", ephemeral=True)
 
     @stock_group.command(name="clear", description="Clear an entire category")
     async def clear_stock(self, interaction: discord.Interaction, category: str):
         if not is_owner(interaction): # Only owner for clear
              return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
-             
-        data = self.load_stock()
-        guild_id = str(interaction.guild_id)
+
         cat_key = category.strip().title()
-        
-        if guild_id in data and cat_key in data[guild_id]:
-            del data[guild_id][cat_key]
-            self.save_stock(data)
+        if await stock_store.clear_category(interaction.guild_id, cat_key):
             await interaction.response.send_message(f"✅ Cleared category **{cat_key}**.", ephemeral=True)
         else:
             await interaction.response.send_message("❌ Category not found.", ephemeral=True)
@@ -106,47 +141,25 @@ class Stock(commands.Cog):
     async def view_stock_admin(self, interaction: discord.Interaction):
         if not is_staff(interaction) and not is_owner(interaction):
             return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
-            
-        data = self.load_stock()
-        guild_id = str(interaction.guild_id)
-        
-        if guild_id not in data or not data[guild_id]:
+
+        if not stock_store.pages(interaction.guild_id, admin=True):
             return await interaction.response.send_message("📦 Stock is empty.", ephemeral=True)
-            
-        embed = discord.Embed(title="📦 Current Stock (Admin)", color=0x3498db)
-        
-        for category, items in data[guild_id].items():
-            if items:
-                # Format with indices for removal
-                formatted_items = [f"`{i+1}.` {item}" for i, item in enumerate(items)]
-                embed.add_field(name=category, value="\n".join(formatted_items), inline=False)
-                
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+        await interaction.response.send_message(
+            embed=build_stock_embed(interaction.guild, 0, admin=True),
+            view=StockPageView(interaction.guild, admin=True),
+            ephemeral=True
+        )
 
     @stock_group.command(name="list", description="Show public stock list")
     async def public_stock(self, interaction: discord.Interaction):
-        data = self.load_stock()
-        guild_id = str(interaction.guild_id)
-        
-        if guild_id not in data or not data[guild_id]:
+        if not stock_store.pages(interaction.guild_id):
             return await interaction.response.send_message("📦 Stock is currently empty. Check back later!", ephemeral=True)
-            
-        embed = discord.Embed(
-            title="📦  **Available Stock**",
-            description="Use `/ticket` to purchase any of these items.",
-            color=0x2ecc71
+
+        await interaction.response.send_message(
+            embed=build_stock_embed(interaction.guild, 0),
+            view=StockPageView(interaction.guild)
         )
-        
-        for category, items in data[guild_id].items():
-            if items:
-                # Format as bullet points
-                formatted_items = [f"• {item}" for item in items]
-                embed.add_field(name=f"**{category}**", value="\n".join(formatted_items), inline=False)
-        
-        if interaction.guild.icon:
-            embed.set_footer(text=interaction.guild.name, icon_url=interaction.guild.icon.url)
-            
-        await interaction.response.send_message(embed=embed)
 
 async def setup(bot):
-    await bot.add_cog(Stock(bot))
\ No newline at end of file
+    await bot.add_cog(Stock(bot))
@@ -1,9 +1,6 @@
 import discord
 from discord.ext import commands
-from src.ui import (
-    SellAccountModal, SellMFAModal,
-    BuyCoinsModal, SellCoinsModal
-)
+from src.ui import send_ticket_modal
 from src.tickets import TicketManager, has_staff_privs
 
 class TicketActions(commands.Cog):
@@ -17,17 +14,8 @@ class TicketActions(commands.Cog):
 
         cid = interaction.data.get("custom_id")
 
-        if cid in ("sell_account", "sell_profile", "sell_alt"):
-            await interaction.response.send_modal(SellAccountModal(cid))
-
-        elif cid == "sell_mfa":
-            await interaction.response.send_modal(SellMFAModal())
-
-        elif cid == "buy_coins":
-            await interaction.response.send_modal(BuyCoinsModal())
-
-        elif cid == "sell_coins":
-            await interaction.response.send_modal(SellCoinsModal())
+        if cid in ("sell_account", "sell_profile", "sell_alt", "sell_mfa", "buy_coins", "sell_coins"):
+            await send_ticket_modal(interaction, cid)
 
         elif cid == "close_ticket":
             if not has_staff_privs(interaction):
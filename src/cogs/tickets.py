@@ -1,9 +1,21 @@
+import asyncio
+import time
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
+from datetime import timedelta
 from src import storage
-from src.tickets.utils import get_ticket, close_ticket
+from src.tickets.auto_close import RETRY_DELAY, auto_close_scheduler
+from src.tickets.categories import category_allocator
+from src.tickets.manager import TicketManager
+from src.tickets.pool import channel_pool
+from src.tickets.repository import ticket_repository
+from src.tickets.types import BUILTIN_TYPES, ticket_types
+from src.tickets.utils import get_ticket
+from src.ui.modals import send_ticket_modal
 from src.utils.logging import BotLogger
+from src.utils.members import member_cache
+from src.utils.pricing import PRODUCTS
 from src.utils.permissions import has_staff_privs, is_owner
 
 class Tickets(commands.Cog):
@@ -11,6 +23,149 @@ class Tickets(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
+        self.archive_task.start()
+        self.pool_task.start()
+        self.thread_sweep_task.start()
+        self.auto_close_task.start()
+        self.activity_flush_task.start()
+    
+    def cog_unload(self):
+        self.archive_task.cancel()
+        self.pool_task.cancel()
+        self.thread_sweep_task.cancel()
+        self.auto_close_task.cancel()
+        self.activity_flush_task.cancel()
+        auto_close_scheduler.flush()
+    
+    @staticmethod
+    def _forget_ticket(guild_id: int, channel_id: int):
+        """Close and archive the ticket of a channel or thread that was deleted"""
+        ticket = ticket_repository.get(guild_id, channel_id)
+        if not ticket:
+            return
+        if ticket.get("is_open", True):
+            ticket_repository.close(guild_id, channel_id)
+        ticket_repository.archive(guild_id, channel_id)
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        category_allocator.track(channel)
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        if before.category_id != after.category_id:
+            category_allocator.untrack(before)
+            category_allocator.track(after)
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        """Keep the ticket index consistent when a ticket channel disappears"""
+        category_allocator.untrack(channel)
+        channel_pool.forget(channel)
+        self._forget_ticket(channel.guild.id, channel.id)
+    
+    @commands.Cog.listener()
+    async def on_raw_thread_delete(self, payload: discord.RawThreadDeleteEvent):
+        self._forget_ticket(payload.guild_id, payload.thread_id)
+    
+    @tasks.loop(hours=1)
+    async def archive_task(self):
+        """Move closed tickets out of the hot set"""
+        for guild in self.bot.guilds:
+            try:
+                ticket_repository.archive_closed(guild.id, older_than=timedelta(hours=1))
+            except Exception as e:
+                print(f"Error archiving tickets for {guild.id}: {e}")
+    
+    @archive_task.before_loop
+    async def before_archive_task(self):
+        await self.bot.wait_until_ready()
+    
+    @tasks.loop(minutes=5)
+    async def pool_task(self):
+        """Top up the pre-created ticket channel pools"""
+        for guild in self.bot.guilds:
+            try:
+                await channel_pool.replenish(guild)
+            except Exception as e:
+                print(f"Error replenishing ticket channel pool for {guild.id}: {e}")
+    
+    @pool_task.before_loop
+    async def before_pool_task(self):
+        await self.bot.wait_until_ready()
+        for guild in self.bot.guilds:
+            channel_pool.discover(guild)
+    
+    @tasks.loop(minutes=30)
+    async def thread_sweep_task(self):
+        """Archive closed and idle ticket threads in bulk"""
+        for guild in self.bot.guilds:
+            try:
+                settings = storage.get_config(guild.id).get("ticket_settings", {})
+                idle_for = timedelta(seconds=settings.get("thread_idle_archive", 86400))
+                await TicketManager.archive_idle_threads(guild, idle_for)
+            except Exception as e:
+                print(f"Error sweeping ticket threads for {guild.id}: {e}")
+    
+    @thread_sweep_task.before_loop
+    async def before_thread_sweep_task(self):
+        await self.bot.wait_until_ready()
+    
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        # Only activity from people keeps a ticket open
+        if message.guild and not message.author.bot:
+            auto_close_scheduler.touch(message.guild.id, message.channel.id)
+            if member_cache.keeps_participants and ticket_repository.get(message.guild.id, message.channel.id):
+                member_cache.remember(message.author)
+    
+    @tasks.loop(seconds=30)
+    async def auto_close_task(self):
+        """Close tickets that have been inactive for longer than auto_close_timeout"""
+        due = auto_close_scheduler.pop_due()
+        if not due:
+            return
+        
+        semaphore = asyncio.Semaphore(5)
+        
+        async def close(guild_id: int, channel_id: int, last_activity: float):
+            # Due tickets are no longer watched; one that isn't closed is only dropped once its channel is gone
+            def retry():
+                auto_close_scheduler.track(guild_id, channel_id, last_activity, due_at=time.time() + RETRY_DELAY)
+            
+            guild = self.bot.get_guild(guild_id)
+            if guild is None:
+                # Unavailable (an outage) or on another shard, not deleted
+                return retry()
+            async with semaphore:
+                try:
+                    # Archived threads aren't cached
+                    channel = guild.get_channel_or_thread(channel_id) or await guild.fetch_channel(channel_id)
+                    await channel.send("🔒 This ticket was closed automatically due to inactivity.")
+                    await TicketManager.close_ticket(channel, guild.me, get_ticket(guild_id, channel_id), reason="Ticket closed due to inactivity")
+                except discord.NotFound:
+                    # The channel was deleted, so there is nothing left to close
+                    pass
+                except Exception as e:
+                    print(f"Error auto-closing ticket {channel_id}, retrying in {RETRY_DELAY}s: {e}")
+                    retry()
+        
+        await asyncio.gather(*(close(*ticket) for ticket in due))
+    
+    @auto_close_task.before_loop
+    async def before_auto_close_task(self):
+        await self.bot.wait_until_ready()
+        for guild in self.bot.guilds:
+            auto_close_scheduler.load_guild(guild.id)
+    
+    @tasks.loop(minutes=5)
+    async def activity_flush_task(self):
+        """Persist ticket activity so auto-close resumes correctly after a restart"""
+        auto_close_scheduler.flush()
+    
+    @activity_flush_task.before_loop
+    async def before_activity_flush_task(self):
+        await self.bot.wait_until_ready()
     
     @app_commands.command(name="close", description="Close the current ticket")
     async def close(self, interaction: discord.Interaction):
@@ -30,21 +185,12 @@ class Tickets(commands.Cog):
         
         await interaction.response.send_message("🔒 Closing ticket...", ephemeral=False)
         
-        # Log closing and generate transcript
-        try:
-            await BotLogger.log_ticket_closed(interaction.guild, interaction.channel, interaction.user, ticket_data)
-        except Exception as e:
-            print(f"Error logging ticket close: {e}")
-        
-        # Mark as closed in DB
-        close_ticket(interaction.guild_id, interaction.channel.id)
-        
-        # Delete channel
+        # Log with transcript, mark as closed, then delete the channel (or lock the thread)
         try:
-            await interaction.channel.delete(reason=f"Ticket closed by {interaction.user.name}")
+            await TicketManager.close_ticket(interaction.channel, interaction.user, ticket_data)
         except Exception as e:
-            print(f"Error deleting channel: {e}")
-            await interaction.followup.send(f"❌ Error deleting channel: {e}", ephemeral=True)
+            print(f"Error closing ticket: {e}")
+            await interaction.followup.send(f"❌ Error closing ticket: {e}", ephemeral=True)
 
     @app_commands.command(name="add", description="Add a user to the ticket")
     @app_commands.describe(user="User to add to the ticket")
@@ -86,5 +232,116 @@ class Tickets(commands.Cog):
         except Exception as e:
             await interaction.response.send_message(f"❌ Error removing user: {e}", ephemeral=True)
 
+    @app_commands.command(name="ticket", description="Open a ticket")
+    @app_commands.describe(ticket_type="What the ticket is for")
+    @app_commands.rename(ticket_type="type")
+    async def ticket(self, interaction: discord.Interaction, ticket_type: str):
+        await send_ticket_modal(interaction, ticket_type)
+
+    @ticket.autocomplete("ticket_type")
+    async def ticket_type_autocomplete(self, interaction: discord.Interaction, current: str):
+        current = current.lower()
+        return [
+            app_commands.Choice(name=f"{t.emoji} {t.name}" if t.emoji else t.name, value=t.key)
+            for t in ticket_types.all(interaction.guild_id)
+            if current in t.name.lower() or current in t.key
+        ][:25]
+
+    ticket_type_group = app_commands.Group(name="ticket_type", description="Manage ticket types")
+
+    @ticket_type_group.command(name="set", description="Add a ticket type, or change the fields of an existing one")
+    @app_commands.describe(
+        key="Short ID for the type, e.g. buy_cape",
+        name="Name shown on the modal and in /ticket",
+        fields="Up to 5 fields as 'key: Label: type' separated by ';' (types: text, paragraph, number, integer, price, rank)",
+        welcome="Text of the ticket's welcome embed",
+        channel_name="Channel name pattern using field keys and {user}, e.g. cape-{user}",
+        price_product="Price the ticket with this product's prices and volume tiers",
+        quantity_field="Field holding the quantity to price",
+        rank_field="Field holding the MFA rank to price"
+    )
+    async def ticket_type_set(
+        self,
+        interaction: discord.Interaction,
+        key: str,
+        name: str,
+        fields: str,
+        welcome: str = None,
+        channel_name: str = None,
+        price_product: str = None,
+        quantity_field: str = None,
+        rank_field: str = None
+    ):
+        if not is_owner(interaction):
+            return await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
+
+        key = key.strip().lower().replace(" ", "_").replace("-", "_")
+        parsed, error = ticket_types.parse_field_spec(fields)
+        if error:
+            return await interaction.response.send_message(error, ephemeral=True)
+
+        field_keys = {f["key"] for f in parsed}
+        if channel_name:
+            error = ticket_types.validate_channel_name(channel_name, field_keys)
+            if error:
+                return await interaction.response.send_message(error, ephemeral=True)
+
+        pricing_cfg = None
+        if price_product:
+            if price_product not in PRODUCTS:
+                return await interaction.response.send_message(f"❌ Unknown product. Use one of: {', '.join(sorted(PRODUCTS))}.", ephemeral=True)
+            if quantity_field not in field_keys or (rank_field and rank_field not in field_keys):
+                return await interaction.response.send_message("❌ `quantity_field` (and `rank_field`) must be keys of the fields.", ephemeral=True)
+            pricing_cfg = {"product": price_product, "quantity": quantity_field}
+            if rank_field:
+                pricing_cfg["rank"] = rank_field
+
+        async with storage.transaction(interaction.guild_id) as tx:
+            cfg = tx.get_config()
+            category = cfg.setdefault("ticket_categories", {}).setdefault(key, {"enabled": True})
+            old_fields = category.get("fields")
+            category.update({"name": name, "fields": parsed})
+            for option, value in (("welcome", welcome), ("channel_name", channel_name), ("pricing", pricing_cfg)):
+                if value:
+                    category[option] = value
+            tx.set_config(cfg)
+
+        await BotLogger.log_config_change(interaction.guild, interaction.user, f"Ticket Type: {key}", str(old_fields), str(parsed))
+        field_list = ", ".join(f"`{f['key']}` ({f.get('type', 'text')})" for f in parsed)
+        await interaction.response.send_message(f"✅ Ticket type **{name}** (`{key}`) saved with fields: {field_list}", ephemeral=True)
+
+    @ticket_type_set.autocomplete("price_product")
+    async def price_product_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [app_commands.Choice(name=p, value=p) for p in sorted(PRODUCTS) if current.lower() in p]
+
+    @ticket_type_group.command(name="remove", description="Remove a ticket type added with /ticket_type set")
+    async def ticket_type_remove(self, interaction: discord.Interaction, key: str):
+        if not is_owner(interaction):
+            return await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
+        if key in BUILTIN_TYPES:
+            return await interaction.response.send_message("❌ Built-in ticket types can't be removed. Disable them in `/bot config` instead.", ephemeral=True)
+
+        async with storage.transaction(interaction.guild_id) as tx:
+            cfg = tx.get_config()
+            removed = cfg.get("ticket_categories", {}).pop(key, None)
+            if removed is not None:
+                tx.set_config(cfg)
+
+        if removed is None:
+            return await interaction.response.send_message("❌ Ticket type not found.", ephemeral=True)
+        await interaction.response.send_message(f"✅ Removed ticket type `{key}`.", ephemeral=True)
+
+    @ticket_type_group.command(name="list", description="List ticket types")
+    async def ticket_type_list(self, interaction: discord.Interaction):
+        if not is_owner(interaction):
+            return await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
+
+        lines = []
+        for t in ticket_types.all(interaction.guild_id, enabled_only=False):
+            status = "✅" if t.enabled else "❌"
+            origin = "" if t.builtin else " (custom)"
+            lines.append(f"{status} **{t.name}** `{t.key}`{origin}: {', '.join(f['key'] for f in t.fields)}")
+        await interaction.response.send_message("\n".join(lines)[:2000], ephemeral=True)
+
 async def setup(bot):
     await bot.add_cog(Tickets(bot))
\ No newline at end of file
@@ -3,13 +3,22 @@ from discord import app_commands
 from discord.ext import commands
 from datetime import timedelta
 import asyncio
-import time
+from src.utils.timers import DM_KEY, timer_service
 
 class Utility(commands.Cog):
     """Utility commands for users and server management"""
     
     def __init__(self, bot):
         self.bot = bot
+        self.timer_task = None
+    
+    async def cog_load(self):
+        # A single task delivers every timer, see TimerService
+        self.timer_task = asyncio.create_task(self.run_timers())
+    
+    def cog_unload(self):
+        if self.timer_task:
+            self.timer_task.cancel()
 
     @app_commands.command(name="timer", description="Set a timer for a specific duration")
     @app_commands.describe(
@@ -23,7 +32,8 @@ class Utility(commands.Cog):
         if minutes > 1440: # 24 hours
             return await interaction.response.send_message("❌ Timer cannot be longer than 24 hours.", ephemeral=True)
 
-        end_time = int(time.time() + (minutes * 60))
+        timer = timer_service.add(interaction.guild_id or DM_KEY, interaction.channel_id, interaction.user.id, minutes * 60, reason)
+        end_time = int(timer["end_time"])
         reason_text = f"\n**Reason:** {reason}" if reason else ""
         
         embed = discord.Embed(
@@ -31,21 +41,71 @@ class Utility(commands.Cog):
             description=f"Timer set for **{minutes} minutes**.\nEnds <t:{end_time}:R>{reason_text}",
             color=0x3498db
         )
+        embed.set_footer(text=f"Timer ID: {timer['id']}")
         await interaction.response.send_message(embed=embed)
+
+    @app_commands.command(name="timers", description="List your running timers")
+    async def timers(self, interaction: discord.Interaction):
+        """List your timers"""
+        timers = timer_service.list_timers(interaction.guild_id or DM_KEY, interaction.user.id)
+        if not timers:
+            return await interaction.response.send_message("You have no running timers.", ephemeral=True)
+        
+        lines = []
+        for timer in timers[:25]:
+            reason_text = f" - {timer['reason']}" if timer.get("reason") else ""
+            lines.append(f"`#{timer['id']}` ends <t:{int(timer['end_time'])}:R> in <#{timer['channel_id']}>{reason_text}")
+        if len(timers) > 25:
+            lines.append(f"...and {len(timers) - 25} more")
         
-        await asyncio.sleep(minutes * 60)
+        embed = discord.Embed(title="⏱️ Your Timers", description="\n".join(lines), color=0x3498db)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="timer_cancel", description="Cancel one or more of your timers")
+    @app_commands.describe(timer_ids="Timer IDs separated by spaces or commas, or 'all'")
+    async def timer_cancel(self, interaction: discord.Interaction, timer_ids: str):
+        """Cancel timers"""
+        if timer_ids.strip().lower() == "all":
+            ids = [t["id"] for t in timer_service.list_timers(interaction.guild_id or DM_KEY, interaction.user.id)]
+        else:
+            try:
+                ids = [int(part.lstrip("#")) for part in timer_ids.replace(",", " ").split()]
+            except ValueError:
+                return await interaction.response.send_message("❌ Invalid timer ID. Use the IDs shown by /timers.", ephemeral=True)
+        
+        cancelled = timer_service.cancel(interaction.guild_id or DM_KEY, ids, user_id=interaction.user.id)
+        if not cancelled:
+            return await interaction.response.send_message("❌ No matching timers found.", ephemeral=True)
+        await interaction.response.send_message(f"✅ Cancelled {len(cancelled)} timer(s): {', '.join(f'#{i}' for i in cancelled)}", ephemeral=True)
+
+    async def deliver_timer(self, guild_id: int, timer: dict):
+        """Post an ended timer in the channel it was set in (or DM the user)"""
+        if guild_id == DM_KEY:
+            # DM channels aren't cached across restarts, so send to the user instead
+            channel = self.bot.get_user(timer["user_id"]) or await self.bot.fetch_user(timer["user_id"])
+        else:
+            channel = self.bot.get_channel(timer["channel_id"])
+        if channel is None:
+            return
         
+        minutes = round((timer["end_time"] - timer["created_at"]) / 60)
+        reason_text = f"\n**Reason:** {timer['reason']}" if timer.get("reason") else ""
         notify_embed = discord.Embed(
             title="⏰ Timer Ended!",
-            description=f"{interaction.user.mention}, your timer for **{minutes} minutes** has ended!{reason_text}",
+            description=f"<@{timer['user_id']}>, your timer for **{minutes} minutes** has ended!{reason_text}",
             color=0xe74c3c
         )
-        try:
-            await interaction.followup.send(content=interaction.user.mention, embed=notify_embed)
-        except:
-            # Fallback if original interaction token expired (unlikely for short timers but possible)
-             if interaction.channel:
-                await interaction.channel.send(content=interaction.user.mention, embed=notify_embed)
+        await channel.send(content=f"<@{timer['user_id']}>", embed=notify_embed)
+
+    async def run_timers(self):
+        await self.bot.wait_until_ready()
+        for guild in self.bot.guilds:
+            timer_service.load_guild(guild.id)
+        # DMs arrive on shard 0, so only the cluster running it delivers DM timers
+        shard_ids = getattr(self.bot, "shard_ids", None)
+        if shard_ids is None or 0 in shard_ids:
+            timer_service.load_guild(DM_KEY)
+        await timer_service.run(self.deliver_timer)
 
     @app_commands.command(name="avatar", description="View a user's avatar")
     @app_commands.describe(user="The user to view (default: yourself)")
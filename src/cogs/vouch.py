@@ -2,7 +2,9 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from src import storage
+from src.utils.http_scheduler import http_scheduler
 from src.utils.logging import BotLogger
+from src.utils.members import member_cache
 from src.tickets.utils import get_ticket
 from src.ui.vouch_views import VouchButtonView
 
@@ -41,7 +43,9 @@ class Vouch(commands.Cog):
                 ephemeral=True
             )
         
-        seller = interaction.guild.get_member(seller_id) or interaction.client.get_user(seller_id)
+        seller = member_cache.get(interaction.guild, seller_id)
+        if seller is None:
+            seller = (await member_cache.resolve(interaction.guild, [seller_id], interaction.client)).get(seller_id)
         if not seller:
             return await interaction.response.send_message(
                 "❌ Seller not found.",
@@ -95,6 +99,13 @@ class Vouch(commands.Cog):
         # Sort by vouch number
         sorted_vouches = sorted(vouches, key=lambda x: x.get('vouch_number', 0))
         
+        # Look up every seller and voucher up front, in batches, instead of once per vouch
+        users = await member_cache.resolve(
+            interaction.guild,
+            [v.get('seller_id') for v in sorted_vouches] + [v.get('vouched_by_id') for v in sorted_vouches],
+            interaction.client
+        )
+        
         restored_count = 0
         for vouch_data in sorted_vouches:
             try:
@@ -102,8 +113,8 @@ class Vouch(commands.Cog):
                 seller_id = vouch_data.get('seller_id')
                 vouched_by_id = vouch_data.get('vouched_by_id')
                 
-                seller = interaction.guild.get_member(seller_id) or interaction.client.get_user(seller_id)
-                vouched_by = interaction.guild.get_member(vouched_by_id) or interaction.client.get_user(vouched_by_id)
+                seller = users.get(seller_id)
+                vouched_by = users.get(vouched_by_id)
                 
                 if not seller or not vouched_by:
                     continue
@@ -133,7 +144,8 @@ class Vouch(commands.Cog):
                 timestamp_str = datetime.fromisoformat(vouch_data.get('timestamp', datetime.utcnow().isoformat())).strftime("%d/%m/%Y • %I:%M %p")
                 embed.set_footer(text=f"ID: {vouch_number - 1} | {timestamp_str}")
                 
-                await channel.send(embed=embed)
+                async with http_scheduler.background():
+                    await channel.send(embed=embed)
                 restored_count += 1
                 
             except Exception as e:
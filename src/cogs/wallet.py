@@ -35,7 +35,8 @@ class Wallet(commands.Cog):
         await interaction.response.defer(ephemeral=True)
         
         # Store wallet
-        storage.add_wallet(interaction.guild_id, crypto_type, address)
+        async with storage.transaction(interaction.guild_id) as tx:
+            tx.add_wallet(crypto_type, address)
         
         embed = discord.Embed(
             title="✅ Wallet Address Added",
@@ -103,7 +104,9 @@ class Wallet(commands.Cog):
         if not is_owner(interaction):
             return await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
         
-        if storage.remove_wallet(interaction.guild_id, crypto_type):
+        async with storage.transaction(interaction.guild_id) as tx:
+            removed = tx.remove_wallet(crypto_type)
+        if removed:
             await interaction.response.send_message(
                 f"✅ {crypto_type.upper()} wallet address removed.",
                 ephemeral=True
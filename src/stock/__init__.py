@@ -0,0 +1,3 @@
+from .store import StockStore, stock_store
+
+__all__ = ["StockStore", "stock_store"]
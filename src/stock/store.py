@@ -0,0 +1,234 @@
+import asyncio
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from src import storage
+from src.utils.stats import guild_stats
+
+# Items per page in the public and admin stock views
+ITEMS_PER_PAGE = 15
+# Discord caps embed field values at 1024 characters
+FIELD_LIMIT = 1024
+
+class StockStore:
+    """Per-guild stock with stable item IDs
+
+    Stock is cached in memory and every change goes through a per-guild lock,
+    so concurrent edits and sales can't overwrite each other. Rendered pages
+    are cached per guild until the stock changes.
+    """
+
+    def __init__(self):
+        # Structure: {guild_id: {"next_id": int, "items": {item_id: item}}}
+        self._guilds: Dict[int, dict] = {}
+        self._locks: Dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # Bumped on every change. Structure: {guild_id: version}
+        self._versions: Dict[int, int] = defaultdict(int)
+        # Structure: {(guild_id, admin): (version, pages)}
+        self._pages: Dict[Tuple[int, bool], Tuple[int, List[List[Tuple[str, str]]]]] = {}
+        # Called with the guild ID after its stock changed
+        self._listeners: List[Callable[[int], None]] = []
+
+    def _ensure_loaded(self, guild_id: int) -> dict:
+        guild_id = int(guild_id)
+        data = self._guilds.get(guild_id)
+        if data is None:
+            stored = storage.load_guild_json(storage.STOCK_PATH, guild_id) or {}
+            data = self._migrate(stored)
+            self._guilds[guild_id] = data
+            guild_stats.set("stock", guild_id, self._total(data))
+        return data
+
+    @staticmethod
+    def _migrate(stored: dict) -> dict:
+        """Convert the old {category: [item names]} layout, giving each item an ID"""
+        if "items" in stored and "next_id" in stored:
+            return {
+                "next_id": stored["next_id"],
+                "items": {int(k): v for k, v in stored["items"].items()}
+            }
+        data = {"next_id": 1, "items": {}}
+        for category, names in stored.items():
+            for name in names if isinstance(names, list) else []:
+                item_id = data["next_id"]
+                data["next_id"] += 1
+                data["items"][item_id] = {"id": item_id, "category": category, "name": name, "quantity": 1}
+        return data
+
+    @staticmethod
+    def _total(data: dict) -> int:
+        return sum(item.get("quantity", 1) for item in data["items"].values())
+
+    @staticmethod
+    def _copy(data: dict) -> dict:
+        return {"next_id": data["next_id"], "items": {k: dict(v) for k, v in data["items"].items()}}
+
+    async def _commit(self, guild_id: int, before: dict):
+        """Save a change made under the guild's lock, restoring `before` if the write fails"""
+        data = self._guilds[guild_id]
+        snapshot = {"next_id": data["next_id"], "items": {str(k): dict(v) for k, v in data["items"].items()}}
+        try:
+            await asyncio.to_thread(storage.save_guild_json, storage.STOCK_PATH, guild_id, snapshot)
+        except Exception:
+            self._guilds[guild_id] = before
+            raise
+        self._versions[guild_id] += 1
+        guild_stats.set("stock", guild_id, self._total(data))
+        for callback in list(self._listeners):
+            try:
+                callback(guild_id)
+            except Exception as e:
+                print(f"Error in stock listener: {e}")
+
+    def add_listener(self, callback: Callable[[int], None]):
+        """Register callback(guild_id), called after a guild's stock changes"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[int], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def version(self, guild_id: int) -> int:
+        """Get a number that changes whenever the guild's stock changes"""
+        return self._versions[int(guild_id)]
+
+    def get(self, guild_id: int, item_id: int) -> Optional[dict]:
+        item = self._ensure_loaded(guild_id)["items"].get(int(item_id))
+        return dict(item) if item else None
+
+    def items(self, guild_id: int, category: Optional[str] = None) -> List[dict]:
+        """Get a copy of every item (optionally in one category), grouped by category"""
+        items = self._ensure_loaded(guild_id)["items"].values()
+        if category is not None:
+            items = [i for i in items if i["category"] == category]
+        return sorted((dict(i) for i in items), key=lambda i: (i["category"], i["id"]))
+
+    def categories(self, guild_id: int) -> Dict[str, int]:
+        """Get {category: item count}"""
+        counts = {}
+        for item in self._ensure_loaded(guild_id)["items"].values():
+            counts[item["category"]] = counts.get(item["category"], 0) + 1
+        return counts
+
+    def total_quantity(self, guild_id: int) -> int:
+        return self._total(self._ensure_loaded(guild_id))
+
+    async def add_items(self, guild_id: int, entries: List[Tuple[str, str, int]], added_by: Optional[int] = None) -> List[dict]:
+        """Add (category, name, quantity) entries with a single write. Returns the new items"""
+        guild_id = int(guild_id)
+        async with self._locks[guild_id]:
+            data = self._ensure_loaded(guild_id)
+            before = self._copy(data)
+            now = datetime.utcnow().isoformat()
+            added = []
+            for category, name, quantity in entries:
+                item_id = data["next_id"]
+                data["next_id"] += 1
+                item = {
+                    "id": item_id,
+                    "category": category,
+                    "name": name,
+                    "quantity": max(int(quantity), 1),
+                    "added_by": added_by,
+                    "added_at": now
+                }
+                data["items"][item_id] = item
+                added.append(dict(item))
+            if added:
+                await self._commit(guild_id, before)
+            return added
+
+    async def add(self, guild_id: int, category: str, name: str, quantity: int = 1, added_by: Optional[int] = None) -> dict:
+        """Add a single item"""
+        return (await self.add_items(guild_id, [(category, name, quantity)], added_by))[0]
+
+    async def remove(self, guild_id: int, item_ids: List[int]) -> List[dict]:
+        """Remove items by ID. Returns the removed items"""
+        guild_id = int(guild_id)
+        async with self._locks[guild_id]:
+            data = self._ensure_loaded(guild_id)
+            before = self._copy(data)
+            items = data["items"]
+            removed = [items.pop(int(i)) for i in item_ids if int(i) in items]
+            if removed:
+                await self._commit(guild_id, before)
+            return removed
+
+    async def clear_category(self, guild_id: int, category: str) -> int:
+        """Remove every item in a category. Returns how many were removed"""
+        guild_id = int(guild_id)
+        async with self._locks[guild_id]:
+            data = self._ensure_loaded(guild_id)
+            before = self._copy(data)
+            items = data["items"]
+            ids = [item_id for item_id, item in items.items() if item["category"] == category]
+            for item_id in ids:
+                del items[item_id]
+            if ids:
+                await self._commit(guild_id, before)
+            return len(ids)
+
+    async def claim(self, guild_id: int, item_id: int, quantity: int = 1) -> Optional[dict]:
+        """Take `quantity` units of an item when it sells
+
+        Returns the item as it was claimed, or None if it doesn't exist or not
+        enough is left. The item is removed when its quantity reaches 0.
+        """
+        guild_id, item_id = int(guild_id), int(item_id)
+        async with self._locks[guild_id]:
+            data = self._ensure_loaded(guild_id)
+            items = data["items"]
+            item = items.get(item_id)
+            if not item or quantity < 1 or item.get("quantity", 1) < quantity:
+                return None
+            before = self._copy(data)
+            item["quantity"] = item.get("quantity", 1) - quantity
+            claimed = dict(item, quantity=quantity)
+            if item["quantity"] <= 0:
+                del items[item_id]
+            await self._commit(guild_id, before)
+            return claimed
+
+    def pages(self, guild_id: int, admin: bool = False) -> List[List[Tuple[str, str]]]:
+        """Get the stock rendered into pages of (category, text) fields, cached until the stock changes"""
+        guild_id = int(guild_id)
+        key = (guild_id, admin)
+        version = self.version(guild_id)
+        cached = self._pages.get(key)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        pages = []
+        page, page_count = [], 0
+        field_category, field_lines = None, []
+
+        def close_field():
+            if field_lines:
+                page.append((field_category, "\n".join(field_lines)))
+
+        for item in self.items(guild_id):
+            quantity = item.get("quantity", 1)
+            suffix = f" (x{quantity})" if quantity > 1 else ""
+            line = f"`#{item['id']}` {item['name']}{suffix}" if admin else f"• {item['name']}{suffix}"
+            line = line[:200]
+
+            if page_count >= ITEMS_PER_PAGE:
+                close_field()
+                pages.append(page)
+                page, page_count = [], 0
+                field_category, field_lines = item["category"], []
+            if item["category"] != field_category or len("\n".join(field_lines + [line])) > FIELD_LIMIT:
+                close_field()
+                field_category, field_lines = item["category"], []
+            field_lines.append(line)
+            page_count += 1
+
+        close_field()
+        if page:
+            pages.append(page)
+
+        self._pages[key] = (version, pages)
+        return pages
+
+# Global stock store instance
+stock_store = StockStore()
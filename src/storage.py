@@ -1,7 +1,17 @@
+import asyncio
 import json
 import os
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 APP_CONFIG_PATH = os.path.join(BASE_DIR, "config.json")
@@ -9,7 +19,32 @@ GUILD_CONFIG_PATH = os.path.join(DATA_DIR, "guilds.json")
 VOUCHES_PATH = os.path.join(DATA_DIR, "vouches.json")
 WARNINGS_PATH = os.path.join(DATA_DIR, "warnings.json")
 BLACKLIST_PATH = os.path.join(DATA_DIR, "blacklist.json")
+# Not guild-keyed: one list shared by every guild that enables blacklist_settings.use_global
+GLOBAL_BLACKLIST_PATH = os.path.join(DATA_DIR, "global_blacklist.json")
 WALLETS_PATH = os.path.join(DATA_DIR, "wallets.json")
+TICKETS_PATH = os.path.join(DATA_DIR, "tickets.json")
+TICKET_ARCHIVE_PATH = os.path.join(DATA_DIR, "tickets_archive.jsonl")
+TICKET_OVERFLOW_PATH = os.path.join(DATA_DIR, "ticket_overflow.json")
+STOCK_PATH = os.path.join(DATA_DIR, "stock.json")
+TIMERS_PATH = os.path.join(DATA_DIR, "timers.json")
+PANELS_PATH = os.path.join(DATA_DIR, "panels.json")
+# Per-guild layout used when sharding is enabled: data/guild_data/<guild_id>/<file>.json
+GUILD_DATA_DIR = os.path.join(DATA_DIR, "guild_data")
+
+# When enabled, guild-keyed files are split per guild so each shard cluster
+# only reads and writes the guilds it owns.
+_guild_partitioning = False
+
+# Structure: {(file_path, guild_id)} - guilds known to have no slice in a shared file
+_unsplit_guilds = set()
+# Structure: {guild_id: asyncio.Lock} - serializes transactions per guild
+_guild_locks = {}
+# Structure: {file_path: threading.Lock} - guards file writes made off the event loop
+_file_locks = defaultdict(threading.Lock)
+# Callbacks run after a guild's config is saved, see add_config_listener
+_config_listeners = []
+# Callbacks run after a guild's blacklist is saved, see add_blacklist_listener
+_blacklist_listeners = []
 
 def ensure_files():
     os.makedirs(DATA_DIR, exist_ok=True)
@@ -52,8 +87,117 @@ def load_json(path):
 
 def save_json(path, data):
     ensure_files()
-    with open(path, "w", encoding="utf-8") as f:
+    _write_json(path, data)
+
+def _write_json(path, data):
+    # Write to a temp file and swap it in so readers never see a half-written file
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+@contextmanager
+def process_lock(path):
+    """Hold an exclusive lock on a data file across processes (shard clusters share data/)"""
+    lock_path = f"{path}.lock"
+    with _file_locks[lock_path]:
+        with open(lock_path, "a+", encoding="utf-8") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def enable_guild_partitioning(enabled=True):
+    """Switch guild-keyed data files to the per-guild layout"""
+    global _guild_partitioning
+    _guild_partitioning = enabled
+    _unsplit_guilds.clear()
+
+def is_guild_partitioned():
+    return _guild_partitioning
+
+def _guild_file(path, guild_id):
+    return os.path.join(GUILD_DATA_DIR, str(guild_id), os.path.basename(path))
+
+def load_guild_json(path, guild_id):
+    """Load one guild's slice of a guild-keyed data file (None if missing)"""
+    g = str(guild_id)
+    if not _guild_partitioning:
+        if not os.path.exists(path):
+            return None
+        return load_json(path).get(g)
+    
+    guild_path = _guild_file(path, guild_id)
+    if os.path.exists(guild_path):
+        with open(guild_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    
+    # Not split yet: seed from the shared file written before partitioning was
+    # enabled, once per guild, so later loads only read the guild's own file
+    if (path, g) in _unsplit_guilds:
+        return None
+    value = load_json(path).get(g) if os.path.exists(path) else None
+    if value is None:
+        _unsplit_guilds.add((path, g))
+        return None
+    os.makedirs(os.path.dirname(guild_path), exist_ok=True)
+    with _file_locks[guild_path]:
+        # A save that landed while the shared file was being read wins
+        if os.path.exists(guild_path):
+            with open(guild_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        _write_json(guild_path, value)
+    return value
+
+def save_guild_json(path, guild_id, value):
+    """Save one guild's slice of a guild-keyed data file"""
+    if not _guild_partitioning:
+        # The shared file holds every guild, so concurrent writers must not interleave
+        with _file_locks[path]:
+            data = load_json(path) if os.path.exists(path) else {}
+            data[str(guild_id)] = value
+            save_json(path, data)
+        return
+    
+    guild_path = _guild_file(path, guild_id)
+    os.makedirs(os.path.dirname(guild_path), exist_ok=True)
+    with _file_locks[guild_path]:
+        _write_json(guild_path, value)
+
+def append_guild_jsonl(path, guild_id, record):
+    """Append one record to a guild's append-only JSON Lines file (cold storage)"""
+    if _guild_partitioning:
+        target = _guild_file(path, guild_id)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+    else:
+        target = path
+        record = dict(record, guild_id=int(guild_id))
+    with _file_locks[target]:
+        with open(target, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+def iter_guild_jsonl(path, guild_id):
+    """Iterate a guild's records in an append-only JSON Lines file"""
+    target = _guild_file(path, guild_id) if _guild_partitioning else path
+    if not os.path.exists(target):
+        return
+    with open(target, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if _guild_partitioning or record.get("guild_id") == int(guild_id):
+                yield record
 
 def load_app_config():
     return load_json(APP_CONFIG_PATH)
@@ -61,31 +205,32 @@ def load_app_config():
 def save_app_config(cfg):
     save_json(APP_CONFIG_PATH, cfg)
 
-def get_config(guild_id):
-    data = load_json(GUILD_CONFIG_PATH)
+def _default_guild_config():
     app = load_app_config()
-    g = str(guild_id)
-    if g not in data:
-        defaults = app.get("defaults", {})
-        data[g] = {
-            "owners": [],
-            "channels": defaults.get("channels", {"tickets": None, "vouches": None, "logs": None, "announcements": None}),
-            "staff_role": None,
-            "payments": defaults.get("payments", ["Crypto"]),
-            "coins": defaults.get("coins", {"buy_base_price": 0.0375, "sell_base_price": 0.015}),
-            "mfa_prices": defaults.get("mfa_prices", {
-                "buy": {"NON": 7.0, "VIP": 8.0, "VIP+": 9.5, "MVP": 11.0, "MVP+": 17.0},
-                "sell": {"NON": 6.0, "VIP": 7.0, "VIP+": 8.5, "MVP": 10.0, "MVP+": 15.0}
-            }),
-            "ticket_categories": defaults.get("ticket_categories", {}),
-            "ticket_settings": defaults.get("ticket_settings", {}),
-            "embed_settings": defaults.get("embed_settings", {}),
-            "images": app.get("images", {"ticket_banner": None, "mfa_banner": None, "coin_banner": None})
-        }
-        save_json(GUILD_CONFIG_PATH, data)
-    
+    defaults = app.get("defaults", {})
+    return {
+        "owners": [],
+        "channels": defaults.get("channels", {"tickets": None, "vouches": None, "logs": None, "announcements": None}),
+        "staff_role": None,
+        "payments": defaults.get("payments", ["Crypto"]),
+        "coins": defaults.get("coins", {"buy_base_price": 0.0375, "sell_base_price": 0.015}),
+        "mfa_prices": defaults.get("mfa_prices", {
+            "buy": {"NON": 7.0, "VIP": 8.0, "VIP+": 9.5, "MVP": 11.0, "MVP+": 17.0},
+            "sell": {"NON": 6.0, "VIP": 7.0, "VIP+": 8.5, "MVP": 10.0, "MVP+": 15.0}
+        }),
+        "volume_tiers": defaults.get("volume_tiers", {}),
+        "ticket_categories": defaults.get("ticket_categories", {}),
+        "ticket_settings": defaults.get("ticket_settings", {}),
+        "embed_settings": defaults.get("embed_settings", {}),
+        "blacklist_settings": defaults.get("blacklist_settings", {"use_global": False}),
+        "moderation_settings": defaults.get("moderation_settings", {}),
+        "raid_settings": defaults.get("raid_settings", {}),
+        "images": app.get("images", {"ticket_banner": None, "mfa_banner": None, "coin_banner": None})
+    }
+
+def _migrate_guild_config(cfg):
+    """Upgrade old config structures in place. Returns True if anything changed."""
     # Migrate old mfa_prices structure to new nested structure
-    cfg = data[g]
     if "mfa_prices" in cfg:
         mfa_prices = cfg["mfa_prices"]
         # Check if it's the old flat structure (has direct rank keys)
@@ -99,36 +244,255 @@ def get_config(guild_id):
                 "buy": buy_prices,
                 "sell": sell_prices
             }
-            data[g] = cfg
-            save_json(GUILD_CONFIG_PATH, data)
+            return True
+    return False
+
+class GuildTransaction:
+    """A batched read-modify-write of one guild's data
+
+    Each data file is loaded at most once and every file touched by the
+    transaction is written exactly once by commit().
+    """
     
-    return data[g]
+    def __init__(self, guild_id):
+        self.guild_id = guild_id
+        # Structure: {file_path: guild_slice}
+        self._slices = {}
+        self._dirty = set()
+    
+    @property
+    def dirty(self):
+        return bool(self._dirty)
+    
+    def load(self, path):
+        """Get this guild's slice of a data file (a dict, created if missing)"""
+        if path not in self._slices:
+            value = load_guild_json(path, self.guild_id)
+            self._slices[path] = value if value is not None else {}
+        return self._slices[path]
+    
+    def mark_dirty(self, path):
+        self._dirty.add(path)
+    
+    def replace(self, path, value):
+        """Replace this guild's slice of a data file"""
+        self._slices[path] = value
+        self._dirty.add(path)
+    
+    def commit(self):
+        """Persist every modified slice with a single write per file"""
+        config_changed = GUILD_CONFIG_PATH in self._dirty
+        blacklist_changed = BLACKLIST_PATH in self._dirty
+        for path in self._dirty:
+            save_guild_json(path, self.guild_id, self._slices[path])
+        self._dirty.clear()
+        if config_changed:
+            _notify_config_changed(self.guild_id)
+        if blacklist_changed:
+            _notify_blacklist_changed(self.guild_id, self._slices[BLACKLIST_PATH])
+    
+    # Config
+    def get_config(self):
+        if GUILD_CONFIG_PATH not in self._slices:
+            cfg = load_guild_json(GUILD_CONFIG_PATH, self.guild_id)
+            if cfg is None:
+                cfg = _default_guild_config()
+                self._dirty.add(GUILD_CONFIG_PATH)
+            if _migrate_guild_config(cfg):
+                self._dirty.add(GUILD_CONFIG_PATH)
+            self._slices[GUILD_CONFIG_PATH] = cfg
+        return self._slices[GUILD_CONFIG_PATH]
+    
+    def set_config(self, cfg):
+        self.replace(GUILD_CONFIG_PATH, cfg)
+    
+    def add_owner(self, user_id):
+        cfg = self.get_config()
+        if user_id not in cfg["owners"]:
+            cfg["owners"].append(user_id)
+            self.mark_dirty(GUILD_CONFIG_PATH)
+    
+    def set_staff_role(self, role_id):
+        self.get_config()["staff_role"] = role_id
+        self.mark_dirty(GUILD_CONFIG_PATH)
+    
+    def set_images(self, ticket_banner=None, mfa_banner=None, coin_banner=None):
+        cfg = self.get_config()
+        if ticket_banner is not None:
+            cfg["images"]["ticket_banner"] = ticket_banner
+        if mfa_banner is not None:
+            cfg["images"]["mfa_banner"] = mfa_banner
+        if coin_banner is not None:
+            cfg["images"]["coin_banner"] = coin_banner
+        self.mark_dirty(GUILD_CONFIG_PATH)
+    
+    # Vouches
+    def get_vouch_count(self, seller_id):
+        seller = self.load(VOUCHES_PATH).get(str(seller_id))
+        return len(seller.get("vouches", [])) if seller else 0
+    
+    def record_vouch(self, seller_id, vouched_by_id, product, value, review, rating, vouch_number=None, timestamp=None):
+        """Record a vouch; the vouch number is assigned here when not given. Returns the vouch number."""
+        v = self.load(VOUCHES_PATH)
+        s = str(seller_id)
+        
+        if s not in v:
+            v[s] = {"count": 0, "sum_rating": 0, "vouches": []}
+        if vouch_number is None:
+            vouch_number = len(v[s]["vouches"]) + 1
+        
+        # Keep ratings for stats
+        v[s]["count"] += 1
+        v[s]["sum_rating"] += rating
+        
+        # Store full vouch data
+        v[s]["vouches"].append({
+            "vouch_number": vouch_number,
+            "vouched_by_id": vouched_by_id,
+            "product": product,
+            "value": value,
+            "review": review,
+            "rating": rating,
+            "timestamp": timestamp or datetime.utcnow().isoformat()
+        })
+        self.mark_dirty(VOUCHES_PATH)
+        return vouch_number
+    
+    # Warnings
+    def get_warnings(self, user_id):
+        return self.load(WARNINGS_PATH).get(str(user_id), [])
+    
+    def get_warning_count(self, user_id):
+        return len(self.get_warnings(user_id))
+    
+    def add_warning(self, user_id, warned_by_id, reason):
+        w = self.load(WARNINGS_PATH)
+        w.setdefault(str(user_id), []).append({
+            "warned_by_id": warned_by_id,
+            "reason": reason,
+            "timestamp": datetime.utcnow().isoformat()
+        })
+        self.mark_dirty(WARNINGS_PATH)
+    
+    # Blacklist
+    def is_blacklisted(self, user_id):
+        return str(user_id) in self.load(BLACKLIST_PATH)
+    
+    def add_to_blacklist(self, user_id, reason):
+        self.load(BLACKLIST_PATH)[str(user_id)] = {
+            "reason": reason,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        self.mark_dirty(BLACKLIST_PATH)
+    
+    def remove_from_blacklist(self, user_id):
+        b = self.load(BLACKLIST_PATH)
+        if str(user_id) not in b:
+            return False
+        del b[str(user_id)]
+        self.mark_dirty(BLACKLIST_PATH)
+        return True
+    
+    # Wallets
+    def add_wallet(self, crypto_type, address):
+        self.load(WALLETS_PATH)[crypto_type.upper()] = address
+        self.mark_dirty(WALLETS_PATH)
+    
+    def remove_wallet(self, crypto_type):
+        w = self.load(WALLETS_PATH)
+        if crypto_type.upper() not in w:
+            return False
+        del w[crypto_type.upper()]
+        self.mark_dirty(WALLETS_PATH)
+        return True
+
+def _get_guild_lock(guild_id):
+    key = int(guild_id)
+    lock = _guild_locks.get(key)
+    if lock is None:
+        lock = _guild_locks[key] = asyncio.Lock()
+    return lock
+
+@asynccontextmanager
+async def transaction(guild_id):
+    """Run a read-modify-write on one guild's data under that guild's lock
+
+    All mutations inside the block are persisted together when it exits
+    (and discarded if it raises). Transactions for different guilds never
+    wait on each other.
+
+        async with storage.transaction(guild_id) as tx:
+            tx.add_warning(user_id, moderator_id, reason)
+            count = tx.get_warning_count(user_id)
+    """
+    async with _get_guild_lock(guild_id):
+        tx = GuildTransaction(guild_id)
+        yield tx
+        if tx.dirty:
+            await asyncio.to_thread(tx.commit)
+
+def _apply(guild_id, action):
+    """Run a single synchronous mutation and persist it (no guild lock)
+
+    Like set_config, the module-level mutators built on this don't take the
+    guild lock. They can interleave with a transaction commit running in a
+    worker thread and lose its changes, so bot code writes through
+    transaction() instead.
+    """
+    tx = GuildTransaction(guild_id)
+    result = action(tx)
+    tx.commit()
+    return result
+
+def get_config(guild_id):
+    return _apply(guild_id, lambda tx: tx.get_config())
 
 def set_config(guild_id, cfg):
-    data = load_json(GUILD_CONFIG_PATH)
-    data[str(guild_id)] = cfg
-    save_json(GUILD_CONFIG_PATH, data)
+    save_guild_json(GUILD_CONFIG_PATH, guild_id, cfg)
+    _notify_config_changed(guild_id)
+
+def add_config_listener(callback):
+    """Register callback(guild_id), called after a guild's config is saved
+
+    Saves can happen in a worker thread (transaction commits), so callbacks
+    must be thread-safe and return quickly.
+    """
+    _config_listeners.append(callback)
+
+def remove_config_listener(callback):
+    if callback in _config_listeners:
+        _config_listeners.remove(callback)
+
+def _notify_config_changed(guild_id):
+    for callback in list(_config_listeners):
+        try:
+            callback(int(guild_id))
+        except Exception as e:
+            print(f"Error in config listener: {e}")
+
+def add_blacklist_listener(callback):
+    """Register callback(guild_id, entries), called after a guild's blacklist is saved
+
+    entries is the saved {user_id: {reason, timestamp}} slice. Like config
+    listeners, callbacks may run in a worker thread.
+    """
+    _blacklist_listeners.append(callback)
+
+def _notify_blacklist_changed(guild_id, entries):
+    for callback in list(_blacklist_listeners):
+        try:
+            callback(int(guild_id), entries)
+        except Exception as e:
+            print(f"Error in blacklist listener: {e}")
 
 def add_owner(guild_id, user_id):
-    cfg = get_config(guild_id)
-    if user_id not in cfg["owners"]:
-        cfg["owners"].append(user_id)
-        set_config(guild_id, cfg)
+    _apply(guild_id, lambda tx: tx.add_owner(user_id))
 
 def set_staff_role(guild_id, role_id):
-    cfg = get_config(guild_id)
-    cfg["staff_role"] = role_id
-    set_config(guild_id, cfg)
+    _apply(guild_id, lambda tx: tx.set_staff_role(role_id))
 
 def set_images(guild_id, ticket_banner=None, mfa_banner=None, coin_banner=None):
-    cfg = get_config(guild_id)
-    if ticket_banner is not None:
-        cfg["images"]["ticket_banner"] = ticket_banner
-    if mfa_banner is not None:
-        cfg["images"]["mfa_banner"] = mfa_banner
-    if coin_banner is not None:
-        cfg["images"]["coin_banner"] = coin_banner
-    set_config(guild_id, cfg)
+    _apply(guild_id, lambda tx: tx.set_images(ticket_banner, mfa_banner, coin_banner))
 
 def set_defaults(payments=None, coins=None, mfa_prices=None):
     app = load_app_config()
@@ -146,51 +510,20 @@ def record_vouch(guild_id, seller_id, rating):
 
 def record_vouch_full(guild_id, seller_id, vouched_by_id, product, value, review, rating, vouch_number, timestamp):
     """Record a vouch with full details"""
-    v = load_json(VOUCHES_PATH)
-    g = str(guild_id)
-    s = str(seller_id)
-    
-    if g not in v:
-        v[g] = {}
-    if s not in v[g]:
-        v[g][s] = {"count": 0, "sum_rating": 0, "vouches": []}
-    
-    # Keep ratings for stats
-    v[g][s]["count"] += 1
-    v[g][s]["sum_rating"] += rating
-    
-    # Store full vouch data
-    vouch_data = {
-        "vouch_number": vouch_number,
-        "vouched_by_id": vouched_by_id,
-        "product": product,
-        "value": value,
-        "review": review,
-        "rating": rating,
-        "timestamp": timestamp or datetime.utcnow().isoformat()
-    }
-    v[g][s]["vouches"].append(vouch_data)
-    
-    save_json(VOUCHES_PATH, v)
+    _apply(guild_id, lambda tx: tx.record_vouch(seller_id, vouched_by_id, product, value, review, rating, vouch_number, timestamp))
 
 def get_vouch_count(guild_id, seller_id):
     """Get the number of vouches for a seller"""
-    v = load_json(VOUCHES_PATH)
-    g = str(guild_id)
-    s = str(seller_id)
-    if g not in v or s not in v[g]:
-        return 0
-    return len(v[g][s].get("vouches", []))
+    return GuildTransaction(guild_id).get_vouch_count(seller_id)
 
 def get_all_vouches(guild_id):
     """Get all vouches for a guild (flattened list)"""
-    v = load_json(VOUCHES_PATH)
-    g = str(guild_id)
-    if g not in v:
+    v = load_guild_json(VOUCHES_PATH, guild_id)
+    if not v:
         return []
     
     all_vouches = []
-    for seller_id, seller_data in v[g].items():
+    for seller_id, seller_data in v.items():
         vouches = seller_data.get("vouches", [])
         for vouch in vouches:
             vouch["seller_id"] = int(seller_id)
@@ -200,11 +533,10 @@ def get_all_vouches(guild_id):
 
 def get_vouch_stats(guild_id, seller_id):
     """Get vouch statistics (legacy - kept for compatibility)"""
-    v = load_json(VOUCHES_PATH)
-    g = str(guild_id)
+    v = load_guild_json(VOUCHES_PATH, guild_id) or {}
     s = str(seller_id)
-    if g in v and s in v[g]:
-        d = v[g][s]
+    if s in v:
+        d = v[s]
         avg = round(d["sum_rating"] / d["count"], 2) if d["count"] else 0
         return d["count"], avg
     return 0, 0.0
@@ -212,32 +544,11 @@ def get_vouch_stats(guild_id, seller_id):
 # Warning system
 def add_warning(guild_id, user_id, warned_by_id, reason):
     """Add a warning to a user"""
-    w = load_json(WARNINGS_PATH)
-    g = str(guild_id)
-    u = str(user_id)
-    
-    if g not in w:
-        w[g] = {}
-    if u not in w[g]:
-        w[g][u] = []
-    
-    warning = {
-        "warned_by_id": warned_by_id,
-        "reason": reason,
-        "timestamp": datetime.utcnow().isoformat()
-    }
-    w[g][u].append(warning)
-    save_json(WARNINGS_PATH, w)
+    _apply(guild_id, lambda tx: tx.add_warning(user_id, warned_by_id, reason))
 
 def get_warnings(guild_id, user_id):
     """Get all warnings for a user"""
-    w = load_json(WARNINGS_PATH)
-    g = str(guild_id)
-    u = str(user_id)
-    
-    if g not in w or u not in w[g]:
-        return []
-    return w[g][u]
+    return GuildTransaction(guild_id).get_warnings(user_id)
 
 def get_warning_count(guild_id, user_id):
     """Get warning count for a user"""
@@ -246,80 +557,31 @@ def get_warning_count(guild_id, user_id):
 # Blacklist system
 def add_to_blacklist(guild_id, user_id, reason):
     """Add a user to the blacklist"""
-    b = load_json(BLACKLIST_PATH)
-    g = str(guild_id)
-    u = str(user_id)
-    
-    if g not in b:
-        b[g] = {}
-    
-    b[g][u] = {
-        "reason": reason,
-        "timestamp": datetime.utcnow().isoformat()
-    }
-    save_json(BLACKLIST_PATH, b)
+    _apply(guild_id, lambda tx: tx.add_to_blacklist(user_id, reason))
 
 def remove_from_blacklist(guild_id, user_id):
     """Remove a user from the blacklist"""
-    b = load_json(BLACKLIST_PATH)
-    g = str(guild_id)
-    u = str(user_id)
-    
-    if g not in b or u not in b[g]:
-        return False
-    
-    del b[g][u]
-    save_json(BLACKLIST_PATH, b)
-    return True
+    return _apply(guild_id, lambda tx: tx.remove_from_blacklist(user_id))
 
 def is_blacklisted(guild_id, user_id):
-    """Check if a user is blacklisted"""
-    b = load_json(BLACKLIST_PATH)
-    g = str(guild_id)
-    u = str(user_id)
-    
-    return g in b and u in b[g]
+    """Check if a user is blacklisted in a guild (or globally, if the guild uses the global list)"""
+    from src.utils.blacklist import blacklist
+    return blacklist.is_blacklisted(guild_id, user_id)
 
 # Wallet storage system
 def add_wallet(guild_id, crypto_type, address):
     """Add a crypto wallet address"""
-    w = load_json(WALLETS_PATH)
-    g = str(guild_id)
-    
-    if g not in w:
-        w[g] = {}
-    
-    w[g][crypto_type.upper()] = address
-    save_json(WALLETS_PATH, w)
+    _apply(guild_id, lambda tx: tx.add_wallet(crypto_type, address))
 
 def get_wallet(guild_id, crypto_type):
     """Get a crypto wallet address"""
-    w = load_json(WALLETS_PATH)
-    g = str(guild_id)
-    
-    if g not in w:
-        return None
-    
-    return w[g].get(crypto_type.upper())
+    w = load_guild_json(WALLETS_PATH, guild_id) or {}
+    return w.get(crypto_type.upper())
 
 def get_all_wallets(guild_id):
     """Get all wallet addresses for a guild"""
-    w = load_json(WALLETS_PATH)
-    g = str(guild_id)
-    
-    if g not in w:
-        return {}
-    
-    return w[g]
+    return load_guild_json(WALLETS_PATH, guild_id) or {}
 
 def remove_wallet(guild_id, crypto_type):
     """Remove a crypto wallet address"""
-    w = load_json(WALLETS_PATH)
-    g = str(guild_id)
-    
-    if g not in w or crypto_type.upper() not in w[g]:
-        return False
-    
-    del w[g][crypto_type.upper()]
-    save_json(WALLETS_PATH, w)
-    return True
+    return _apply(guild_id, lambda tx: tx.remove_wallet(crypto_type))
@@ -0,0 +1,130 @@
+import heapq
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Set, Tuple
+from src import storage
+from src.tickets.repository import ticket_repository
+
+# Seconds before a ticket that failed to auto-close is tried again
+RETRY_DELAY = 600
+
+class AutoCloseScheduler:
+    """Find tickets that have been inactive for longer than auto_close_timeout
+
+    Last activity is kept in a dict, so touching a ticket is O(1). The heap
+    holds one deadline per ticket and is corrected lazily: when an entry
+    comes due, it is pushed back if the ticket saw activity in the meantime.
+    """
+
+    def __init__(self):
+        # Structure: [(deadline, guild_id, channel_id)]
+        self._heap: List[Tuple[float, int, int]] = []
+        # Tickets with an entry in the heap, so re-tracking never adds a duplicate
+        self._queued: Set[Tuple[int, int]] = set()
+        # Structure: {(guild_id, channel_id): last_activity_timestamp}
+        self._activity: Dict[Tuple[int, int], float] = {}
+        # Activity not written to the ticket repository yet. Structure: {guild_id: {channel_id}}
+        self._dirty: Dict[int, Set[int]] = {}
+
+    def __len__(self):
+        return len(self._activity)
+
+    @staticmethod
+    def get_timeout(guild_id: int):
+        """Get a guild's auto-close timeout in seconds, or None if auto-close is off"""
+        settings = storage.get_config(guild_id).get("ticket_settings", {})
+        if not settings.get("auto_close"):
+            return None
+        return float(settings.get("auto_close_timeout", 86400))
+
+    def track(self, guild_id: int, channel_id: int, last_activity: float = None, due_at: float = None):
+        """Start watching an open ticket (due_at sets when it is next checked, e.g. to retry a close)"""
+        key = (int(guild_id), int(channel_id))
+        if key in self._activity:
+            return
+        last_activity = last_activity if last_activity is not None else time.time()
+        self._activity[key] = last_activity
+        if key not in self._queued:
+            # The real deadline is worked out (and the entry pushed back) when this comes due,
+            # so tracking a ticket never has to read the guild config
+            heapq.heappush(self._heap, (due_at if due_at is not None else last_activity + 60, key[0], key[1]))
+            self._queued.add(key)
+
+    def touch(self, guild_id: int, channel_id: int):
+        """Record activity in a ticket (no-op for channels that aren't watched)"""
+        key = (guild_id, channel_id)
+        if key in self._activity:
+            self._activity[key] = time.time()
+            self._dirty.setdefault(guild_id, set()).add(channel_id)
+
+    def untrack(self, guild_id: int, channel_id: int):
+        """Stop watching a ticket (its heap entry is dropped when it comes due)"""
+        key = (int(guild_id), int(channel_id))
+        self._activity.pop(key, None)
+        if key[0] in self._dirty:
+            self._dirty[key[0]].discard(key[1])
+
+    def load_guild(self, guild_id: int):
+        """Watch every open ticket of a guild, resuming from the stored last activity"""
+        for channel_id in ticket_repository.open_channel_ids(guild_id):
+            ticket = ticket_repository.get(guild_id, channel_id) or {}
+            stamp = ticket.get("last_activity") or ticket.get("opened_at")
+            try:
+                # Ticket timestamps are naive UTC
+                last_activity = datetime.fromisoformat(stamp).replace(tzinfo=timezone.utc).timestamp() if stamp else None
+            except ValueError:
+                last_activity = None
+            self.track(guild_id, channel_id, last_activity)
+
+    def pop_due(self, now: float = None) -> List[Tuple[int, int, float]]:
+        """Remove and return (guild_id, channel_id, last_activity) of every ticket past its timeout
+
+        The tickets are no longer watched, so a caller that fails to close
+        one has to track() it again.
+        """
+        now = now if now is not None else time.time()
+        due = []
+        timeouts = {}
+        while self._heap and self._heap[0][0] <= now:
+            _, guild_id, channel_id = heapq.heappop(self._heap)
+            key = (guild_id, channel_id)
+            last_activity = self._activity.get(key)
+            if last_activity is None:
+                self._queued.discard(key)
+                continue
+
+            if guild_id not in timeouts:
+                timeouts[guild_id] = self.get_timeout(guild_id)
+            timeout = timeouts[guild_id]
+            if timeout is None:
+                # Auto-close is off for this guild, check again later
+                heapq.heappush(self._heap, (now + 3600, guild_id, channel_id))
+                continue
+
+            deadline = last_activity + timeout
+            if deadline > now:
+                heapq.heappush(self._heap, (deadline, guild_id, channel_id))
+                continue
+
+            # Skip tickets that were closed some other way
+            ticket = ticket_repository.get(guild_id, channel_id)
+            self.untrack(guild_id, channel_id)
+            self._queued.discard(key)
+            if ticket and ticket.get("is_open", True):
+                due.append((guild_id, channel_id, last_activity))
+        return due
+
+    def flush(self):
+        """Write recorded activity to the ticket repository so it survives a restart"""
+        dirty, self._dirty = self._dirty, {}
+        for guild_id, channel_ids in dirty.items():
+            updates = {
+                channel_id: datetime.utcfromtimestamp(self._activity[(guild_id, channel_id)]).isoformat()
+                for channel_id in channel_ids
+                if (guild_id, channel_id) in self._activity
+            }
+            if updates:
+                ticket_repository.set_last_activity(guild_id, updates)
+
+# Global auto-close scheduler instance
+auto_close_scheduler = AutoCloseScheduler()
@@ -0,0 +1,168 @@
+import asyncio
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+import discord
+from src import storage
+
+# Discord allows at most 50 channels in a category
+CATEGORY_CHANNEL_LIMIT = 50
+
+class CategoryAllocator:
+    """Place ticket channels in the configured category or its overflow categories
+
+    Channel counts per category are kept in memory and updated from channel
+    events, so choosing a category never scans the guild's channel list.
+    """
+
+    def __init__(self):
+        self._loaded: Set[int] = set()
+        # Structure: {(guild_id, ticket_type): [overflow_category_id]}
+        self._overflow: Dict[Tuple[int, str], List[int]] = {}
+        # Structure: {category_id: {channel_id}}
+        self._members: Dict[int, Set[int]] = {}
+        # Channel creations in flight. Structure: {category_id: count}
+        self._pending: Dict[int, int] = defaultdict(int)
+        # Structure: {overflow_category_id: (guild_id, ticket_type)}
+        self._owner: Dict[int, Tuple[int, str]] = {}
+        self._creating: Dict[Tuple[int, str], asyncio.Lock] = defaultdict(asyncio.Lock)
+        # Background deletions, kept so they aren't garbage collected mid-run
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _ensure_loaded(self, guild_id: int):
+        if guild_id in self._loaded:
+            return
+        stored = storage.load_guild_json(storage.TICKET_OVERFLOW_PATH, guild_id) or {}
+        for ticket_type, category_ids in stored.items():
+            self._overflow[(guild_id, ticket_type)] = [int(c) for c in category_ids]
+            for category_id in category_ids:
+                self._owner[int(category_id)] = (guild_id, ticket_type)
+        self._loaded.add(guild_id)
+
+    def _persist(self, guild_id: int):
+        data = {
+            ticket_type: category_ids
+            for (g, ticket_type), category_ids in self._overflow.items()
+            if g == guild_id and category_ids
+        }
+        storage.save_guild_json(storage.TICKET_OVERFLOW_PATH, guild_id, data)
+
+    def count(self, category: discord.CategoryChannel) -> int:
+        """Get the number of channels in a category, including creations in flight"""
+        members = self._members.get(category.id)
+        if members is None:
+            # First use of this category: take the count from the cache once
+            members = self._members[category.id] = {c.id for c in category.channels}
+        return len(members) + self._pending[category.id]
+
+    def has_room(self, category: discord.CategoryChannel) -> bool:
+        return self.count(category) < CATEGORY_CHANNEL_LIMIT
+
+    def overflow_ids(self, guild_id: int, ticket_type: str) -> List[int]:
+        self._ensure_loaded(guild_id)
+        return list(self._overflow.get((guild_id, ticket_type), []))
+
+    async def acquire(
+        self,
+        guild: discord.Guild,
+        ticket_type: str,
+        primary: Optional[discord.CategoryChannel]
+    ) -> Optional[discord.CategoryChannel]:
+        """Reserve room for one channel and return the category to create it in
+
+        Must be paired with release() once the channel was created (or failed).
+        """
+        if primary is None:
+            return None
+        self._ensure_loaded(guild.id)
+        key = (guild.id, ticket_type)
+
+        category = self._find_room(guild, key, primary)
+        if category is None:
+            # Only one overflow category is created at a time per ticket type
+            async with self._creating[key]:
+                category = self._find_room(guild, key, primary)
+                if category is None:
+                    category = await self._create_overflow(guild, key, primary)
+        if category is not None:
+            self._pending[category.id] += 1
+        return category
+
+    def release(self, category: Optional[discord.CategoryChannel], channel: Optional[discord.abc.GuildChannel] = None):
+        """Finish a reservation made by acquire(), recording the created channel"""
+        if category is None:
+            return
+        self._pending[category.id] = max(0, self._pending[category.id] - 1)
+        if channel is not None:
+            self.track(channel)
+
+    def _find_room(self, guild: discord.Guild, key: Tuple[int, str], primary: discord.CategoryChannel):
+        if self.has_room(primary):
+            return primary
+        for category_id in self._overflow.get(key, []):
+            category = guild.get_channel(category_id)
+            if isinstance(category, discord.CategoryChannel) and self.has_room(category):
+                return category
+        return None
+
+    async def _create_overflow(self, guild: discord.Guild, key: Tuple[int, str], primary: discord.CategoryChannel):
+        overflow = self._overflow.setdefault(key, [])
+        try:
+            category = await guild.create_category(
+                name=f"{primary.name} {len(overflow) + 2}",
+                overwrites=primary.overwrites,
+                position=primary.position + len(overflow) + 1
+            )
+        except discord.HTTPException as e:
+            print(f"Error creating overflow category for {key[1]} in {guild.id}: {e}")
+            return None
+        overflow.append(category.id)
+        self._owner[category.id] = key
+        self._members[category.id] = set()
+        self._persist(guild.id)
+        return category
+
+    def track(self, channel: discord.abc.GuildChannel):
+        """Record a channel created in (or moved into) a category"""
+        if channel.category_id is not None and channel.category_id in self._members:
+            self._members[channel.category_id].add(channel.id)
+
+    def untrack(self, channel: discord.abc.GuildChannel, category_id: Optional[int] = None):
+        """Record a channel leaving a category, removing overflow categories that become empty"""
+        if isinstance(channel, discord.CategoryChannel):
+            self._forget_category(channel.guild.id, channel.id)
+            return
+        category_id = category_id if category_id is not None else channel.category_id
+        members = self._members.get(category_id)
+        if members is None:
+            return
+        members.discard(channel.id)
+        if not members and not self._pending[category_id] and category_id in self._owner:
+            category = channel.guild.get_channel(category_id)
+            self._forget_category(channel.guild.id, category_id)
+            if category is not None:
+                task = asyncio.create_task(self._delete_category(category))
+                self._tasks.add(task)
+                task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            print(f"Error in category allocator task: {task.exception()}")
+
+    def _forget_category(self, guild_id: int, category_id: int):
+        self._members.pop(category_id, None)
+        self._pending.pop(category_id, None)
+        key = self._owner.pop(category_id, None)
+        if key and category_id in self._overflow.get(key, []):
+            self._overflow[key].remove(category_id)
+            self._persist(guild_id)
+
+    @staticmethod
+    async def _delete_category(category: discord.CategoryChannel):
+        try:
+            await category.delete(reason="Overflow ticket category is empty")
+        except discord.HTTPException as e:
+            print(f"Error deleting empty overflow category {category.id}: {e}")
+
+# Global category allocator instance
+category_allocator = CategoryAllocator()
@@ -1,24 +1,89 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 import discord
 from src import storage
 
 class TicketManager:
     @staticmethod
-    async def create(interaction, title, embed, view=None):
-        cfg = storage.get_config(interaction.guild_id)
-        ch_id = cfg["channels"]["tickets"]
+    def uses_threads(guild_id: int, ticket_type: str, cfg: Optional[dict] = None) -> bool:
+        """Check if a ticket type is opened as a thread instead of a channel"""
+        cfg = cfg if cfg is not None else storage.get_config(guild_id)
+        default = "thread" if cfg.get("ticket_settings", {}).get("create_threads") else "channel"
+        mode = cfg.get("ticket_categories", {}).get(ticket_type, {}).get("mode") or default
+        return mode == "thread"
+
+    @staticmethod
+    def get_thread_parent(guild: discord.Guild, ticket_type: Optional[str] = None, cfg: Optional[dict] = None) -> Optional[discord.TextChannel]:
+        """Get the channel ticket threads are created in"""
+        cfg = cfg if cfg is not None else storage.get_config(guild.id)
+        ch_id = None
+        if ticket_type:
+            ch_id = cfg.get("ticket_categories", {}).get(ticket_type, {}).get("thread_channel_id")
+        ch_id = ch_id or cfg.get("channels", {}).get("tickets")
+        channel = guild.get_channel(ch_id) if ch_id else None
+        return channel if isinstance(channel, discord.TextChannel) else None
 
-        if not ch_id:
+    @staticmethod
+    async def create_thread(guild: discord.Guild, ticket_type: Optional[str], name: str, user: discord.Member, cfg: Optional[dict] = None) -> discord.Thread:
+        """Create a ticket thread and add the user to it"""
+        cfg = cfg if cfg is not None else storage.get_config(guild.id)
+        channel = TicketManager.get_thread_parent(guild, ticket_type, cfg)
+        if not channel:
             raise RuntimeError("Tickets channel not configured")
 
-        channel = interaction.guild.get_channel(ch_id)
+        settings = cfg.get("ticket_settings", {})
+        if settings.get("thread_type", "private") == "public":
+            thread = await channel.create_thread(
+                name=name,
+                type=discord.ChannelType.public_thread,
+                auto_archive_duration=settings.get("thread_auto_archive", 1440)
+            )
+        else:
+            thread = await channel.create_thread(
+                name=name,
+                type=discord.ChannelType.private_thread,
+                invitable=False,
+                auto_archive_duration=settings.get("thread_auto_archive", 1440)
+            )
 
-        thread = await channel.create_thread(
-            name=f"ticket-{title.lower().replace(' ', '-')}-{interaction.user.name}",
-            type=discord.ChannelType.private_thread,
-            invitable=False
-        )
+        await thread.add_user(user)
+        if thread.type == discord.ChannelType.private_thread:
+            await TicketManager.add_staff(thread, cfg)
+        return thread
 
-        await thread.add_user(interaction.user)
+    @staticmethod
+    async def add_staff(thread: discord.Thread, cfg: dict):
+        """Give the staff role access to a private ticket thread
+
+        Mentioning the role adds every member of it who can see the parent
+        channel in one message, which is deleted again. When the bot can't
+        mention the role, its members are added one by one instead.
+        """
+        from src.utils.bulk import run_bulk
+        from src.utils.members import member_cache
+
+        staff_role = thread.guild.get_role(cfg.get("staff_role") or 0)
+        if staff_role is None:
+            return
+        try:
+            if staff_role.mentionable or thread.parent.permissions_for(thread.guild.me).mention_everyone:
+                message = await thread.send(staff_role.mention, allowed_mentions=discord.AllowedMentions(roles=[staff_role]))
+                await message.delete()
+                return
+            members = [member for member in await member_cache.members(thread.guild) if member.get_role(staff_role.id)]
+            await run_bulk(members, thread.add_user)
+        except discord.HTTPException as e:
+            print(f"Error adding staff to ticket thread {thread.id}: {e}")
+
+    @staticmethod
+    async def create(interaction, title, embed, view=None):
+        thread = await TicketManager.create_thread(
+            interaction.guild,
+            None,
+            f"ticket-{title.lower().replace(' ', '-')}-{interaction.user.name}",
+            interaction.user
+        )
         await thread.send(embed=embed, view=view)
         return thread
 
@@ -26,3 +91,59 @@ class TicketManager:
     async def close(interaction):
         if isinstance(interaction.channel, discord.Thread):
             await interaction.channel.edit(archived=True, locked=True)
+
+    @staticmethod
+    async def close_ticket(channel, closed_by: discord.Member, ticket: dict = None, reason: str = None):
+        """Close a ticket: log it with a transcript, mark it closed, then delete the channel or lock the thread"""
+        from src.tickets.utils import close_ticket
+        from src.utils.logging import BotLogger
+
+        try:
+            await BotLogger.log_ticket_closed(channel.guild, channel, closed_by, ticket)
+        except Exception as e:
+            print(f"Error logging ticket close: {e}")
+
+        close_ticket(channel.guild.id, channel.id, closed_by.id)
+
+        if isinstance(channel, discord.Thread):
+            await channel.edit(archived=True, locked=True)
+        else:
+            await channel.delete(reason=reason or f"Ticket closed by {closed_by.name}")
+
+    @staticmethod
+    async def archive_idle_threads(guild: discord.Guild, idle_for: timedelta, concurrency: int = 5) -> int:
+        """Archive ticket threads that are closed or idle, a few at a time. Returns the number archived"""
+        from src.tickets.repository import ticket_repository
+
+        cutoff = datetime.now(timezone.utc) - idle_for
+        to_archive = []
+        for thread in guild.threads:
+            if thread.archived:
+                continue
+            ticket = ticket_repository.get(guild.id, thread.id)
+            if not ticket:
+                continue
+            if not ticket.get("is_open", True):
+                to_archive.append((thread, True))
+                continue
+            # The last message ID doubles as the last activity time, no fetch needed
+            last_activity = discord.utils.snowflake_time(thread.last_message_id or thread.id)
+            if last_activity < cutoff:
+                to_archive.append((thread, False))
+
+        if not to_archive:
+            return 0
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def archive(thread: discord.Thread, lock: bool) -> bool:
+            async with semaphore:
+                try:
+                    await thread.edit(archived=True, locked=lock)
+                    return True
+                except discord.HTTPException as e:
+                    print(f"Error archiving ticket thread {thread.id}: {e}")
+                    return False
+
+        results = await asyncio.gather(*(archive(thread, lock) for thread, lock in to_archive))
+        return sum(results)
@@ -0,0 +1,134 @@
+import asyncio
+from collections import deque
+from typing import Deque, Dict, Optional, Set, Tuple
+import discord
+from src import storage
+from src.tickets.categories import CATEGORY_CHANNEL_LIMIT, category_allocator
+
+# Topic used to recognise pool channels, also after a restart
+POOL_TOPIC = "Reserved ticket channel (pool)"
+POOL_CHANNEL_NAME = "ticket-pool"
+
+class ChannelPool:
+    """Hidden, pre-created ticket channels per category
+
+    Claiming a channel costs one API call (rename + overwrites in a single
+    edit) instead of a channel create. The pool is refilled in the background.
+    """
+
+    def __init__(self):
+        # Structure: {(guild_id, category_id or 0): deque([channel_id])}
+        self._pools: Dict[Tuple[int, int], Deque[int]] = {}
+        self._filling: Set[Tuple[int, int]] = set()
+        # Background fills, kept so they aren't garbage collected mid-run
+        self._tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def _key(guild: discord.Guild, category: Optional[discord.CategoryChannel]) -> Tuple[int, int]:
+        return guild.id, category.id if category else 0
+
+    @staticmethod
+    def get_size(guild_id: int) -> int:
+        """Get the configured pool size per category (0 disables the pool)"""
+        settings = storage.get_config(guild_id).get("ticket_settings", {})
+        return int(settings.get("channel_pool_size", 0) or 0)
+
+    def available(self, guild: discord.Guild, category: Optional[discord.CategoryChannel]) -> int:
+        return len(self._pools.get(self._key(guild, category), ()))
+
+    def discover(self, guild: discord.Guild):
+        """Adopt pool channels left over from a previous run"""
+        for channel in guild.text_channels:
+            if channel.topic == POOL_TOPIC:
+                pool = self._pools.setdefault(self._key(guild, channel.category), deque())
+                if channel.id not in pool:
+                    pool.append(channel.id)
+
+    def forget(self, channel: discord.abc.GuildChannel):
+        """Drop a channel that was deleted from the pool"""
+        pool = self._pools.get(self._key(channel.guild, channel.category))
+        if pool and channel.id in pool:
+            pool.remove(channel.id)
+
+    async def claim(
+        self,
+        guild: discord.Guild,
+        category: Optional[discord.CategoryChannel],
+        name: str,
+        overwrites: dict
+    ) -> Optional[discord.TextChannel]:
+        """Turn a pooled channel into a ticket channel, or return None if the pool is empty"""
+        pool = self._pools.get(self._key(guild, category))
+        while pool:
+            channel = guild.get_channel(pool.popleft())
+            if not isinstance(channel, discord.TextChannel):
+                continue
+            try:
+                await channel.edit(name=name, overwrites=overwrites, topic=None)
+            except discord.NotFound:
+                continue
+            except discord.HTTPException as e:
+                # The edit didn't apply, so the channel is still a hidden pool channel
+                print(f"Error claiming pool channel {channel.id}: {e}")
+                pool.append(channel.id)
+                return None
+            self.schedule_fill(guild, category)
+            return channel
+        self.schedule_fill(guild, category)
+        return None
+
+    def schedule_fill(self, guild: discord.Guild, category: Optional[discord.CategoryChannel]):
+        """Refill a pool in the background"""
+        if self.get_size(guild.id) > 0 and self._key(guild, category) not in self._filling:
+            task = asyncio.create_task(self.fill(guild, category))
+            self._tasks.add(task)
+            task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            print(f"Error filling ticket channel pool: {task.exception()}")
+
+    async def fill(self, guild: discord.Guild, category: Optional[discord.CategoryChannel]):
+        """Create hidden channels until the pool is at its configured size"""
+        key = self._key(guild, category)
+        if key in self._filling:
+            return
+        self._filling.add(key)
+        try:
+            size = self.get_size(guild.id)
+            pool = self._pools.setdefault(key, deque())
+            overwrites = {
+                guild.default_role: discord.PermissionOverwrite(read_messages=False, view_channel=False),
+                guild.me: discord.PermissionOverwrite(read_messages=True, view_channel=True, manage_channels=True)
+            }
+            while len(pool) < size:
+                # Keep room in the category for channels created outside the pool
+                if category and category_allocator.count(category) >= CATEGORY_CHANNEL_LIMIT - 1:
+                    break
+                if category:
+                    channel = await category.create_text_channel(name=POOL_CHANNEL_NAME, overwrites=overwrites, topic=POOL_TOPIC)
+                else:
+                    channel = await guild.create_text_channel(name=POOL_CHANNEL_NAME, overwrites=overwrites, topic=POOL_TOPIC)
+                category_allocator.track(channel)
+                pool.append(channel.id)
+        except discord.HTTPException as e:
+            print(f"Error filling ticket channel pool in {guild.id}: {e}")
+        finally:
+            self._filling.discard(key)
+
+    async def replenish(self, guild: discord.Guild):
+        """Fill the pools of every ticket category configured in a guild"""
+        if self.get_size(guild.id) <= 0:
+            return
+        from src.tickets.utils import get_category_for_ticket_type
+        cfg = storage.get_config(guild.id)
+        categories = {}
+        for ticket_type in cfg.get("ticket_categories", {}):
+            category = get_category_for_ticket_type(guild, ticket_type)
+            categories[category.id if category else 0] = category
+        for category in categories.values():
+            await self.fill(guild, category)
+
+# Global channel pool instance
+channel_pool = ChannelPool()
@@ -0,0 +1,263 @@
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+from src import storage
+
+class TicketRepository:
+    """In-memory ticket store indexed by channel, opener and status
+
+    Open (and recently closed) tickets form the hot set kept in tickets.json.
+    Closed tickets are moved to an append-only archive so the hot set, and
+    every lookup against it, stays small. Guilds are loaded on first access.
+    """
+
+    def __init__(self):
+        self._loaded: Set[int] = set()
+        # Primary index. Structure: {guild_id: {channel_id: ticket}}
+        self._tickets: Dict[int, Dict[int, dict]] = {}
+        # Structure: {(guild_id, user_id): {channel_id}}
+        self._by_opener: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+        # Structure: {guild_id: {channel_id}}
+        self._open: Dict[int, Set[int]] = defaultdict(set)
+        # Structure: {(guild_id, user_id): {channel_id}}
+        self._open_by_user: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+        # Structure: {(guild_id, user_id, ticket_type): {channel_id}}
+        self._open_by_type: Dict[Tuple[int, int, str], Set[int]] = defaultdict(set)
+        # Tickets being created (channel not made yet), counted towards quotas
+        # Structure: {(guild_id, user_id): {ticket_type: [expires_at]}}
+        self._reserved: Dict[Tuple[int, int], Dict[str, List[float]]] = {}
+
+    def _ensure_loaded(self, guild_id: int) -> Dict[int, dict]:
+        guild_id = int(guild_id)
+        if guild_id not in self._loaded:
+            stored = storage.load_guild_json(storage.TICKETS_PATH, guild_id) or {}
+            self._tickets[guild_id] = {}
+            for ticket in stored.values():
+                self._index(guild_id, ticket)
+            self._loaded.add(guild_id)
+        return self._tickets[guild_id]
+
+    def _index(self, guild_id: int, ticket: dict):
+        channel_id = int(ticket["channel_id"])
+        self._tickets.setdefault(guild_id, {})[channel_id] = ticket
+        opener = ticket.get("opened_by")
+        if opener is not None:
+            self._by_opener[(guild_id, int(opener))].add(channel_id)
+            if ticket.get("is_open", True):
+                self._open[guild_id].add(channel_id)
+                self._open_by_user[(guild_id, int(opener))].add(channel_id)
+                self._open_by_type[(guild_id, int(opener), ticket.get("ticket_type"))].add(channel_id)
+
+    def _unindex(self, guild_id: int, channel_id: int):
+        ticket = self._tickets.get(guild_id, {}).pop(channel_id, None)
+        if not ticket:
+            return None
+        opener = ticket.get("opened_by")
+        self._open[guild_id].discard(channel_id)
+        if opener is not None:
+            self._by_opener[(guild_id, int(opener))].discard(channel_id)
+            self._open_by_user[(guild_id, int(opener))].discard(channel_id)
+            self._open_by_type[(guild_id, int(opener), ticket.get("ticket_type"))].discard(channel_id)
+        return ticket
+
+    def _persist(self, guild_id: int):
+        hot = {str(channel_id): ticket for channel_id, ticket in self._tickets.get(guild_id, {}).items()}
+        storage.save_guild_json(storage.TICKETS_PATH, guild_id, hot)
+
+    def get(self, guild_id: int, channel_id: int) -> Optional[dict]:
+        """Get a copy of a ticket by channel ID"""
+        ticket = self._ensure_loaded(guild_id).get(int(channel_id))
+        return dict(ticket) if ticket else None
+
+    def save(self, guild_id: int, ticket_data: dict):
+        """Insert or replace a ticket"""
+        guild_id = int(guild_id)
+        self._ensure_loaded(guild_id)
+        if "opened_at" not in ticket_data:
+            ticket_data["opened_at"] = datetime.utcnow().isoformat()
+        ticket = dict(ticket_data)
+        self._unindex(guild_id, int(ticket["channel_id"]))
+        self._index(guild_id, ticket)
+        if ticket.get("opened_by") is not None:
+            self.release(guild_id, ticket["opened_by"], ticket.get("ticket_type"))
+        self._persist(guild_id)
+
+    def update(self, guild_id: int, channel_id: int, **fields) -> Optional[dict]:
+        """Update fields of a ticket in place"""
+        guild_id, channel_id = int(guild_id), int(channel_id)
+        ticket = self._ensure_loaded(guild_id).get(channel_id)
+        if not ticket:
+            return None
+        ticket = dict(ticket, **fields)
+        self._unindex(guild_id, channel_id)
+        self._index(guild_id, ticket)
+        self._persist(guild_id)
+        return dict(ticket)
+
+    def set_last_activity(self, guild_id: int, updates: Dict[int, str]):
+        """Record the last activity time of several tickets with a single write"""
+        guild_id = int(guild_id)
+        tickets = self._ensure_loaded(guild_id)
+        changed = False
+        for channel_id, stamp in updates.items():
+            ticket = tickets.get(int(channel_id))
+            if ticket is not None:
+                # last_activity isn't indexed, so it can be set in place
+                ticket["last_activity"] = stamp
+                changed = True
+        if changed:
+            self._persist(guild_id)
+
+    def close(self, guild_id: int, channel_id: int, closed_by: Optional[int] = None) -> Optional[dict]:
+        """Mark a ticket as closed"""
+        ticket = self.get(guild_id, channel_id)
+        if not ticket or not ticket.get("is_open", True):
+            return ticket
+        return self.update(
+            guild_id,
+            channel_id,
+            is_open=False,
+            closed_at=datetime.utcnow().isoformat(),
+            closed_by=closed_by
+        )
+
+    def archive(self, guild_id: int, channel_id: int) -> bool:
+        """Move a ticket from the hot set into the cold archive"""
+        guild_id, channel_id = int(guild_id), int(channel_id)
+        self._ensure_loaded(guild_id)
+        ticket = self._unindex(guild_id, channel_id)
+        if not ticket:
+            return False
+        ticket.setdefault("archived_at", datetime.utcnow().isoformat())
+        storage.append_guild_jsonl(storage.TICKET_ARCHIVE_PATH, guild_id, ticket)
+        self._persist(guild_id)
+        return True
+
+    def archive_closed(self, guild_id: int, older_than: timedelta = timedelta(0)) -> int:
+        """Archive every closed ticket of a guild closed more than `older_than` ago"""
+        guild_id = int(guild_id)
+        tickets = self._ensure_loaded(guild_id)
+        cutoff = datetime.utcnow() - older_than
+        to_archive = []
+        for channel_id, ticket in tickets.items():
+            if ticket.get("is_open", True):
+                continue
+            closed_at = ticket.get("closed_at")
+            # Tickets closed before closed_at was recorded are always archived
+            if not closed_at or datetime.fromisoformat(closed_at) <= cutoff:
+                to_archive.append((channel_id, ticket))
+
+        if not to_archive:
+            return 0
+        for channel_id, ticket in to_archive:
+            self._unindex(guild_id, channel_id)
+            ticket.setdefault("archived_at", datetime.utcnow().isoformat())
+            storage.append_guild_jsonl(storage.TICKET_ARCHIVE_PATH, guild_id, ticket)
+        self._persist(guild_id)
+        return len(to_archive)
+
+    def get_archived(self, guild_id: int, channel_id: int) -> Optional[dict]:
+        """Look up a ticket in the cold archive (slow, scans the archive)"""
+        found = None
+        for ticket in storage.iter_guild_jsonl(storage.TICKET_ARCHIVE_PATH, guild_id):
+            if int(ticket.get("channel_id", 0)) == int(channel_id):
+                found = ticket
+        return found
+
+    def has_open(self, guild_id: int, user_id: int, ticket_type: Optional[str] = None) -> bool:
+        """Check if a user has an open ticket (optionally of one type)"""
+        return self.count_open(guild_id, user_id, ticket_type) > 0
+
+    def count_open(self, guild_id: int, user_id: int, ticket_type: Optional[str] = None) -> int:
+        """Count a user's open tickets (optionally of one type)"""
+        guild_id, user_id = int(guild_id), int(user_id)
+        self._ensure_loaded(guild_id)
+        if ticket_type is not None:
+            return len(self._open_by_type.get((guild_id, user_id, ticket_type), ()))
+        return len(self._open_by_user.get((guild_id, user_id), ()))
+
+    def count_reserved(self, guild_id: int, user_id: int, ticket_type: Optional[str] = None) -> int:
+        """Count a user's unexpired reservations (optionally of one type)"""
+        key = (int(guild_id), int(user_id))
+        by_type = self._reserved.get(key)
+        if not by_type:
+            return 0
+        now = time.monotonic()
+        for reserved_type in list(by_type):
+            live = [expires for expires in by_type[reserved_type] if expires > now]
+            if live:
+                by_type[reserved_type] = live
+            else:
+                del by_type[reserved_type]
+        if not by_type:
+            del self._reserved[key]
+            return 0
+        if ticket_type is not None:
+            return len(by_type.get(ticket_type, ()))
+        return sum(len(reservations) for reservations in by_type.values())
+
+    def try_reserve(
+        self,
+        guild_id: int,
+        user_id: int,
+        ticket_type: str,
+        max_per_type: Optional[int],
+        max_total: Optional[int],
+        ttl: float = 120
+    ) -> Optional[str]:
+        """Reserve a ticket slot if the user is under their quotas
+
+        Returns None on success, or "type"/"total" naming the quota that was hit.
+        The reservation is consumed by save() or dropped with release().
+        """
+        guild_id, user_id = int(guild_id), int(user_id)
+        if max_per_type is not None:
+            if self.count_open(guild_id, user_id, ticket_type) + self.count_reserved(guild_id, user_id, ticket_type) >= max_per_type:
+                return "type"
+        if max_total is not None:
+            if self.count_open(guild_id, user_id) + self.count_reserved(guild_id, user_id) >= max_total:
+                return "total"
+        self._reserved.setdefault((guild_id, user_id), {}).setdefault(ticket_type, []).append(time.monotonic() + ttl)
+        return None
+
+    def release(self, guild_id: int, user_id: int, ticket_type: str):
+        """Drop one reservation (the ticket was created or creation failed)"""
+        key = (int(guild_id), int(user_id))
+        by_type = self._reserved.get(key, {})
+        reservations = by_type.get(ticket_type)
+        if reservations:
+            reservations.pop(0)
+            if not reservations:
+                del by_type[ticket_type]
+            if not by_type:
+                del self._reserved[key]
+
+    def open_channel_ids(self, guild_id: int) -> List[int]:
+        """Get the channel IDs of all open tickets in a guild"""
+        self._ensure_loaded(guild_id)
+        return list(self._open[int(guild_id)])
+
+    def open_count(self, guild_id: Optional[int] = None, load: bool = True) -> int:
+        """Count open tickets in one guild, or across all loaded guilds
+
+        With load=False a guild that isn't loaded yet counts as 0 instead of being read from storage.
+        """
+        if guild_id is not None:
+            if not load and int(guild_id) not in self._loaded:
+                return 0
+            self._ensure_loaded(guild_id)
+            return len(self._open[int(guild_id)])
+        return sum(len(channels) for channels in self._open.values())
+
+    def tickets_by_opener(self, guild_id: int, user_id: int) -> List[dict]:
+        """Get copies of every hot ticket opened by a user"""
+        guild_id = int(guild_id)
+        tickets = self._ensure_loaded(guild_id)
+        return [dict(tickets[c]) for c in self._by_opener.get((guild_id, int(user_id)), ()) if c in tickets]
+
+    def loaded_guilds(self) -> List[int]:
+        return list(self._loaded)
+
+# Global ticket repository instance
+ticket_repository = TicketRepository()
@@ -0,0 +1,306 @@
+import string
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from src import storage
+from src.utils.helpers import parse_color
+from src.utils.pricing import RANKS
+
+# Discord modals hold at most five text inputs
+MAX_FIELDS = 5
+FIELD_TYPES = {"text", "paragraph", "number", "integer", "price", "rank"}
+
+PAYMENT_FIELD = {
+    "key": "payment_method", "label": "Payment Method",
+    "placeholder": "Crypto only (e.g. Bitcoin, Ethereum, USDT)", "max_length": 50
+}
+
+# Built-in ticket types. A guild's ticket_categories entry can override any of
+# these keys, and entries with "fields" that aren't listed here define new types.
+#   fields:       modal inputs, in order. Each has a key (stored on the ticket), label,
+#                 and optionally type, placeholder, required, max_length, display
+#                 (format string for the embed, e.g. "{value:.2f}M coins") and embed
+#                 (the embed field name, or false to leave the value out)
+#   channel_name: channel name pattern using field keys and {user}
+#   pricing:      quote a pricing engine product, using the "quantity" (and "rank") fields
+#   skycrypt:     field holding a username to link on SkyCrypt
+#   opener_label: embed field showing who opened the ticket
+BUILTIN_TYPES = {
+    "sell_account": {
+        "name": "Sell Account",
+        "fields": [
+            {"key": "username", "label": "Username", "placeholder": "Enter the account username", "max_length": 100},
+            {"key": "price", "label": "How much you are looking for", "type": "price", "embed": "Price", "placeholder": "e.g. 50.00", "max_length": 20},
+            PAYMENT_FIELD,
+        ],
+        "channel_name": "sell-{username}",
+        "skycrypt": "username",
+        "opener_label": "Seller",
+    },
+    "sell_profile": {
+        "name": "Sell Profile",
+        "fields": [
+            {"key": "username", "label": "Username", "placeholder": "Enter the profile username", "max_length": 100},
+            {"key": "price", "label": "How much you are looking for", "type": "price", "embed": "Price", "placeholder": "e.g. 50.00", "max_length": 20},
+            PAYMENT_FIELD,
+        ],
+        "channel_name": "sell-profile-{username}",
+        "skycrypt": "username",
+        "opener_label": "Seller",
+    },
+    "sell_alt": {
+        "name": "Sell Alt",
+        "fields": [
+            {"key": "username", "label": "Username", "placeholder": "Enter the alt account username", "max_length": 100},
+            {"key": "price", "label": "How much you are looking for", "type": "price", "embed": "Price", "placeholder": "e.g. 50.00", "max_length": 20},
+            PAYMENT_FIELD,
+        ],
+        "channel_name": "sell-alt-{username}",
+        "skycrypt": "username",
+        "opener_label": "Seller",
+    },
+    "buy_account": {
+        "name": "Buy Account",
+        "fields": [
+            {"key": "ign", "label": "IGN (In-Game Name)", "embed": "IGN", "placeholder": "Enter the account IGN you want to buy", "max_length": 100},
+            PAYMENT_FIELD,
+        ],
+        "channel_name": "buy-{ign}",
+        "opener_label": "Buyer",
+    },
+    "sell_mfa": {
+        "name": "Sell an MFA",
+        "fields": [
+            {"key": "rank", "label": "Rank", "type": "rank", "placeholder": "VIP+", "max_length": 10},
+            {"key": "count", "label": "How many MFA's?", "type": "integer", "embed": "Quantity", "placeholder": "3", "max_length": 10},
+            PAYMENT_FIELD,
+        ],
+        "channel_name": "sell-{rank}-{count}",
+        "pricing": {"product": "sell_mfa", "quantity": "count", "rank": "rank", "unit_label": "Price per MFA"},
+        "opener_label": "Seller",
+    },
+    "buy_mfa": {
+        "name": "Buy an MFA",
+        "fields": [
+            {"key": "rank", "label": "Rank", "type": "rank", "placeholder": "VIP+", "max_length": 10},
+            {"key": "count", "label": "How many MFA's?", "type": "integer", "embed": "Quantity", "placeholder": "3", "max_length": 10},
+            dict(PAYMENT_FIELD, label="Method of Payment", embed="Payment Method"),
+        ],
+        "channel_name": "buy-{rank}-{count}",
+        "pricing": {"product": "buy_mfa", "quantity": "count", "rank": "rank", "unit_label": "Price per MFA"},
+        "opener_label": "Buyer",
+    },
+    "buy_coins": {
+        "name": "Buy Coins",
+        "fields": [
+            {"key": "ign", "label": "IGN (In-Game Name)", "embed": "IGN", "placeholder": "Your Minecraft username", "max_length": 100},
+            {"key": "amount", "label": "How much coins you gonna buy (in millions)", "type": "number", "embed": "Amount", "display": "{value:.2f}M coins", "placeholder": "e.g. 100", "max_length": 20},
+            PAYMENT_FIELD,
+        ],
+        "channel_name": "buy-{amount}",
+        "pricing": {"product": "buy_coins", "quantity": "amount", "unit_label": "Price", "unit_suffix": "/mil"},
+        "opener_label": "Buyer",
+    },
+    "sell_coins": {
+        "name": "Sell Coins",
+        "fields": [
+            {"key": "ign", "label": "IGN (In-Game Name)", "embed": "IGN", "placeholder": "Your Minecraft username", "max_length": 100},
+            {"key": "amount", "label": "How much coins you gonna sell (in millions)", "type": "number", "embed": "Amount", "display": "{value:.2f}M coins", "placeholder": "e.g. 100", "max_length": 20},
+            PAYMENT_FIELD,
+        ],
+        "channel_name": "sell-{amount}",
+        "pricing": {"product": "sell_coins", "quantity": "amount", "unit_label": "Price", "unit_suffix": "/mil"},
+        "opener_label": "Seller",
+    },
+}
+
+class TicketType(NamedTuple):
+    key: str
+    name: str
+    emoji: Optional[str]
+    description: Optional[str]
+    enabled: bool
+    fields: List[dict]
+    channel_name: str
+    pricing: Optional[dict]
+    skycrypt: Optional[str]
+    opener_label: str
+    # Embed title and text for types without a built-in embed template
+    welcome: Optional[str]
+    # The category's embed color, for built-in types too
+    color: Optional[int]
+    builtin: bool
+
+class _NameFields(dict):
+    """Leave unknown {placeholders} in channel names empty"""
+    def __missing__(self, key):
+        return ""
+
+def _slug(value) -> str:
+    return str(value).strip().lower().replace("+", "-plus").replace(".", "-").replace(" ", "-")
+
+class TicketTypes:
+    """Ticket types resolved from the built-ins and each guild's ticket_categories
+
+    A guild's types are resolved once and kept until its config is saved
+    again, so showing a modal never reads the config.
+    """
+
+    def __init__(self):
+        # Structure: {guild_id: {type_key: TicketType}}
+        self._cache: Dict[int, Dict[str, TicketType]] = {}
+        # Bumped on every config change so a resolve that raced with a save is not cached
+        self._generations: Dict[int, int] = defaultdict(int)
+        storage.add_config_listener(self.invalidate)
+
+    def invalidate(self, guild_id: int):
+        guild_id = int(guild_id)
+        self._generations[guild_id] += 1
+        self._cache.pop(guild_id, None)
+
+    @staticmethod
+    def validate_fields(fields) -> Optional[str]:
+        """Check a list of field definitions. Returns an error message, or None if they are valid"""
+        if not isinstance(fields, list) or not fields:
+            return "A ticket type needs at least one field."
+        if len(fields) > MAX_FIELDS:
+            return f"A ticket type can have at most {MAX_FIELDS} fields."
+        keys = set()
+        for field in fields:
+            if not isinstance(field, dict) or not field.get("key") or not field.get("label"):
+                return "Every field needs a key and a label."
+            if field.get("type", "text") not in FIELD_TYPES:
+                return f"Unknown field type `{field.get('type')}`. Use one of: {', '.join(sorted(FIELD_TYPES))}."
+            if field["key"] in keys or field["key"] in ("user", "channel_id", "opened_by", "ticket_type", "is_open"):
+                return f"Field key `{field['key']}` is used twice or reserved."
+            keys.add(field["key"])
+        return None
+
+    @staticmethod
+    def validate_channel_name(pattern: str, field_keys) -> Optional[str]:
+        """Check a channel name pattern. Returns an error message, or None if it is valid
+
+        Placeholders must be bare field keys or {user}; anything else would fail
+        (or render oddly) when a ticket is opened.
+        """
+        allowed = set(field_keys) | {"user"}
+        try:
+            parts = list(string.Formatter().parse(pattern))
+        except ValueError:
+            return "❌ The channel name has an unmatched `{` or `}`."
+        for _, name, spec, conversion in parts:
+            if name is None:
+                continue
+            if name not in allowed or spec or conversion:
+                placeholder = name + (f"!{conversion}" if conversion else "") + (f":{spec}" if spec else "")
+                return f"❌ Invalid placeholder `{{{placeholder}}}` in the channel name. Use field keys or `{{user}}`, e.g. `cape-{{user}}`."
+        return None
+
+    @staticmethod
+    def parse_field_spec(spec: str) -> Tuple[List[dict], Optional[str]]:
+        """Parse "key: Label: type; ..." (type is optional) into field definitions"""
+        fields = []
+        for part in spec.split(";"):
+            if not part.strip():
+                continue
+            pieces = [piece.strip() for piece in part.split(":")]
+            if len(pieces) < 2:
+                return fields, f"❌ Invalid field `{part.strip()}`. Use `key: Label` or `key: Label: type`."
+            field = {"key": _slug(pieces[0]).replace("-", "_"), "label": pieces[1]}
+            if len(pieces) > 2 and pieces[2]:
+                field["type"] = pieces[2].lower()
+            fields.append(field)
+        error = TicketTypes.validate_fields(fields)
+        return fields, f"❌ {error}" if error else None
+
+    @staticmethod
+    def resolve(key: str, category: dict) -> Optional[TicketType]:
+        """Merge a ticket_categories entry over the built-in type of the same key"""
+        builtin = BUILTIN_TYPES.get(key)
+        definition = dict(builtin or {})
+        definition.update({k: v for k, v in (category or {}).items() if v is not None})
+        if TicketTypes.validate_fields(definition.get("fields")):
+            if not builtin:
+                return None
+            definition["fields"] = builtin["fields"]
+
+        return TicketType(
+            key=key,
+            name=definition.get("name") or key.replace("_", " ").title(),
+            emoji=definition.get("emoji"),
+            description=definition.get("description"),
+            enabled=definition.get("enabled", True),
+            fields=definition["fields"],
+            channel_name=definition.get("channel_name") or f"{key.replace('_', '-')}-{{user}}",
+            pricing=definition.get("pricing"),
+            skycrypt=definition.get("skycrypt"),
+            opener_label=definition.get("opener_label") or "Opened By",
+            welcome=definition.get("welcome"),
+            color=parse_color(definition.get("color")),
+            builtin=builtin is not None
+        )
+
+    def _resolve_guild(self, guild_id: int) -> Dict[str, TicketType]:
+        guild_id = int(guild_id)
+        cached = self._cache.get(guild_id)
+        if cached is not None:
+            return cached
+
+        generation = self._generations[guild_id]
+        categories = storage.get_config(guild_id).get("ticket_categories", {}) or {}
+        types = {}
+        for key in list(BUILTIN_TYPES) + [k for k in categories if k not in BUILTIN_TYPES]:
+            ticket_type = self.resolve(key, categories.get(key))
+            if ticket_type:
+                types[key] = ticket_type
+
+        if self._generations[guild_id] == generation:
+            self._cache[guild_id] = types
+        return types
+
+    def get(self, guild_id: int, key: str) -> Optional[TicketType]:
+        return self._resolve_guild(guild_id).get(key)
+
+    def all(self, guild_id: int, enabled_only: bool = True) -> List[TicketType]:
+        return [t for t in self._resolve_guild(guild_id).values() if t.enabled or not enabled_only]
+
+    @staticmethod
+    def parse_values(ticket_type: TicketType, raw: Dict[str, str]) -> Tuple[Dict[str, object], Optional[str]]:
+        """Validate and convert submitted modal values. Returns (values, error_message)"""
+        values = {}
+        for field in ticket_type.fields:
+            key, label = field["key"], field.get("embed") or field["label"]
+            text = (raw.get(key) or "").strip()
+            field_type = field.get("type", "text")
+
+            if field_type in ("number", "price", "integer"):
+                if not text and not field.get("required", True):
+                    values[key] = None
+                    continue
+                try:
+                    value = int(text) if field_type == "integer" else float(text)
+                except ValueError:
+                    example = "50.00" if field_type == "price" else "100" if field_type == "number" else "3"
+                    return values, f"❌ Invalid {label.lower()} format! Please enter a valid number (e.g. {example})"
+                if value <= 0:
+                    return values, f"❌ {label} must be greater than 0!"
+                values[key] = value
+            elif field_type == "rank":
+                # Unknown ranks are priced as NON
+                values[key] = text.upper() if text.upper() in RANKS else "NON"
+            else:
+                values[key] = text
+        return values, None
+
+    @staticmethod
+    def channel_name(ticket_type: TicketType, raw: Dict[str, str], user_name: str) -> str:
+        """Build the ticket's channel name from its pattern and the submitted values"""
+        fallback = f"ticket-{_slug(user_name)}"
+        # Patterns edited into config.json by hand skip /ticket_type's validation
+        if TicketTypes.validate_channel_name(ticket_type.channel_name, (f["key"] for f in ticket_type.fields)):
+            print(f"Invalid channel name pattern for ticket type {ticket_type.key}: {ticket_type.channel_name!r}")
+            return fallback
+        fields = _NameFields({key: _slug(value) for key, value in raw.items()}, user=_slug(user_name))
+        return ticket_type.channel_name.format_map(fields)[:100] or fallback
+
+# Global ticket type registry
+ticket_types = TicketTypes()
@@ -1,9 +1,14 @@
 import discord
 from src import storage
+from src.tickets.auto_close import auto_close_scheduler
+from src.tickets.categories import category_allocator
+from src.tickets.manager import TicketManager
+from src.tickets.pool import channel_pool
+from src.tickets.repository import ticket_repository
 
-def get_category_for_ticket_type(guild, ticket_type: str):
+def get_category_for_ticket_type(guild, ticket_type: str, cfg: dict = None):
     """Get the category channel for a ticket type"""
-    cfg = storage.get_config(guild.id)
+    cfg = cfg if cfg is not None else storage.get_config(guild.id)
     # Try to get category from ticket_categories config
     category_id = cfg.get("ticket_categories", {}).get(ticket_type, {}).get("category_id")
     if category_id:
@@ -15,12 +20,12 @@ def get_category_for_ticket_type(guild, ticket_type: str):
     # For now, we'll create channels without a category if none is set
     return None
 
-async def create_ticket_channel(guild: discord.Guild, ticket_type: str, channel_name: str, user: discord.Member):
-    """Create a ticket channel with proper permissions"""
-    cfg = storage.get_config(guild.id)
+async def create_ticket_channel(guild: discord.Guild, ticket_type: str, channel_name: str, user: discord.Member, cfg: dict = None):
+    """Create a ticket channel (or thread, if the ticket type uses threads) with proper permissions"""
+    cfg = cfg if cfg is not None else storage.get_config(guild.id)
     
     # Get category
-    category = get_category_for_ticket_type(guild, ticket_type)
+    category = get_category_for_ticket_type(guild, ticket_type, cfg)
     
     # Get staff role
     staff_role_id = cfg.get("staff_role")
@@ -42,93 +47,68 @@ async def create_ticket_channel(guild: discord.Guild, ticket_type: str, channel_
     if staff_role:
         overwrites[staff_role] = discord.PermissionOverwrite(read_messages=True, send_messages=True, view_channel=True)
     
-    # Create channel
+    # Thread tickets don't use the channel pool or count towards category limits
+    use_thread = TicketManager.uses_threads(guild.id, ticket_type, cfg)
+    
+    # Claim a pre-created channel if the pool has one (a single edit instead of a create)
+    if not use_thread:
+        channel = await channel_pool.claim(guild, category, channel_name, overwrites)
+        if channel:
+            return channel
+    
+    # Create channel in the category, or an overflow category once it is full
+    target = None if use_thread else await category_allocator.acquire(guild, ticket_type, category)
+    channel = None
     try:
-        if category and len(category.channels) < 50:
-            channel = await category.create_text_channel(name=channel_name, overwrites=overwrites)
+        if use_thread:
+            channel = await TicketManager.create_thread(guild, ticket_type, channel_name, user, cfg)
+        elif target:
+            channel = await target.create_text_channel(name=channel_name, overwrites=overwrites)
         else:
             channel = await guild.create_text_channel(name=channel_name, overwrites=overwrites)
         return channel
     except discord.Forbidden:
-        raise Exception(f"Bot doesn't have permission to create channels. Please ensure the bot has 'Manage Channels' permission.")
+        error = "Bot doesn't have permission to create channels. Please ensure the bot has 'Manage Channels' permission."
     except discord.HTTPException as e:
-        raise Exception(f"Discord API error: {str(e)}")
+        error = f"Discord API error: {str(e)}"
     except Exception as e:
-        raise Exception(f"Unexpected error creating channel: {str(e)}")
+        error = f"Unexpected error creating channel: {str(e)}"
+    finally:
+        category_allocator.release(target, channel)
+    
+    # Free the quota slot reserved for this ticket
+    ticket_repository.release(guild.id, user.id, ticket_type)
+    raise Exception(error)
+
+def reserve_ticket_slot(guild_id: int, user_id: int, ticket_type: str, cfg: dict = None) -> str | None:
+    """Reserve an open-ticket slot for a user. Returns an error message if a quota is reached"""
+    cfg = cfg if cfg is not None else storage.get_config(guild_id)
+    settings = cfg.get("ticket_settings", {})
+    category = cfg.get("ticket_categories", {}).get(ticket_type, {})
+    # A per-category max_open overrides the global per-type quota, null means unlimited
+    max_per_type = category.get("max_open", settings.get("max_open_per_type", 1))
+    max_total = settings.get("max_open_total", 3)
+    
+    exceeded = ticket_repository.try_reserve(guild_id, user_id, ticket_type, max_per_type, max_total)
+    if exceeded == "type":
+        name = category.get("name", ticket_type.replace("_", " ").title())
+        if max_per_type == 1:
+            return f"❌ You already have an open **{name}** ticket. Please use or close it before opening another."
+        return f"❌ You can only have {max_per_type} open **{name}** tickets at a time."
+    if exceeded == "total":
+        return f"❌ You can only have {max_total} open tickets at a time. Please close one before opening another."
+    return None
 
 def save_ticket(guild_id: int, ticket_data: dict):
     """Save ticket data to JSON storage"""
-    import json
-    import os
-    from datetime import datetime
-    
-    DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data")
-    TICKETS_PATH = os.path.join(DATA_DIR, "tickets.json")
-    
-    os.makedirs(DATA_DIR, exist_ok=True)
-    
-    if os.path.exists(TICKETS_PATH):
-        with open(TICKETS_PATH, "r", encoding="utf-8") as f:
-            tickets = json.load(f)
-    else:
-        tickets = {}
-    
-    guild_key = str(guild_id)
-    if guild_key not in tickets:
-        tickets[guild_key] = {}
-    
-    # Add opened_at timestamp if not present
-    if "opened_at" not in ticket_data:
-        ticket_data["opened_at"] = datetime.utcnow().isoformat()
-    
-    channel_id = str(ticket_data["channel_id"])
-    tickets[guild_key][channel_id] = ticket_data
-    
-    with open(TICKETS_PATH, "w", encoding="utf-8") as f:
-        json.dump(tickets, f, indent=2)
+    ticket_repository.save(guild_id, ticket_data)
+    if ticket_data.get("is_open", True):
+        auto_close_scheduler.track(guild_id, ticket_data["channel_id"])
 
 def get_ticket(guild_id: int, channel_id: int):
     """Get ticket data from JSON storage"""
-    import json
-    import os
-    
-    DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data")
-    TICKETS_PATH = os.path.join(DATA_DIR, "tickets.json")
-    
-    if not os.path.exists(TICKETS_PATH):
-        return None
-    
-    with open(TICKETS_PATH, "r", encoding="utf-8") as f:
-        tickets = json.load(f)
-    
-    guild_key = str(guild_id)
-    channel_key = str(channel_id)
-    
-    if guild_key in tickets and channel_key in tickets[guild_key]:
-        return tickets[guild_key][channel_key]
-    
-    return None
+    return ticket_repository.get(guild_id, channel_id)
 
-def close_ticket(guild_id: int, channel_id: int):
+def close_ticket(guild_id: int, channel_id: int, closed_by: int = None):
     """Mark a ticket as closed"""
-    import json
-    import os
-    
-    DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data")
-    TICKETS_PATH = os.path.join(DATA_DIR, "tickets.json")
-    
-    if not os.path.exists(TICKETS_PATH):
-        return
-    
-    with open(TICKETS_PATH, "r", encoding="utf-8") as f:
-        tickets = json.load(f)
-    
-    guild_key = str(guild_id)
-    channel_key = str(channel_id)
-    
-    if guild_key in tickets and channel_key in tickets[guild_key]:
-        tickets[guild_key][channel_key]["is_open"] = False
-        
-        with open(TICKETS_PATH, "w", encoding="utf-8") as f:
-            json.dump(tickets, f, indent=2)
-
+    return ticket_repository.close(guild_id, channel_id, closed_by)
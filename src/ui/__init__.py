@@ -1,22 +1,21 @@
 # UI package
-from src.ui.modals import (
-    SellAccountModal,
-    SellProfileModal,
-    SellAltModal,
-    SellMFAModal,
-    BuyCoinsModal,
-    SellCoinsModal
-)
-from src.ui.vouch_modal import VouchModal
-from src.ui.vouch_views import VouchButtonView
+# Exports are resolved lazily so importing one UI module (e.g. src.ui.views)
+# does not pull in every modal at startup.
+import importlib
 
-__all__ = [
-    "SellAccountModal",
-    "SellProfileModal",
-    "SellAltModal",
-    "SellMFAModal",
-    "BuyCoinsModal",
-    "SellCoinsModal",
-    "VouchModal",
-    "VouchButtonView"
-]
\ No newline at end of file
+_EXPORTS = {
+    "TicketModal": "src.ui.modals",
+    "send_ticket_modal": "src.ui.modals",
+    "VouchModal": "src.ui.vouch_modal",
+    "VouchButtonView": "src.ui.vouch_views",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -1,7 +1,8 @@
 import discord
 from src import storage
-from src.utils.helpers import format_price
+from src.utils.helpers import format_price, parse_color
 from src.utils.logging import BotLogger
+from src.utils.members import member_cache
 from typing import Optional
 
 class ConfigMainView(discord.ui.View):
@@ -172,10 +173,11 @@ class ChannelSelectModal(discord.ui.Modal):
         if not channel:
             return await interaction.followup.send("❌ Channel not found! Please check the channel ID.", ephemeral=True)
         
-        cfg = storage.get_config(interaction.guild_id)
-        old_value = cfg["channels"].get(self.channel_type)
-        cfg["channels"][self.channel_type] = channel.id
-        storage.set_config(interaction.guild_id, cfg)
+        async with storage.transaction(interaction.guild_id) as tx:
+            cfg = tx.get_config()
+            old_value = cfg["channels"].get(self.channel_type)
+            cfg["channels"][self.channel_type] = channel.id
+            tx.set_config(cfg)
         
         # Log configuration change (but don't log to logs channel if it's being set)
         if self.channel_type == "logs" and channel.id != old_value:
@@ -237,7 +239,7 @@ class TicketCategorySelect(discord.ui.Select):
         embed = discord.Embed(
             title=f"🔧 Configure: {category_data.get('name', category_key.replace('_', ' ').title())}",
             description=f"Current Settings for **{category_key}**",
-            color=category_data.get('color', 0x3498db)
+            color=parse_color(category_data.get('color'), 0x3498db)
         )
         
         status = "✅ Enabled" if category_data.get('enabled', True) else "❌ Disabled"
@@ -256,11 +258,12 @@ class CategoryEditView(discord.ui.View):
 
     @discord.ui.button(label="Toggle Status", style=discord.ButtonStyle.primary, row=0)
     async def toggle_status(self, interaction: discord.Interaction, button: discord.ui.Button):
-        cfg = storage.get_config(interaction.guild_id)
-        current_status = cfg["ticket_categories"][self.category_key].get("enabled", True)
-        new_status = not current_status
-        cfg["ticket_categories"][self.category_key]["enabled"] = new_status
-        storage.set_config(interaction.guild_id, cfg)
+        async with storage.transaction(interaction.guild_id) as tx:
+            cfg = tx.get_config()
+            current_status = cfg["ticket_categories"][self.category_key].get("enabled", True)
+            new_status = not current_status
+            cfg["ticket_categories"][self.category_key]["enabled"] = new_status
+            tx.set_config(cfg)
         
         status_str = "Enabled" if new_status else "Disabled"
         
@@ -299,7 +302,7 @@ class CategoryEditView(discord.ui.View):
         embed = discord.Embed(
             title=f"🔧 Configure: {category_data.get('name', self.category_key.replace('_', ' ').title())}",
             description=f"Current Settings for **{self.category_key}**",
-            color=category_data.get('color', 0x3498db)
+            color=parse_color(category_data.get('color'), 0x3498db)
         )
         
         status = "✅ Enabled" if category_data.get('enabled', True) else "❌ Disabled"
@@ -345,14 +348,15 @@ class CategoryEditModal(discord.ui.Modal):
         self.add_item(self.desc_input)
 
     async def on_submit(self, interaction: discord.Interaction):
-        cfg = storage.get_config(interaction.guild_id)
-        old_data = cfg["ticket_categories"].get(self.category_key, {}).copy()
+        async with storage.transaction(interaction.guild_id) as tx:
+            cfg = tx.get_config()
+            old_data = cfg["ticket_categories"].get(self.category_key, {}).copy()
         
-        cfg["ticket_categories"][self.category_key]["name"] = self.name_input.value
-        cfg["ticket_categories"][self.category_key]["emoji"] = self.emoji_input.value
-        cfg["ticket_categories"][self.category_key]["description"] = self.desc_input.value
+            cfg["ticket_categories"][self.category_key]["name"] = self.name_input.value
+            cfg["ticket_categories"][self.category_key]["emoji"] = self.emoji_input.value
+            cfg["ticket_categories"][self.category_key]["description"] = self.desc_input.value
         
-        storage.set_config(interaction.guild_id, cfg)
+            tx.set_config(cfg)
         
         # Log change
         await BotLogger.log_config_change(
@@ -433,45 +437,46 @@ class MFABuyPricesModal(discord.ui.Modal, title="Configure MFA Buy Prices"):
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
         
-        cfg = storage.get_config(interaction.guild_id)
-        if "mfa_prices" not in cfg or not isinstance(cfg["mfa_prices"], dict):
-            cfg["mfa_prices"] = {"buy": {}, "sell": {}}
-        if "buy" not in cfg["mfa_prices"]:
-            cfg["mfa_prices"]["buy"] = {}
-        
-        old_prices = cfg["mfa_prices"].get("buy", {}).copy()
-        
-        if self.non.value:
-            try:
-                cfg["mfa_prices"]["buy"]["NON"] = float(self.non.value)
-            except ValueError:
-                return await interaction.followup.send("❌ Invalid price for NON! Please enter a valid number.", ephemeral=True)
-        
-        if self.vip.value:
-            try:
-                cfg["mfa_prices"]["buy"]["VIP"] = float(self.vip.value)
-            except ValueError:
-                return await interaction.followup.send("❌ Invalid price for VIP! Please enter a valid number.", ephemeral=True)
-        
-        if self.vip_plus.value:
-            try:
-                cfg["mfa_prices"]["buy"]["VIP+"] = float(self.vip_plus.value)
-            except ValueError:
-                return await interaction.followup.send("❌ Invalid price for VIP+! Please enter a valid number.", ephemeral=True)
-        
-        if self.mvp.value:
-            try:
-                cfg["mfa_prices"]["buy"]["MVP"] = float(self.mvp.value)
-            except ValueError:
-                return await interaction.followup.send("❌ Invalid price for MVP! Please enter a valid number.", ephemeral=True)
-        
-        if self.mvp_plus.value:
-            try:
-                cfg["mfa_prices"]["buy"]["MVP+"] = float(self.mvp_plus.value)
-            except ValueError:
-                return await interaction.followup.send("❌ Invalid price for MVP+! Please enter a valid number.", ephemeral=True)
-        
-        storage.set_config(interaction.guild_id, cfg)
+        async with storage.transaction(interaction.guild_id) as tx:
+            cfg = tx.get_config()
+            if "mfa_prices" not in cfg or not isinstance(cfg["mfa_prices"], dict):
+                cfg["mfa_prices"] = {"buy": {}, "sell": {}}
+            if "buy" not in cfg["mfa_prices"]:
+                cfg["mfa_prices"]["buy"] = {}
+        
+            old_prices = cfg["mfa_prices"].get("buy", {}).copy()
+        
+            if self.non.value:
+                try:
+                    cfg["mfa_prices"]["buy"]["NON"] = float(self.non.value)
+                except ValueError:
+                    return await interaction.followup.send("❌ Invalid price for NON! Please enter a valid number.", ephemeral=True)
+        
+            if self.vip.value:
+                try:
+                    cfg["mfa_prices"]["buy"]["VIP"] = float(self.vip.value)
+                except ValueError:
+                    return await interaction.followup.send("❌ Invalid price for VIP! Please enter a valid number.", ephemeral=True)
+        
+            if self.vip_plus.value:
+                try:
+                    cfg["mfa_prices"]["buy"]["VIP+"] = float(self.vip_plus.value)
+                except ValueError:
+                    return await interaction.followup.send("❌ Invalid price for VIP+! Please enter a valid number.", ephemeral=True)
+        
+            if self.mvp.value:
+                try:
+                    cfg["mfa_prices"]["buy"]["MVP"] = float(self.mvp.value)
+                except ValueError:
+                    return await interaction.followup.send("❌ Invalid price for MVP! Please enter a valid number.", ephemeral=True)
+        
+            if self.mvp_plus.value:
+                try:
+                    cfg["mfa_prices"]["buy"]["MVP+"] = float(self.mvp_plus.value)
+                except ValueError:
+                    return await interaction.followup.send("❌ Invalid price for MVP+! Please enter a valid number.", ephemeral=True)
+        
+            tx.set_config(cfg)
         
         # Log configuration change
         await BotLogger.log_config_change(
@@ -521,45 +526,46 @@ class MFASellPricesModal(discord.ui.Modal, title="Configure MFA Sell Prices"):
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
         
-        cfg = storage.get_config(interaction.guild_id)
-        if "mfa_prices" not in cfg or not isinstance(cfg["mfa_prices"], dict):
-            cfg["mfa_prices"] = {"buy": {}, "sell": {}}
-        if "sell" not in cfg["mfa_prices"]:
-            cfg["mfa_prices"]["sell"] = {}
-        
-        old_prices = cfg["mfa_prices"].get("sell", {}).copy()
-        
-        if self.non.value:
-            try:
-                cfg["mfa_prices"]["sell"]["NON"] = float(self.non.value)
-            except ValueError:
-                return await interaction.followup.send("❌ Invalid price for NON! Please enter a valid number.", ephemeral=True)
-        
-        if self.vip.value:
-            try:
-                cfg["mfa_prices"]["sell"]["VIP"] = float(self.vip.value)
-            except ValueError:
-                return await interaction.followup.send("❌ Invalid price for VIP! Please enter a valid number.", ephemeral=True)
-        
-        if self.vip_plus.value:
-            try:
-                cfg["mfa_prices"]["sell"]["VIP+"] = float(self.vip_plus.value)
-            except ValueError:
-                return await interaction.followup.send("❌ Invalid price for VIP+! Please enter a valid number.", ephemeral=True)
-        
-        if self.mvp.value:
-            try:
-                cfg["mfa_prices"]["sell"]["MVP"] = float(self.mvp.value)
-            except ValueError:
-                return await interaction.followup.send("❌ Invalid price for MVP! Please enter a valid number.", ephemeral=True)
-        
-        if self.mvp_plus.value:
-            try:
-                cfg["mfa_prices"]["sell"]["MVP+"] = float(self.mvp_plus.value)
-            except ValueError:
-                return await interaction.followup.send("❌ Invalid price for MVP+! Please enter a valid number.", ephemeral=True)
-        
-        storage.set_config(interaction.guild_id, cfg)
+        async with storage.transaction(interaction.guild_id) as tx:
+            cfg = tx.get_config()
+            if "mfa_prices" not in cfg or not isinstance(cfg["mfa_prices"], dict):
+                cfg["mfa_prices"] = {"buy": {}, "sell": {}}
+            if "sell" not in cfg["mfa_prices"]:
+                cfg["mfa_prices"]["sell"] = {}
+        
+            old_prices = cfg["mfa_prices"].get("sell", {}).copy()
+        
+            if self.non.value:
+                try:
+                    cfg["mfa_prices"]["sell"]["NON"] = float(self.non.value)
+                except ValueError:
+                    return await interaction.followup.send("❌ Invalid price for NON! Please enter a valid number.", ephemeral=True)
+        
+            if self.vip.value:
+                try:
+                    cfg["mfa_prices"]["sell"]["VIP"] = float(self.vip.value)
+                except ValueError:
+                    return await interaction.followup.send("❌ Invalid price for VIP! Please enter a valid number.", ephemeral=True)
+        
+            if self.vip_plus.value:
+                try:
+                    cfg["mfa_prices"]["sell"]["VIP+"] = float(self.vip_plus.value)
+                except ValueError:
+                    return await interaction.followup.send("❌ Invalid price for VIP+! Please enter a valid number.", ephemeral=True)
+        
+            if self.mvp.value:
+                try:
+                    cfg["mfa_prices"]["sell"]["MVP"] = float(self.mvp.value)
+                except ValueError:
+                    return await interaction.followup.send("❌ Invalid price for MVP! Please enter a valid number.", ephemeral=True)
+        
+            if self.mvp_plus.value:
+                try:
+                    cfg["mfa_prices"]["sell"]["MVP+"] = float(self.mvp_plus.value)
+                except ValueError:
+                    return await interaction.followup.send("❌ Invalid price for MVP+! Please enter a valid number.", ephemeral=True)
+        
+            tx.set_config(cfg)
         
         # Log configuration change
         await BotLogger.log_config_change(
@@ -591,23 +597,24 @@ class CoinPricesModal(discord.ui.Modal, title="Configure Coin Prices"):
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
         
-        cfg = storage.get_config(interaction.guild_id)
-        old_buy = cfg["coins"]["buy_base_price"]
-        old_sell = cfg["coins"]["sell_base_price"]
+        async with storage.transaction(interaction.guild_id) as tx:
+            cfg = tx.get_config()
+            old_buy = cfg["coins"]["buy_base_price"]
+            old_sell = cfg["coins"]["sell_base_price"]
         
-        if self.buy_price.value:
-            try:
-                cfg["coins"]["buy_base_price"] = float(self.buy_price.value)
-            except ValueError:
-                return await interaction.followup.send("❌ Invalid buy price! Please enter a valid number.", ephemeral=True)
+            if self.buy_price.value:
+                try:
+                    cfg["coins"]["buy_base_price"] = float(self.buy_price.value)
+                except ValueError:
+                    return await interaction.followup.send("❌ Invalid buy price! Please enter a valid number.", ephemeral=True)
         
-        if self.sell_price.value:
-            try:
-                cfg["coins"]["sell_base_price"] = float(self.sell_price.value)
-            except ValueError:
-                return await interaction.followup.send("❌ Invalid sell price! Please enter a valid number.", ephemeral=True)
+            if self.sell_price.value:
+                try:
+                    cfg["coins"]["sell_base_price"] = float(self.sell_price.value)
+                except ValueError:
+                    return await interaction.followup.send("❌ Invalid sell price! Please enter a valid number.", ephemeral=True)
         
-        storage.set_config(interaction.guild_id, cfg)
+            tx.set_config(cfg)
         
         # Log configuration change
         await BotLogger.log_config_change(
@@ -638,10 +645,11 @@ class PaymentMethodsModal(discord.ui.Modal, title="Configure Payment Methods"):
         await interaction.response.defer(ephemeral=True)
         
         payment_list = [m.strip() for m in self.methods.value.split(",")]
-        cfg = storage.get_config(interaction.guild_id)
-        old_methods = cfg["payments"].copy()
-        cfg["payments"] = payment_list
-        storage.set_config(interaction.guild_id, cfg)
+        async with storage.transaction(interaction.guild_id) as tx:
+            cfg = tx.get_config()
+            old_methods = cfg["payments"].copy()
+            cfg["payments"] = payment_list
+            tx.set_config(cfg)
         
         # Log configuration change
         await BotLogger.log_config_change(
@@ -705,7 +713,8 @@ class BannerModal(discord.ui.Modal):
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
         
-        storage.set_images(interaction.guild_id, **{self.banner_type: self.url.value})
+        async with storage.transaction(interaction.guild_id) as tx:
+            tx.set_images(**{self.banner_type: self.url.value})
         
         # Log configuration change
         await BotLogger.log_config_change(
@@ -786,9 +795,9 @@ class RoleSelectModal(discord.ui.Modal):
         if not role:
             return await interaction.followup.send("❌ Role not found! Please check the role ID.", ephemeral=True)
         
-        cfg = storage.get_config(interaction.guild_id)
-        old_role = cfg.get("staff_role")
-        storage.set_staff_role(interaction.guild_id, role.id)
+        async with storage.transaction(interaction.guild_id) as tx:
+            old_role = tx.get_config().get("staff_role")
+            tx.set_staff_role(role.id)
         
         # Log configuration change
         await BotLogger.log_config_change(
@@ -827,14 +836,16 @@ class AddOwnerModal(discord.ui.Modal, title="Add Owner"):
             except ValueError:
                 return await interaction.followup.send("❌ Invalid user format! Please provide a user ID or mention.", ephemeral=True)
         
-        user = interaction.guild.get_member(user_id) or interaction.client.get_user(user_id)
+        user = member_cache.get(interaction.guild, user_id)
+        if user is None:
+            user = (await member_cache.resolve(interaction.guild, [user_id], interaction.client)).get(user_id)
         if not user:
             return await interaction.followup.send("❌ User not found! Please check the user ID.", ephemeral=True)
         
-        cfg = storage.get_config(interaction.guild_id)
-        old_owners = cfg.get("owners", []).copy()
-        storage.add_owner(interaction.guild_id, user.id)
-        cfg = storage.get_config(interaction.guild_id)  # Refresh to get updated owners
+        async with storage.transaction(interaction.guild_id) as tx:
+            old_owners = tx.get_config().get("owners", []).copy()
+            tx.add_owner(user.id)
+            new_owners = tx.get_config().get("owners", []).copy()
         
         # Log configuration change
         await BotLogger.log_config_change(
@@ -842,7 +853,7 @@ class AddOwnerModal(discord.ui.Modal, title="Add Owner"):
             interaction.user,
             "Owners",
             str(old_owners),
-            str(cfg.get("owners", []))
+            str(new_owners)
         )
         
         await interaction.followup.send(f"✅ {user.mention} has been added as an owner.", ephemeral=True)
@@ -873,17 +884,20 @@ class RemoveOwnerModal(discord.ui.Modal, title="Remove Owner"):
             except ValueError:
                 return await interaction.followup.send("❌ Invalid user format! Please provide a user ID or mention.", ephemeral=True)
         
-        cfg = storage.get_config(interaction.guild_id)
-        owners = cfg.get("owners", [])
-        
-        if user_id not in owners:
-            return await interaction.followup.send("❌ This user is not an owner.", ephemeral=True)
-        
-        owners.remove(user_id)
-        cfg["owners"] = owners
-        storage.set_config(interaction.guild_id, cfg)
-        
-        user = interaction.guild.get_member(user_id) or interaction.client.get_user(user_id)
+        async with storage.transaction(interaction.guild_id) as tx:
+            cfg = tx.get_config()
+            owners = cfg.get("owners", [])
+            
+            if user_id not in owners:
+                return await interaction.followup.send("❌ This user is not an owner.", ephemeral=True)
+            
+            owners.remove(user_id)
+            cfg["owners"] = owners
+            tx.set_config(cfg)
+        
+        user = member_cache.get(interaction.guild, user_id)
+        if user is None:
+            user = (await member_cache.resolve(interaction.guild, [user_id], interaction.client)).get(user_id)
         user_mention = user.mention if user else f"<@{user_id}>"
         
         # Log configuration change
@@ -0,0 +1,170 @@
+import discord
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional
+from src import storage
+from src.utils.helpers import parse_color
+
+# Used when embed_settings has no footer_text
+DEFAULT_BRAND = "Hypixel Account Shop"
+
+# Built-in templates. "color" names the embed_settings.colors entry (ticket, mfa,
+# coin, success, error or info) that overrides "default_color", "banner" the images
+# entry shown as the embed image, and "footer" is appended to the brand in the
+# footer (panels only). A ticket category's own color overrides both.
+TEMPLATES = {
+    # Ticket embeds
+    "sell_account": {
+        "title": "Account Sale",
+        "description": "Thank you for your interest in selling an account. Please wait for a buyer to get to you.",
+        "color": "ticket", "default_color": 0xe74c3c
+    },
+    "buy_account": {
+        "title": "Account Purchase",
+        "description": "Thank you for your interest in buying an account. Please wait for a seller to get to you.",
+        "color": "ticket", "default_color": 0x2ecc71
+    },
+    "sell_profile": {
+        "title": "Profile Sale",
+        "description": "Thank you for your interest in selling a profile. Please wait for a buyer to get to you.",
+        "color": "ticket", "default_color": 0xe74c3c
+    },
+    "sell_alt": {
+        "title": "Alt Account Sale",
+        "description": "Thank you for your interest in selling an alt account. Please wait for a buyer to get to you.",
+        "color": "ticket", "default_color": 0xe74c3c
+    },
+    "sell_mfa": {
+        "title": "MFA Sale",
+        "description": "Thank you for your interest in selling MFAs. Please wait for a seller to get to you.",
+        "color": "ticket", "default_color": 0xe74c3c
+    },
+    "buy_mfa": {
+        "title": "MFA Purchase",
+        "description": "Thank you for your interest in buying MFAs. Please wait for a seller to get to you.",
+        "color": "ticket", "default_color": 0x2ecc71
+    },
+    "buy_coins": {
+        "title": "Coin Purchase",
+        "description": "Thank you for your interest in buying coins. Please wait for a seller to get to you.",
+        "color": "ticket", "default_color": 0x2ecc71
+    },
+    "sell_coins": {
+        "title": "Coin Sale",
+        "description": "Thank you for your interest in selling coins. Please wait for a seller to get to you.",
+        "color": "ticket", "default_color": 0xe74c3c
+    },
+    # Ticket types added in ticket_categories; the title and text come from the type
+    "ticket": {"color": "ticket", "default_color": 0x3498db},
+    "vouch": {"color": "info", "default_color": 0x5865f2},
+    # Panels
+    "ticket_panel": {
+        "title": "🎫  **Support & Sales Tickets**",
+        "description": "Welcome to our support system! Please choose the appropriate category below to open a ticket.",
+        "color": "ticket", "default_color": 0x2b2d31, "banner": "ticket_banner", "footer": "Secure & Fast"
+    },
+    "mfa_panel": {
+        "title": "🔐  **MFA Market**",
+        "description": "Buy or Sell Hypixel MFAs (Mail Full Access) instantly.",
+        "color": "mfa", "default_color": 0x2b2d31, "banner": "mfa_banner", "footer": "Best Rates"
+    },
+    "coin_panel": {
+        "title": "🪙  **Skyblock Coins**",
+        "description": "Safest place to Buy & Sell Skyblock Coins.",
+        "color": "coin", "default_color": 0x2b2d31, "banner": "coin_banner", "footer": "Instant Delivery"
+    },
+    "acbuy_panel": {
+        "title": "🛒  **Buy Accounts**",
+        "description": "Looking for a specific account? Click below to start a purchase request.",
+        "color": "ticket", "default_color": 0x2ecc71, "footer": ""
+    },
+    "stock_panel": {
+        "title": "📦  **Available Stock**",
+        "description": "Use `/ticket` to purchase any of these items.",
+        "color": "info", "default_color": 0x2ecc71, "footer": "Updates automatically"
+    },
+}
+
+class _Compiled(NamedTuple):
+    title: Optional[str]
+    description: Optional[str]
+    color: int
+    image_url: Optional[str]
+    footer_text: Optional[str]
+    footer_icon: Optional[str]
+
+class EmbedTemplates:
+    """Per-guild embed templates compiled from embed_settings and images
+
+    Each guild's templates are compiled once and kept until its config is
+    saved again, so building an embed only copies a few attributes and
+    adds the fields that differ per request.
+    """
+
+    def __init__(self):
+        # Structure: {guild_id: (guild_icon_url, {template_name: _Compiled})}
+        self._cache: Dict[int, tuple] = {}
+        # Bumped on every config change so a compile that raced with a save is not cached
+        self._generations: Dict[int, int] = defaultdict(int)
+        storage.add_config_listener(self.invalidate)
+
+    def invalidate(self, guild_id: int):
+        """Drop a guild's compiled templates (runs after every config save, possibly off the event loop)"""
+        guild_id = int(guild_id)
+        self._generations[guild_id] += 1
+        self._cache.pop(guild_id, None)
+
+    def compile(self, guild: discord.Guild) -> Dict[str, _Compiled]:
+        """Build every template for a guild from its config"""
+        generation = self._generations[guild.id]
+        guild_icon = guild.icon.url if guild.icon else None
+        cfg = storage.get_config(guild.id)
+        settings = cfg.get("embed_settings") or {}
+        colors = settings.get("colors") or {}
+        images = cfg.get("images") or {}
+        brand = (settings.get("footer_text") or "").strip() or DEFAULT_BRAND
+        footer_icon = settings.get("footer_icon") or guild_icon
+
+        compiled = {}
+        for name, template in TEMPLATES.items():
+            footer = template.get("footer")
+            if footer is not None:
+                footer = f"{brand} • {footer}" if footer else brand
+            compiled[name] = _Compiled(
+                title=template.get("title"),
+                description=template.get("description"),
+                color=parse_color(colors.get(template["color"]), template["default_color"]),
+                image_url=images.get(template["banner"]) if "banner" in template else None,
+                footer_text=footer,
+                footer_icon=footer_icon if footer is not None else None
+            )
+
+        if self._generations[guild.id] == generation:
+            self._cache[guild.id] = (guild_icon, compiled)
+        return compiled
+
+    def _templates(self, guild: discord.Guild) -> Dict[str, _Compiled]:
+        cached = self._cache.get(guild.id)
+        guild_icon = guild.icon.url if guild.icon else None
+        # A new guild icon changes the footers, so it counts as a config change
+        if cached is None or cached[0] != guild_icon:
+            return self.compile(guild)
+        return cached[1]
+
+    def render(self, guild: discord.Guild, name: str, timestamp: Optional[datetime] = None, **overrides) -> discord.Embed:
+        """Create a fresh embed from a template; overrides replace its title or description"""
+        template = self._templates(guild)[name]
+        embed = discord.Embed(
+            title=overrides.get("title", template.title),
+            description=overrides.get("description", template.description),
+            color=template.color,
+            timestamp=timestamp
+        )
+        if template.image_url:
+            embed.set_image(url=template.image_url)
+        if template.footer_text:
+            embed.set_footer(text=template.footer_text, icon_url=template.footer_icon)
+        return embed
+
+# Global embed template instance
+embed_templates = EmbedTemplates()
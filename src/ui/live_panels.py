@@ -0,0 +1,147 @@
+import asyncio
+import discord
+from typing import Dict, Iterable, Optional, Set
+from src import storage
+from src.ui.panel_embeds import PANEL_BUILDERS
+from src.utils.metrics import metrics
+
+# Panels showing prices from the guild config
+PRICE_PANELS = {"ticket", "mfa", "coin", "acbuy"}
+# Changes arriving within this many seconds are folded into one edit per panel
+DEBOUNCE_SECONDS = 5.0
+
+class LivePanelManager:
+    """Keep sent shop panels up to date
+
+    Every panel message sent by /..._panel is remembered per guild. When the
+    guild's config or stock changes the affected panel kinds are marked dirty,
+    and after a short debounce each dirty panel is edited once, however many
+    changes came in meanwhile.
+    """
+
+    def __init__(self):
+        self.bot = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Structure: {guild_id: {message_id: {"kind": str, "channel_id": int}}}
+        self._panels: Dict[int, Dict[int, dict]] = {}
+        # Kinds waiting for an edit. Structure: {guild_id: {kind}}
+        self._dirty: Dict[int, Set[str]] = {}
+        # Structure: {guild_id: asyncio.Task}
+        self._flush_tasks: Dict[int, asyncio.Task] = {}
+
+    def start(self, bot):
+        """Attach to the bot and start listening for config and stock changes"""
+        from src.stock import stock_store
+        self.bot = bot
+        self._loop = asyncio.get_running_loop()
+        storage.add_config_listener(self._on_config_changed)
+        stock_store.add_listener(self._on_stock_changed)
+
+    def stop(self):
+        from src.stock import stock_store
+        storage.remove_config_listener(self._on_config_changed)
+        stock_store.remove_listener(self._on_stock_changed)
+        for task in self._flush_tasks.values():
+            task.cancel()
+        self._flush_tasks.clear()
+        self._dirty.clear()
+
+    def _ensure_loaded(self, guild_id: int) -> Dict[int, dict]:
+        guild_id = int(guild_id)
+        panels = self._panels.get(guild_id)
+        if panels is None:
+            stored = storage.load_guild_json(storage.PANELS_PATH, guild_id) or {}
+            panels = {int(k): v for k, v in stored.items()}
+            self._panels[guild_id] = panels
+        return panels
+
+    def _save(self, guild_id: int):
+        panels = self._panels.get(guild_id, {})
+        storage.save_guild_json(storage.PANELS_PATH, guild_id, {str(k): v for k, v in panels.items()})
+
+    def panels(self, guild_id: int) -> Dict[int, dict]:
+        return dict(self._ensure_loaded(guild_id))
+
+    async def register(self, guild_id: int, message: discord.Message, kind: str):
+        """Remember a sent panel so it gets updated"""
+        guild_id = int(guild_id)
+        self._ensure_loaded(guild_id)[message.id] = {"kind": kind, "channel_id": message.channel.id}
+        await asyncio.to_thread(self._save, guild_id)
+
+    async def unregister(self, guild_id: int, message_id: int):
+        guild_id = int(guild_id)
+        if self._ensure_loaded(guild_id).pop(int(message_id), None) is not None:
+            await asyncio.to_thread(self._save, guild_id)
+
+    def _on_config_changed(self, guild_id: int):
+        self.notify(guild_id, PRICE_PANELS)
+
+    def _on_stock_changed(self, guild_id: int):
+        self.notify(guild_id, {"stock"})
+
+    def notify(self, guild_id: int, kinds: Iterable[str]):
+        """Mark panel kinds as changed; safe to call from any thread"""
+        if self._loop is None or self._loop.is_closed():
+            return
+        kinds = set(kinds)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._mark_dirty(int(guild_id), kinds)
+        else:
+            self._loop.call_soon_threadsafe(self._mark_dirty, int(guild_id), kinds)
+
+    def _mark_dirty(self, guild_id: int, kinds: Set[str]):
+        if not any(p["kind"] in kinds for p in self._ensure_loaded(guild_id).values()):
+            return
+        self._dirty.setdefault(guild_id, set()).update(kinds)
+        metrics.incr("panels.changes")
+        task = self._flush_tasks.get(guild_id)
+        if task is None or task.done():
+            self._flush_tasks[guild_id] = asyncio.create_task(self._flush_later(guild_id))
+
+    async def _flush_later(self, guild_id: int):
+        await asyncio.sleep(DEBOUNCE_SECONDS)
+        self._flush_tasks.pop(guild_id, None)
+        kinds = self._dirty.pop(guild_id, set())
+        try:
+            await self.refresh(guild_id, kinds)
+        except Exception as e:
+            print(f"Error updating panels in guild {guild_id}: {e}")
+
+    async def refresh(self, guild_id: int, kinds: Set[str]):
+        """Edit every registered panel of the given kinds, building each embed once"""
+        guild = self.bot.get_guild(guild_id) if self.bot else None
+        if not guild:
+            return
+
+        embeds = {}
+        stale = []
+        for message_id, panel in list(self._ensure_loaded(guild_id).items()):
+            kind = panel["kind"]
+            if kind not in kinds or kind not in PANEL_BUILDERS:
+                continue
+            channel = guild.get_channel(panel["channel_id"])
+            if not channel:
+                stale.append(message_id)
+                continue
+            if kind not in embeds:
+                embeds[kind] = PANEL_BUILDERS[kind](guild)
+            try:
+                await channel.get_partial_message(message_id).edit(embed=embeds[kind])
+                metrics.incr("panels.edits")
+            except discord.NotFound:
+                stale.append(message_id)
+            except discord.HTTPException as e:
+                print(f"Error editing panel {message_id}: {e}")
+
+        if stale:
+            panels = self._ensure_loaded(guild_id)
+            for message_id in stale:
+                panels.pop(message_id, None)
+            await asyncio.to_thread(self._save, guild_id)
+
+# Global live panel manager instance
+live_panels = LivePanelManager()
@@ -0,0 +1,94 @@
+import discord
+from datetime import datetime
+from src.stock import stock_store
+from src.ui.embed_templates import embed_templates
+from src.utils.helpers import format_price
+from src.utils.pricing import RANKS, pricing
+
+def _add_tier_fields(embed: discord.Embed, guild: discord.Guild, buy_product: str, sell_product: str, unit: str):
+    """Add the volume tiers of a buy/sell product pair, if the guild has any"""
+    for name, product in (("📦  **Bulk Buy**", buy_product), ("📦  **Bulk Sell**", sell_product)):
+        text = pricing.tier_text(guild.id, product, unit)
+        if text:
+            embed.add_field(name=name, value=text, inline=True)
+
+def build_ticket_panel(guild: discord.Guild) -> discord.Embed:
+    embed = embed_templates.render(guild, "ticket_panel", timestamp=datetime.utcnow())
+    embed.add_field(
+        name="📋  **Available Options**",
+        value=(
+            "> **Sell Account**\n"
+            "> Sell your Minecraft account securely.\n\n"
+            "> **Sell Profile**\n"
+            "> Sell your Skyblock profile.\n\n"
+            "> **Sell Alt**\n"
+            "> Sell generic alt accounts."
+        ),
+        inline=False
+    )
+    return embed
+
+def build_mfa_panel(guild: discord.Guild) -> discord.Embed:
+    embed = embed_templates.render(guild, "mfa_panel", timestamp=datetime.utcnow())
+
+    # Build price table using inline fields for better mobile support
+    rank_col = []
+    buy_col = []
+    sell_col = []
+
+    for rank in RANKS:
+        rank_col.append(f"**{rank}**")
+        buy_col.append(format_price(pricing.unit_price(guild.id, "buy_mfa", rank)))
+        sell_col.append(format_price(pricing.unit_price(guild.id, "sell_mfa", rank)))
+
+    embed.add_field(name="Rank", value="\n".join(rank_col), inline=True)
+    embed.add_field(name="Buy Price", value="\n".join(buy_col), inline=True)
+    embed.add_field(name="Sell Price", value="\n".join(sell_col), inline=True)
+    _add_tier_fields(embed, guild, "buy_mfa", "sell_mfa", "MFAs")
+    return embed
+
+def build_coin_panel(guild: discord.Guild) -> discord.Embed:
+    buy_price = pricing.unit_price(guild.id, "buy_coins")
+    sell_price = pricing.unit_price(guild.id, "sell_coins")
+    embed = embed_templates.render(guild, "coin_panel", timestamp=datetime.utcnow())
+
+    embed.add_field(
+        name="📉  **Buy Coins**",
+        value=f"```diff\n+ Price: ${buy_price:.4f}/mil\n```",
+        inline=True
+    )
+
+    embed.add_field(
+        name="📈  **Sell Coins**",
+        value=f"```diff\n- Price: ${sell_price:.4f}/mil\n```",
+        inline=True
+    )
+
+    embed.add_field(name="​", value="​", inline=True) # Spacer for mobile
+    _add_tier_fields(embed, guild, "buy_coins", "sell_coins", "mil")
+    return embed
+
+def build_acbuy_panel(guild: discord.Guild) -> discord.Embed:
+    return embed_templates.render(guild, "acbuy_panel", timestamp=datetime.utcnow())
+
+def build_stock_panel(guild: discord.Guild) -> discord.Embed:
+    pages = stock_store.pages(guild.id)
+    if not pages:
+        return embed_templates.render(guild, "stock_panel", timestamp=datetime.utcnow(), description="Stock is currently empty. Check back later!")
+
+    # Panels can't page, so they show the first page and point to /stock list
+    embed = embed_templates.render(guild, "stock_panel", timestamp=datetime.utcnow())
+    for category, text in pages[0]:
+        embed.add_field(name=f"**{category}**", value=text, inline=False)
+    if len(pages) > 1:
+        embed.set_footer(text=f"Page 1/{len(pages)} • Use /stock list to see everything", icon_url=embed.footer.icon_url)
+    return embed
+
+# Structure: {panel_kind: embed builder}
+PANEL_BUILDERS = {
+    "ticket": build_ticket_panel,
+    "mfa": build_mfa_panel,
+    "coin": build_coin_panel,
+    "acbuy": build_acbuy_panel,
+    "stock": build_stock_panel,
+}
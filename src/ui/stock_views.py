@@ -0,0 +1,56 @@
+import discord
+from src.stock import stock_store
+
+def build_stock_embed(guild: discord.Guild, page: int, admin: bool = False) -> discord.Embed:
+    """Build one page of the stock list from the cached pages"""
+    pages = stock_store.pages(guild.id, admin=admin)
+    page = max(0, min(page, len(pages) - 1))
+
+    if admin:
+        embed = discord.Embed(title="📦 Current Stock (Admin)", color=0x3498db)
+    else:
+        embed = discord.Embed(
+            title="📦  **Available Stock**",
+            description="Use `/ticket` to purchase any of these items.",
+            color=0x2ecc71
+        )
+
+    for category, text in pages[page] if pages else []:
+        embed.add_field(name=category if admin else f"**{category}**", value=text, inline=False)
+
+    footer = f"Page {page + 1}/{max(len(pages), 1)}"
+    if not admin and guild.icon:
+        embed.set_footer(text=f"{guild.name} • {footer}", icon_url=guild.icon.url)
+    else:
+        embed.set_footer(text=footer)
+    return embed
+
+class StockPageView(discord.ui.View):
+    """Previous/next buttons for the paginated stock list"""
+
+    def __init__(self, guild: discord.Guild, admin: bool = False, page: int = 0):
+        super().__init__(timeout=300)
+        self.guild = guild
+        self.admin = admin
+        self.page = page
+        self.update_buttons()
+
+    def update_buttons(self):
+        page_count = len(stock_store.pages(self.guild.id, admin=self.admin))
+        self.page = max(0, min(self.page, page_count - 1))
+        self.previous_page.disabled = self.page <= 0
+        self.next_page.disabled = self.page >= page_count - 1
+
+    async def show(self, interaction: discord.Interaction):
+        self.update_buttons()
+        await interaction.response.edit_message(embed=build_stock_embed(self.guild, self.page, self.admin), view=self)
+
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page -= 1
+        await self.show(interaction)
+
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        await self.show(interaction)
@@ -1,10 +1,11 @@
 import discord
-from datetime import datetime
 import asyncio
 from src import storage
 from src.tickets.utils import get_ticket, close_ticket
+from src.tickets.manager import TicketManager
 from src.tickets.permissions import is_owner, has_staff_privs
 from src.utils.logging import BotLogger
+from src.utils.members import member_cache
 
 class OpenedTicketView(discord.ui.View):
     """View for opened tickets with close button"""
@@ -15,39 +16,44 @@ class OpenedTicketView(discord.ui.View):
     @discord.ui.button(label="Close Ticket", style=discord.ButtonStyle.red, custom_id="ticket:close")
     async def close_ticket_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Close the ticket"""
+        # Defer before the checks: they read the config and ticket files, and the
+        # errors below are still private since a deferred button shows nothing
+        await interaction.response.defer()
+
         # Check permissions
         if not has_staff_privs(interaction) and not is_owner(interaction):
-            return await interaction.response.send_message("❌ You don't have permission to close tickets.", ephemeral=True)
-        
+            return await interaction.followup.send("❌ You don't have permission to close tickets.", ephemeral=True)
+
         ticket = get_ticket(interaction.guild_id, interaction.channel.id)
         if not ticket:
-            return await interaction.response.send_message("❌ This is not a ticket channel.", ephemeral=True)
-        
+            return await interaction.followup.send("❌ This is not a ticket channel.", ephemeral=True)
+
         if not ticket.get("is_open", True):
-            return await interaction.response.send_message("❌ This ticket is already closed.", ephemeral=True)
-        
-        await interaction.response.defer()
-        
-        # Mark ticket as closed
-        close_ticket(interaction.guild_id, interaction.channel.id)
+            return await interaction.followup.send("❌ This ticket is already closed.", ephemeral=True)
+
+        # Mark ticket as closed (records closed_at and closed_by)
+        ticket = close_ticket(interaction.guild_id, interaction.channel.id, interaction.user.id) or ticket
         
-        # Update channel permissions to make it read-only
-        await interaction.channel.set_permissions(
-            interaction.guild.default_role,
-            send_messages=False,
-            read_messages=False,
-            view_channel=False
-        )
+        is_thread = isinstance(interaction.channel, discord.Thread)
         
-        # Allow ticket opener and staff to still view but not send
-        opener = interaction.guild.get_member(ticket["opened_by"])
-        if opener:
+        # Update channel permissions to make it read-only (threads are locked below instead)
+        if not is_thread:
             await interaction.channel.set_permissions(
-                opener,
+                interaction.guild.default_role,
                 send_messages=False,
-                read_messages=True,
-                view_channel=True
+                read_messages=False,
+                view_channel=False
             )
+            
+            # Allow ticket opener and staff to still view but not send
+            opener = (await member_cache.resolve(interaction.guild, [ticket["opened_by"]])).get(ticket["opened_by"])
+            if isinstance(opener, discord.Member):
+                await interaction.channel.set_permissions(
+                    opener,
+                    send_messages=False,
+                    read_messages=True,
+                    view_channel=True
+                )
         
         # Create close embed
         close_embed = discord.Embed(
@@ -59,17 +65,17 @@ class OpenedTicketView(discord.ui.View):
         
         await interaction.followup.send(embed=close_embed)
         
-        # Update ticket data with closed timestamp and user
-        ticket["closed_at"] = datetime.utcnow().isoformat()
-        ticket["closed_by"] = interaction.user.id
-        
-        # Save updated ticket data
-        from src.tickets.utils import save_ticket
-        save_ticket(interaction.guild_id, ticket)
-        
         # Log ticket closure (this will also generate transcript)
         await BotLogger.log_ticket_closed(interaction.guild, interaction.channel, interaction.user, ticket)
         
+        # Thread tickets are archived and locked instead of deleted
+        if is_thread:
+            try:
+                await TicketManager.close(interaction)
+            except Exception as e:
+                await interaction.followup.send(f"❌ Error archiving thread: {e}", ephemeral=True)
+            return
+        
         # Delete channel after a short delay
         await interaction.followup.send("❌ Deleting ticket in 5 seconds...", ephemeral=True)
         await asyncio.sleep(5)
@@ -1,9 +1,5 @@
 import discord
-from src.ui.modals import (
-    SellAccountModal, SellProfileModal, SellAltModal,
-    SellMFAModal, BuyMFAModal, BuyCoinsModal, SellCoinsModal,
-    BuyAccountModal
-)
+from src.ui.modals import send_ticket_modal
 from src import storage
 from src.utils.helpers import format_price
 
@@ -15,15 +11,15 @@ class TicketPanel(discord.ui.View):
 
     @discord.ui.button(label="Sell an Account", style=discord.ButtonStyle.danger, custom_id="ticket:sell_account")
     async def sell_account(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.send_modal(SellAccountModal())
+        await send_ticket_modal(interaction, "sell_account")
 
     @discord.ui.button(label="Sell a Profile", style=discord.ButtonStyle.danger, custom_id="ticket:sell_profile")
     async def sell_profile(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.send_modal(SellProfileModal())
+        await send_ticket_modal(interaction, "sell_profile")
 
     @discord.ui.button(label="Sell an Alt", style=discord.ButtonStyle.danger, custom_id="ticket:sell_alt")
     async def sell_alt(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.send_modal(SellAltModal())
+        await send_ticket_modal(interaction, "sell_alt")
 
 
 class MFAPanel(discord.ui.View):
@@ -33,11 +29,11 @@ class MFAPanel(discord.ui.View):
     
     @discord.ui.button(label="Buy MFA", style=discord.ButtonStyle.success, custom_id="mfa:buy", row=0)
     async def buy_mfa(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.send_modal(BuyMFAModal())
+        await send_ticket_modal(interaction, "buy_mfa")
     
     @discord.ui.button(label="Sell MFA", style=discord.ButtonStyle.danger, custom_id="mfa:sell", row=0)
     async def sell_mfa(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.send_modal(SellMFAModal())
+        await send_ticket_modal(interaction, "sell_mfa")
 
 
 class CoinPanel(discord.ui.View):
@@ -47,11 +43,11 @@ class CoinPanel(discord.ui.View):
 
     @discord.ui.button(label="Buy Coins", style=discord.ButtonStyle.success, custom_id="coins:buy")
     async def buy_coins(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.send_modal(BuyCoinsModal())
+        await send_ticket_modal(interaction, "buy_coins")
 
     @discord.ui.button(label="Sell Coins", style=discord.ButtonStyle.danger, custom_id="coins:sell")
     async def sell_coins(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.send_modal(SellCoinsModal())
+        await send_ticket_modal(interaction, "sell_coins")
 
 
 class AccountBuyPanel(discord.ui.View):
@@ -61,4 +57,4 @@ class AccountBuyPanel(discord.ui.View):
     
     @discord.ui.button(label="Click to Buy", style=discord.ButtonStyle.success, custom_id="account:buy")
     async def buy_account(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.send_modal(BuyAccountModal())
+        await send_ticket_modal(interaction, "buy_account")
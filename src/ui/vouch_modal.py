@@ -1,7 +1,9 @@
 import discord
 from src import storage
+from src.ui.embed_templates import embed_templates
 from src.utils.helpers import format_price
 from src.utils.logging import BotLogger
+from src.utils.stats import guild_stats
 from datetime import datetime
 
 class VouchModal(discord.ui.Modal, title="Submit Vouch"):
@@ -80,31 +82,24 @@ class VouchModal(discord.ui.Modal, title="Submit Vouch"):
         
         await interaction.response.defer(ephemeral=True)
         
-        # Get vouch number
-        count = storage.get_vouch_count(interaction.guild_id, self.seller.id)
-        vouch_number = count + 1
-        
-        # Record the vouch with full data
-        storage.record_vouch_full(
-            interaction.guild_id,
-            self.seller.id,
-            interaction.user.id,
-            self.product.value,
-            value_amount,
-            self.review.value,
-            rating_value,
-            vouch_number,
-            datetime.utcnow().isoformat()
-        )
+        # Record the vouch with full data; the vouch number is assigned under the guild lock
+        async with storage.transaction(interaction.guild_id) as tx:
+            vouch_number = tx.record_vouch(
+                self.seller.id,
+                interaction.user.id,
+                self.product.value,
+                value_amount,
+                self.review.value,
+                rating_value,
+                timestamp=datetime.utcnow().isoformat()
+            )
+        guild_stats.incr("vouches", interaction.guild_id)
         
         # Create star display (only stars, no text)
         star_display = "⭐" * rating_value
         
         # Create minimal embed matching the image format
-        embed = discord.Embed(
-            color=0x5865f2,  # Discord blurple
-            timestamp=interaction.created_at
-        )
+        embed = embed_templates.render(interaction.guild, "vouch", timestamp=interaction.created_at)
         
         # Set author with vouched by
         embed.set_author(
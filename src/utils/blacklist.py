@@ -0,0 +1,176 @@
+import asyncio
+import json
+import os
+import re
+from datetime import datetime
+from typing import Callable, Dict, FrozenSet, Optional, Tuple
+from src import storage
+
+# Discord user IDs (snowflakes) in an imported text file
+USER_ID_PATTERN = re.compile(r"\b\d{15,20}\b")
+
+class Blacklist:
+    """Per-guild blacklists held in memory, plus a global list shared between guilds
+
+    A guild's list is read once and replaced whenever a transaction saves
+    it, so checking a user is a set lookup instead of a file read. The
+    global list only counts in guilds with blacklist_settings.use_global,
+    and that setting is only looked up for users who are on the global list.
+    Shard clusters share the global file, so it is reloaded whenever it
+    changes on disk and every write re-reads it under a file lock.
+    """
+
+    def __init__(self):
+        # Structure: {guild_id: frozenset(user_id)}
+        self._guilds: Dict[int, FrozenSet[int]] = {}
+        # Structure: {user_id: {"reason", "timestamp", "guild_id", "added_by"}}
+        self._global_entries: Optional[Dict[str, dict]] = None
+        self._global: FrozenSet[int] = frozenset()
+        # (mtime_ns, size) of the global file when it was last read
+        self._global_stamp: Optional[Tuple[int, int]] = None
+        # Structure: {guild_id: use_global}
+        self._use_global: Dict[int, bool] = {}
+        self._global_lock = asyncio.Lock()
+        storage.add_blacklist_listener(self._on_saved)
+        storage.add_config_listener(self._on_config_changed)
+
+    def _on_saved(self, guild_id: int, entries: dict):
+        """Swap in a guild's saved list (runs after the transaction's write, possibly off the event loop)"""
+        self._guilds[int(guild_id)] = frozenset(int(user_id) for user_id in entries)
+
+    def _on_config_changed(self, guild_id: int):
+        self._use_global.pop(int(guild_id), None)
+
+    def _guild(self, guild_id: int) -> FrozenSet[int]:
+        guild_id = int(guild_id)
+        users = self._guilds.get(guild_id)
+        if users is None:
+            entries = storage.load_guild_json(storage.BLACKLIST_PATH, guild_id) or {}
+            # A save that finished while the file was being read wins
+            users = self._guilds.setdefault(guild_id, frozenset(int(user_id) for user_id in entries))
+        return users
+
+    @staticmethod
+    def _global_file_stamp() -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(storage.GLOBAL_BLACKLIST_PATH)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load_global(self) -> Dict[str, dict]:
+        """The global list, reloaded if another process has written it since it was read"""
+        stamp = self._global_file_stamp()
+        if self._global_entries is None or stamp != self._global_stamp:
+            entries = storage.load_json(storage.GLOBAL_BLACKLIST_PATH) if stamp is not None else {}
+            self._global_entries = entries
+            self._global = frozenset(int(user_id) for user_id in entries)
+            self._global_stamp = stamp
+        return self._global_entries
+
+    def uses_global(self, guild_id: int) -> bool:
+        guild_id = int(guild_id)
+        use_global = self._use_global.get(guild_id)
+        if use_global is None:
+            settings = storage.get_config(guild_id).get("blacklist_settings") or {}
+            use_global = self._use_global[guild_id] = bool(settings.get("use_global", False))
+        return use_global
+
+    def is_blacklisted(self, guild_id: int, user_id: int) -> bool:
+        user_id = int(user_id)
+        if user_id in self._guild(guild_id):
+            return True
+        self._load_global()
+        return user_id in self._global and self.uses_global(guild_id)
+
+    def is_globally_blacklisted(self, user_id: int) -> bool:
+        self._load_global()
+        return int(user_id) in self._global
+
+    def count(self, guild_id: int) -> int:
+        return len(self._guild(guild_id))
+
+    async def add_many(self, guild_id: int, entries: Dict[int, Optional[str]], reason: str) -> int:
+        """Blacklist many users in a guild with a single write. Returns how many were new"""
+        added = 0
+        async with storage.transaction(guild_id) as tx:
+            for user_id, entry_reason in entries.items():
+                if not tx.is_blacklisted(user_id):
+                    tx.add_to_blacklist(user_id, entry_reason or reason)
+                    added += 1
+        return added
+
+    def _update_global(self, update: Callable[[Dict[str, dict]], int]) -> int:
+        """Apply update to the latest global list and save it if it changed anything (runs in a thread)
+
+        The file is re-read under the lock so entries written by other
+        clusters since this one last read it are kept.
+        """
+        with storage.process_lock(storage.GLOBAL_BLACKLIST_PATH):
+            current = dict(self._load_global())
+            changed = update(current)
+            if changed:
+                storage.save_json(storage.GLOBAL_BLACKLIST_PATH, current)
+                self._global_entries = current
+                self._global = frozenset(int(user_id) for user_id in current)
+                self._global_stamp = self._global_file_stamp()
+            return changed
+
+    async def add_global(self, entries: Dict[int, Optional[str]], reason: str, guild_id: int, added_by: int) -> int:
+        """Add users to the global blacklist with a single write. Returns how many were new"""
+        def update(current: Dict[str, dict]) -> int:
+            added = 0
+            for user_id, entry_reason in entries.items():
+                if str(user_id) in current:
+                    continue
+                current[str(user_id)] = {
+                    "reason": entry_reason or reason,
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "guild_id": int(guild_id),
+                    "added_by": int(added_by)
+                }
+                added += 1
+            return added
+
+        async with self._global_lock:
+            return await asyncio.to_thread(self._update_global, update)
+
+    async def remove_global(self, user_id: int) -> bool:
+        def update(current: Dict[str, dict]) -> int:
+            return int(current.pop(str(user_id), None) is not None)
+
+        async with self._global_lock:
+            return bool(await asyncio.to_thread(self._update_global, update))
+
+    def export(self, guild_id: Optional[int] = None) -> str:
+        """Export a guild's list (or the global list for None) as {user_id: {reason, timestamp}} JSON"""
+        if guild_id is None:
+            entries = self._load_global()
+        else:
+            entries = storage.load_guild_json(storage.BLACKLIST_PATH, guild_id) or {}
+        return json.dumps(entries, indent=2)
+
+    @staticmethod
+    def parse_import(content: str) -> Dict[int, Optional[str]]:
+        """Read user IDs (and reasons, when present) from an export, a JSON list or plain text"""
+        try:
+            data = json.loads(content)
+        except ValueError:
+            data = None
+
+        entries = {}
+        if isinstance(data, dict):
+            for user_id, entry in data.items():
+                if str(user_id).isdigit():
+                    entries[int(user_id)] = entry.get("reason") if isinstance(entry, dict) else None
+        elif isinstance(data, list):
+            for user_id in data:
+                if str(user_id).isdigit():
+                    entries[int(user_id)] = None
+        else:
+            for user_id in USER_ID_PATTERN.findall(content):
+                entries[int(user_id)] = None
+        return entries
+
+# Global blacklist instance
+blacklist = Blacklist()
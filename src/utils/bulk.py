@@ -0,0 +1,101 @@
+import asyncio
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple, TypeVar
+import discord
+from src.utils.http_scheduler import http_scheduler
+from src.utils.members import member_cache
+
+# Requests in flight at once. discord.py already waits out each route's rate
+# limit bucket; this keeps a large batch from queueing hundreds of requests on it.
+# Every request also goes through the HTTP scheduler's background gate.
+BULK_CONCURRENCY = 4
+# Most targets one bulk command acts on
+MAX_TARGETS = 500
+# Seconds between progress updates
+PROGRESS_INTERVAL = 3.0
+
+# User mentions or raw user IDs
+USER_ID_PATTERN = re.compile(r"(?:<@!?)?(\d{15,20})>?")
+
+T = TypeVar("T")
+
+async def run_bulk(
+    targets: Iterable[T],
+    action: Callable[[T], Awaitable[None]],
+    concurrency: int = BULK_CONCURRENCY,
+    on_progress: Optional[Callable[[List[T], List[Tuple[T, str]]], Awaitable[None]]] = None
+) -> Tuple[List[T], List[Tuple[T, str]]]:
+    """Run action on every target with at most `concurrency` running at once
+
+    Returns (succeeded, [(target, error message)]). on_progress(succeeded, failed)
+    is awaited with the results so far at most once every PROGRESS_INTERVAL seconds.
+    """
+    targets = list(targets)
+    queue: asyncio.Queue = asyncio.Queue()
+    for target in targets:
+        queue.put_nowait(target)
+
+    succeeded, failed = [], []
+    last_progress = time.monotonic()
+
+    async def report():
+        nonlocal last_progress
+        if on_progress and time.monotonic() - last_progress >= PROGRESS_INTERVAL:
+            last_progress = time.monotonic()
+            try:
+                await on_progress(succeeded, failed)
+            except discord.HTTPException as e:
+                print(f"Error updating bulk progress: {e}")
+
+    async def worker():
+        while True:
+            try:
+                target = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                async with http_scheduler.background():
+                    await action(target)
+                succeeded.append(target)
+            except discord.Forbidden:
+                failed.append((target, "Missing permissions"))
+            except discord.NotFound:
+                failed.append((target, "Not found"))
+            except discord.HTTPException as e:
+                failed.append((target, e.text or str(e)))
+            await report()
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(targets)) or 1)))
+    return succeeded, failed
+
+async def resolve_members(
+    guild: discord.Guild,
+    user_ids: Optional[str] = None,
+    role: Optional[discord.Role] = None,
+    joined_within: Optional[int] = None
+) -> Tuple[List[discord.Member], List[int]]:
+    """Collect the members named by IDs/mentions, a role and/or a join window in minutes
+
+    Returns (members, IDs that aren't members of the guild).
+    """
+    ids = parse_user_ids(user_ids)
+    resolved = await member_cache.resolve(guild, ids)
+    members = {user_id: member for user_id, member in resolved.items() if isinstance(member, discord.Member)}
+    missing = [user_id for user_id in ids if user_id not in members]
+
+    if role is not None or joined_within:
+        since = datetime.now(timezone.utc) - timedelta(minutes=joined_within or 0)
+        # Chunks the guild first when members aren't all cached
+        for member in await member_cache.members(guild):
+            if role is not None and member.get_role(role.id):
+                members[member.id] = member
+            elif joined_within and member.joined_at and member.joined_at >= since:
+                members[member.id] = member
+
+    return list(members.values()), missing
+
+def parse_user_ids(text: str) -> List[int]:
+    """Read user IDs and mentions from free text, without duplicates"""
+    return list(dict.fromkeys(int(match) for match in USER_ID_PATTERN.findall(text or "")))
@@ -0,0 +1,153 @@
+import asyncio
+import functools
+from typing import Dict, Optional, Tuple
+import discord
+from src import storage
+from src.utils.metrics import metrics
+
+# Seconds Discord waits for the first response to an interaction
+RESPONSE_DEADLINE = 3.0
+
+def get_interaction_config() -> dict:
+    """Get the interactions section of config.json with defaults applied"""
+    cfg = storage.load_app_config().get("interactions", {}) or {}
+    return {
+        # Time from the interaction's creation after which a handler that hasn't
+        # responded counts as a near miss (and @auto_defer handlers are deferred).
+        # The rest of the 3 second deadline is left for the defer request itself.
+        "defer_budget_ms": float(cfg.get("defer_budget_ms", 2000)),
+    }
+
+def describe_interaction(interaction: discord.Interaction) -> str:
+    """Name the command or component behind an interaction"""
+    if interaction.command is not None:
+        return f"/{interaction.command.qualified_name}"
+    custom_id = (interaction.data or {}).get("custom_id")
+    return f"{interaction.type.name} {custom_id}" if custom_id else interaction.type.name
+
+class InteractionBudget:
+    """Watches how long handlers take to respond to interactions
+
+    Every interaction gets one timer that fires when its budget runs out. A
+    handler that hasn't responded by then is recorded as a near miss, and if
+    it is wrapped in @auto_defer the interaction is deferred for it. The timer
+    can only fire while the event loop is free, so synchronous work should
+    still come after the defer (the loop watchdog reports that case).
+    """
+
+    def __init__(self):
+        self._config: Optional[dict] = None
+        # Structure: {interaction_id: (ephemeral, thinking) to auto-defer with, or None}
+        self._pending: Dict[int, Optional[Tuple[bool, bool]]] = {}
+        # Structure: {interaction_id: auto-defer task still in flight}
+        self._deferring: Dict[int, asyncio.Task] = {}
+
+    @property
+    def config(self) -> dict:
+        if self._config is None:
+            self._config = get_interaction_config()
+        return self._config
+
+    def watch(self, interaction: discord.Interaction, defer: Optional[Tuple[bool, bool]] = None):
+        """Start the budget timer for an interaction (once per interaction)"""
+        if interaction.id in self._pending:
+            if defer is not None:
+                self._pending[interaction.id] = defer
+            return
+        self._pending[interaction.id] = defer
+
+        age = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+        budget = self.config["defer_budget_ms"] / 1000
+        # Clamped, since the host clock and Discord's may disagree slightly
+        delay = min(max(budget - age, 0.0), budget)
+        asyncio.get_running_loop().call_later(delay, self._check, interaction)
+
+    def release(self, interaction: discord.Interaction):
+        """Stop auto-deferring (the handler has returned or is responding itself)"""
+        if self._pending.get(interaction.id) is not None:
+            self._pending[interaction.id] = None
+
+    def _check(self, interaction: discord.Interaction):
+        defer = self._pending.pop(interaction.id, None)
+        if interaction.response.is_done():
+            return
+
+        age_ms = (discord.utils.utcnow() - interaction.created_at).total_seconds() * 1000
+        shard_id = interaction.guild.shard_id if interaction.guild else None
+        metrics.incr("interactions.near_miss", shard_id=shard_id)
+        metrics.set_gauge("interactions.near_miss_ms", age_ms)
+        print(f"⏳ {describe_interaction(interaction)} had not responded after {age_ms:.0f} ms")
+
+        if defer is not None:
+            task = asyncio.get_running_loop().create_task(self._defer(interaction, *defer, shard_id=shard_id))
+            self._deferring[interaction.id] = task
+            task.add_done_callback(lambda _: self._deferring.pop(interaction.id, None))
+
+    async def settled(self, interaction: discord.Interaction):
+        """Wait for an auto-defer of this interaction that is still in flight
+
+        discord.py only marks the response as done once the defer request has
+        returned, so is_done() can't be trusted until then.
+        """
+        task = self._deferring.get(interaction.id)
+        if task is not None:
+            await asyncio.shield(task)
+
+    @staticmethod
+    async def _defer(interaction: discord.Interaction, ephemeral: bool, thinking: bool, shard_id: Optional[int]):
+        try:
+            await interaction.response.defer(ephemeral=ephemeral, thinking=thinking)
+            metrics.incr("interactions.auto_deferred", shard_id=shard_id)
+        except discord.InteractionResponded:
+            # The handler answered while the defer was being scheduled
+            pass
+        except discord.NotFound:
+            # The deadline passed before the loop got to the defer
+            metrics.incr("interactions.expired", shard_id=shard_id)
+        except discord.HTTPException as e:
+            print(f"Error auto-deferring {describe_interaction(interaction)}: {e}")
+
+# Global interaction budget instance
+interaction_budget = InteractionBudget()
+
+def auto_defer(ephemeral: bool = False, thinking: bool = False):
+    """Defer the interaction if the handler hasn't responded within the budget
+
+    Works on app commands, component callbacks and modal submits; the first
+    discord.Interaction argument is the one watched. Handlers wrapped in it
+    must use defer() and respond() below instead of interaction.response,
+    which may already be used up. Not for handlers that answer with a modal.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            interaction = next(
+                (arg for arg in (*args, *kwargs.values()) if isinstance(arg, discord.Interaction)),
+                None
+            )
+            if interaction is None:
+                return await func(*args, **kwargs)
+            interaction_budget.watch(interaction, (ephemeral, thinking))
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                interaction_budget.release(interaction)
+        return wrapper
+    return decorator
+
+async def defer(interaction: discord.Interaction, **kwargs):
+    """Defer unless the interaction has already been responded to (or auto-deferred)"""
+    await interaction_budget.settled(interaction)
+    # The handler is acknowledging it now, so the timer must not defer it as well
+    interaction_budget.release(interaction)
+    if not interaction.response.is_done():
+        await interaction.response.defer(**kwargs)
+
+async def respond(interaction: discord.Interaction, *args, **kwargs):
+    """Send a message as the response, or as a followup once the interaction is deferred"""
+    await interaction_budget.settled(interaction)
+    # The handler is acknowledging it now, so the timer must not defer it as well
+    interaction_budget.release(interaction)
+    if interaction.response.is_done():
+        return await interaction.followup.send(*args, **kwargs)
+    return await interaction.response.send_message(*args, **kwargs)
@@ -0,0 +1,193 @@
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, Iterable, List, NamedTuple, Tuple
+import discord
+from src import storage
+
+ACTIONS = {"timeout", "kick", "ban", "blacklist"}
+# Discord timeouts last at most 28 days
+MAX_TIMEOUT_MINUTES = 40320
+
+class EscalationRule(NamedTuple):
+    warnings: int
+    action: str
+    # Minutes, for timeouts
+    duration: int
+
+class Escalation(NamedTuple):
+    user_id: int
+    # Warnings inside the decay window, including the new one
+    active_warnings: int
+    # Rules whose threshold the new warning reached
+    triggered: List[EscalationRule]
+
+def _to_epoch(timestamp: str) -> float:
+    try:
+        return datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+class EscalationEngine:
+    """Warning counters with decay windows and automatic escalation
+
+    Each guild's warning timestamps are read once and then kept in memory,
+    so recording a warning and checking the thresholds never re-reads
+    warnings.json. Warnings older than moderation_settings.warning_decay_days
+    stop counting and are removed by expire().
+    """
+
+    def __init__(self):
+        # Structure: {guild_id: {user_id: deque(epoch seconds, oldest first)}}
+        self._counters: Dict[int, Dict[int, Deque[float]]] = {}
+        # Structure: {guild_id: (rules, decay_seconds)}
+        self._settings: Dict[int, Tuple[List[EscalationRule], float]] = {}
+        # Bumped on every config change so a read that raced with a save is not cached
+        self._generations: Dict[int, int] = defaultdict(int)
+        storage.add_config_listener(self.invalidate)
+
+    def invalidate(self, guild_id: int):
+        guild_id = int(guild_id)
+        self._generations[guild_id] += 1
+        self._settings.pop(guild_id, None)
+
+    @staticmethod
+    def parse_rules(raw) -> List[EscalationRule]:
+        """Turn [{"warnings", "action", "duration"}] into rules sorted by threshold, skipping bad entries"""
+        rules = {}
+        for rule in raw if isinstance(raw, list) else []:
+            try:
+                warnings, action = int(rule["warnings"]), str(rule["action"]).lower()
+                duration = min(int(rule.get("duration", 60)), MAX_TIMEOUT_MINUTES)
+            except (KeyError, TypeError, ValueError):
+                continue
+            if warnings > 0 and action in ACTIONS and duration > 0:
+                rules[(warnings, action)] = EscalationRule(warnings, action, duration)
+        return sorted(rules.values())
+
+    def settings(self, guild_id: int) -> Tuple[List[EscalationRule], float]:
+        """Get a guild's escalation rules and warning decay window in seconds (0 keeps warnings forever)"""
+        guild_id = int(guild_id)
+        cached = self._settings.get(guild_id)
+        if cached is not None:
+            return cached
+
+        generation = self._generations[guild_id]
+        settings = storage.get_config(guild_id).get("moderation_settings") or {}
+        rules = self.parse_rules(settings.get("escalation"))
+        decay = max(float(settings.get("warning_decay_days", 0) or 0), 0.0) * 86400
+        if self._generations[guild_id] == generation:
+            self._settings[guild_id] = (rules, decay)
+        return rules, decay
+
+    def _ensure_loaded(self, guild_id: int) -> Dict[int, Deque[float]]:
+        guild_id = int(guild_id)
+        counters = self._counters.get(guild_id)
+        if counters is None:
+            stored = storage.load_guild_json(storage.WARNINGS_PATH, guild_id) or {}
+            counters = self._counters[guild_id] = {
+                int(user_id): deque(sorted(_to_epoch(w.get("timestamp")) for w in warnings))
+                for user_id, warnings in stored.items() if warnings
+            }
+        return counters
+
+    @staticmethod
+    def _decay(timestamps: Deque[float], cutoff: float):
+        while timestamps and timestamps[0] < cutoff:
+            timestamps.popleft()
+
+    def active_warnings(self, guild_id: int, user_id: int) -> int:
+        """Count a user's warnings inside the decay window"""
+        _, decay = self.settings(guild_id)
+        timestamps = self._ensure_loaded(guild_id).get(int(user_id))
+        if not timestamps:
+            return 0
+        if decay:
+            cutoff = time.time() - decay
+            return sum(1 for timestamp in timestamps if timestamp >= cutoff)
+        return len(timestamps)
+
+    async def warn_many(self, guild_id: int, user_ids: Iterable[int], moderator_id: int, reason: str) -> List[Escalation]:
+        """Warn users with a single write and work out which rules each warning triggers
+
+        Blacklist rules are applied in the same write; the other actions need
+        the members and are applied with apply().
+        """
+        rules, decay = self.settings(guild_id)
+        counters = self._ensure_loaded(guild_id)
+        now = time.time()
+        results, updated = [], {}
+
+        async with storage.transaction(guild_id) as tx:
+            for user_id in dict.fromkeys(int(user_id) for user_id in user_ids):
+                tx.add_warning(user_id, moderator_id, reason)
+                timestamps = deque(counters.get(user_id, ()))
+                if decay:
+                    self._decay(timestamps, now - decay)
+                before = len(timestamps)
+                timestamps.append(now)
+                updated[user_id] = timestamps
+
+                triggered = [rule for rule in rules if before < rule.warnings <= len(timestamps)]
+                if any(rule.action == "blacklist" for rule in triggered):
+                    tx.add_to_blacklist(user_id, f"Reached {len(timestamps)} warnings (last: {reason})")
+                results.append(Escalation(user_id, len(timestamps), triggered))
+
+        # Only count the warnings once they are saved
+        counters.update(updated)
+        return results
+
+    @staticmethod
+    async def apply(guild: discord.Guild, member: discord.Member, escalation: Escalation) -> List[str]:
+        """Apply the timeout, kick and ban rules a warning triggered. Returns a description of each action taken"""
+        done = []
+        reason = f"Automatic escalation: {escalation.active_warnings} warnings"
+        for rule in escalation.triggered:
+            try:
+                if rule.action == "timeout":
+                    await member.timeout(timedelta(minutes=rule.duration), reason=reason)
+                    done.append(f"timed out for {rule.duration} minutes")
+                elif rule.action == "kick":
+                    await member.kick(reason=reason)
+                    done.append("kicked")
+                elif rule.action == "ban":
+                    await guild.ban(member, reason=reason, delete_message_days=0)
+                    done.append("banned")
+                elif rule.action == "blacklist":
+                    done.append("blacklisted")
+            except discord.HTTPException as e:
+                print(f"Error applying {rule.action} escalation to {member.id} in {guild.id}: {e}")
+        return done
+
+    async def expire(self, guild_id: int) -> int:
+        """Remove a guild's warnings older than its decay window. Returns how many were removed"""
+        _, decay = self.settings(guild_id)
+        if not decay:
+            return 0
+        counters = self._ensure_loaded(guild_id)
+        cutoff = time.time() - decay
+        # Counters are oldest first, so this is one comparison per warned user
+        if not any(timestamps and timestamps[0] < cutoff for timestamps in counters.values()):
+            return 0
+
+        removed = 0
+        async with storage.transaction(guild_id) as tx:
+            stored = tx.load(storage.WARNINGS_PATH)
+            for user_id in list(stored):
+                kept = [w for w in stored[user_id] if _to_epoch(w.get("timestamp")) >= cutoff]
+                removed += len(stored[user_id]) - len(kept)
+                if kept:
+                    stored[user_id] = kept
+                else:
+                    del stored[user_id]
+            if removed:
+                tx.mark_dirty(storage.WARNINGS_PATH)
+
+        for user_id in list(counters):
+            self._decay(counters[user_id], cutoff)
+            if not counters[user_id]:
+                del counters[user_id]
+        return removed
+
+# Global escalation engine instance
+escalation = EscalationEngine()
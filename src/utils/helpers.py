@@ -23,12 +23,22 @@ def format_price(amount: float) -> str:
     """Format price as currency"""
     return f"${amount:.2f}"
 
+def parse_color(value, default: Optional[int] = None) -> Optional[int]:
+    """Read a color from config: an int, or a "#1abc9c" / "0x1abc9c" string"""
+    if isinstance(value, bool):
+        return default
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        text = value.strip().lower().removeprefix("#").removeprefix("0x")
+        try:
+            return int(text, 16)
+        except ValueError:
+            pass
+    return default
+
 def get_skycrypt_link(username: str) -> str:
     """Get SkyCrypt stats link for a username"""
     # Clean username (remove spaces, handle special characters)
     clean_username = username.strip().replace(" ", "")
     return f"https://sky.shiiyu.moe/stats/{clean_username}"
-
-def calculate_coin_price(millions: float, base_price: float) -> float:
-    """Calculate total price for coins"""
-    return millions * base_price
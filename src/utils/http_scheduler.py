@@ -0,0 +1,172 @@
+import asyncio
+import re
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, NamedTuple, Optional
+import aiohttp
+from src import storage
+from src.utils.metrics import metrics
+
+# Discord's global limit on requests per second for a bot
+GLOBAL_RATE_LIMIT = 50
+# Seconds between checks while a background job waits for its turn
+WAIT_STEP = 0.1
+
+API_PREFIX = re.compile(r"^/api/v\d+")
+SNOWFLAKE = re.compile(r"^\d{15,20}$")
+
+def get_http_config() -> dict:
+    """Get the http section of config.json with defaults applied"""
+    cfg = storage.load_app_config().get("http", {}) or {}
+    return {
+        # Background requests in flight at once, across every job
+        "background_concurrency": int(cfg.get("background_concurrency", 4)),
+        # Background jobs pause for this long after each interaction
+        "interactive_grace_ms": float(cfg.get("interactive_grace_ms", 750)),
+        # Share of the global rate limit background jobs may use
+        "background_share": float(cfg.get("background_share", 0.6)),
+        # Longest a background request waits for its turn, so jobs still finish on a busy bot
+        "max_background_wait": float(cfg.get("max_background_wait", 5.0)),
+    }
+
+def route_of(method: str, path: str) -> str:
+    """Turn a request path into its route template, e.g. POST /channels/{id}/messages"""
+    parts = API_PREFIX.sub("", path).strip("/").split("/")
+    for index, part in enumerate(parts):
+        if SNOWFLAKE.match(part):
+            parts[index] = "{id}"
+        elif index >= 2 and parts[index - 2] in ("webhooks", "interactions"):
+            parts[index] = "{token}"
+        elif index >= 1 and parts[index - 1] == "reactions":
+            parts[index] = "{emoji}"
+    return f"{method} /{'/'.join(parts)}"
+
+class BucketState(NamedTuple):
+    """The last rate limit headers seen for a route"""
+    bucket: str
+    limit: int
+    remaining: int
+    reset_at: float  # time.monotonic() when the bucket refills
+
+class HttpScheduler:
+    """Rate limit observability and a priority gate for background API work
+
+    An aiohttp trace on the bot's session reads the rate limit headers of
+    every response, so each route's limit, remaining requests and reset time
+    show up as metrics, along with every 429. discord.py still does the actual
+    waiting on buckets.
+
+    Background jobs (channel backups and restores, vouch restores, bulk
+    moderation, member fetches) make their requests through background(),
+    which holds them back while interactions are coming in, while requests
+    are close to the global limit, and after a 429, so a running restore
+    doesn't slow down ticket opens.
+    """
+
+    def __init__(self):
+        self._config: Optional[dict] = None
+        # Structure: {route: BucketState}
+        self.buckets: Dict[str, BucketState] = {}
+        # Start times of the requests sent in the last second
+        self._recent: Deque[float] = deque()
+        self._last_interactive = 0.0
+        self._backoff_until = 0.0
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def config(self) -> dict:
+        if self._config is None:
+            self._config = get_http_config()
+        return self._config
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """A trace config for the bot's HTTP session (the client's http_trace option)"""
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_request_end.append(self._on_request_end)
+        return trace
+
+    async def _on_request_start(self, session, context, params: aiohttp.TraceRequestStartParams):
+        self._recent.append(time.monotonic())
+        metrics.incr("http.requests")
+
+    async def _on_request_end(self, session, context, params: aiohttp.TraceRequestEndParams):
+        headers = params.response.headers
+        route = route_of(params.method, params.url.path)
+        now = time.monotonic()
+
+        if "X-RateLimit-Remaining" in headers:
+            try:
+                state = BucketState(
+                    headers.get("X-RateLimit-Bucket", ""),
+                    int(headers.get("X-RateLimit-Limit", 0)),
+                    int(headers["X-RateLimit-Remaining"]),
+                    now + float(headers.get("X-RateLimit-Reset-After", 0))
+                )
+            except ValueError:
+                state = None
+            if state is not None:
+                self.buckets[route] = state
+                metrics.set_gauge(f"http.{route}.limit", state.limit)
+                metrics.set_gauge(f"http.{route}.remaining", state.remaining)
+                metrics.set_gauge(f"http.{route}.reset_after", state.reset_at - now)
+
+        if params.response.status == 429:
+            scope = headers.get("X-RateLimit-Scope", "global" if headers.get("X-RateLimit-Global") else "user")
+            metrics.incr("http.429")
+            metrics.incr(f"http.429.{scope}")
+            metrics.incr(f"http.{route}.429")
+            try:
+                retry_after = float(headers.get("Retry-After", 1))
+            except ValueError:
+                retry_after = 1.0
+            # Shared limits are other bots' traffic on the same resource; ours never caused them
+            if scope != "shared":
+                self._backoff_until = max(self._backoff_until, now + retry_after)
+            print(f"⚠️ Rate limited on {route} ({scope}), retrying in {retry_after:.2f}s")
+
+    def note_interactive(self):
+        """Record that an interaction came in, so background jobs give way"""
+        self._last_interactive = time.monotonic()
+
+    def requests_per_second(self) -> int:
+        cutoff = time.monotonic() - 1
+        while self._recent and self._recent[0] < cutoff:
+            self._recent.popleft()
+        return len(self._recent)
+
+    def _busy(self) -> Optional[str]:
+        """Why background work should wait right now, if it should"""
+        now = time.monotonic()
+        if now < self._backoff_until:
+            return "rate_limited"
+        if (now - self._last_interactive) * 1000 < self.config["interactive_grace_ms"]:
+            return "interactive"
+        if self.requests_per_second() >= GLOBAL_RATE_LIMIT * self.config["background_share"]:
+            return "global_limit"
+        return None
+
+    async def wait_turn(self):
+        """Wait until background work may make its next request"""
+        started = time.monotonic()
+        reason = self._busy()
+        if reason is None:
+            return
+        metrics.incr(f"http.background_waits.{reason}")
+        while reason is not None and time.monotonic() - started < self.config["max_background_wait"]:
+            await asyncio.sleep(WAIT_STEP)
+            reason = self._busy()
+        metrics.incr("http.background_wait_ms", (time.monotonic() - started) * 1000)
+
+    @asynccontextmanager
+    async def background(self):
+        """Hold a background slot for one request, after interactive traffic has had its turn"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.config["background_concurrency"])
+        async with self._slots:
+            await self.wait_turn()
+            yield
+
+# Global HTTP scheduler instance
+http_scheduler = HttpScheduler()
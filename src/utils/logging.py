@@ -3,6 +3,7 @@ import os
 import logging
 from datetime import datetime
 from src import storage
+from src.utils.members import member_cache
 
 # Set up file logging
 def setup_file_logging(guild_id: int = None):
@@ -37,22 +38,22 @@ class BotLogger:
     """Centralized logging system for bot events"""
     
     @staticmethod
-    async def get_log_channel(guild: discord.Guild):
+    async def get_log_channel(guild: discord.Guild, cfg: dict = None):
         """Get the configured log channel for a guild"""
-        cfg = storage.get_config(guild.id)
+        cfg = cfg if cfg is not None else storage.get_config(guild.id)
         log_channel_id = cfg.get("channels", {}).get("logs")
         if log_channel_id:
             return guild.get_channel(log_channel_id)
         return None
     
     @staticmethod
-    async def log_ticket_created(guild: discord.Guild, ticket_channel: discord.TextChannel, user: discord.Member, ticket_type: str, ticket_data: dict):
+    async def log_ticket_created(guild: discord.Guild, ticket_channel: discord.TextChannel, user: discord.Member, ticket_type: str, ticket_data: dict, cfg: dict = None):
         """Log when a ticket is created"""
         # File logging
         logger = setup_file_logging(guild.id)
         logger.info(f"Ticket created - Type: {ticket_type}, Channel: {ticket_channel.name} (ID: {ticket_channel.id}), User: {user.name}#{user.discriminator} (ID: {user.id})")
         
-        log_channel = await BotLogger.get_log_channel(guild)
+        log_channel = await BotLogger.get_log_channel(guild, cfg)
         if not log_channel:
             return
         
@@ -97,8 +98,10 @@ class BotLogger:
         transcript_path = None
         html_transcript_path = None
         try:
-            transcript_path = await TranscriptGenerator.generate_transcript(ticket_channel, ticket_data)
-            html_transcript_path = await TranscriptGenerator.generate_html_transcript(ticket_channel, ticket_data)
+            # Read the history once and render both formats from it
+            messages = await TranscriptGenerator.fetch_messages(ticket_channel)
+            transcript_path = await TranscriptGenerator.generate_transcript(ticket_channel, ticket_data, messages)
+            html_transcript_path = await TranscriptGenerator.generate_html_transcript(ticket_channel, ticket_data, messages)
         except Exception as e:
             print(f"Error generating transcript: {e}")
         
@@ -119,7 +122,7 @@ class BotLogger:
         
         if ticket_data:
             if "opened_by" in ticket_data:
-                opener = guild.get_member(ticket_data["opened_by"])
+                opener = member_cache.get(guild, ticket_data["opened_by"])
                 if opener:
                     embed.add_field(name="Opened By", value=f"{opener.mention} ({opener.id})", inline=False)
             if "ticket_type" in ticket_data:
@@ -236,6 +239,55 @@ class BotLogger:
         except Exception as e:
             print(f"Error logging config change: {e}")
     
+    @staticmethod
+    async def log_bulk_action(guild: discord.Guild, moderator: discord.Member, action: str, succeeded: int, total: int, reason: str):
+        """Log a bulk moderation command as a single entry"""
+        # File logging
+        logger = setup_file_logging(guild.id)
+        logger.info(f"Bulk mod action - Action: {action}, Moderator: {moderator.name} (ID: {moderator.id}), Users: {succeeded}/{total}, Reason: {reason}")
+        
+        log_channel = await BotLogger.get_log_channel(guild)
+        if not log_channel:
+            return
+        
+        embed = discord.Embed(
+            title="🧹 Bulk Moderation Action",
+            description=f"**Action:** {action.upper()}\n**Users:** {succeeded} of {total}\n**Reason:** {reason}",
+            color=0xff9900 if action != "ban" else 0xff0000,
+            timestamp=datetime.utcnow()
+        )
+        embed.add_field(name="Moderator", value=f"{moderator.mention} ({moderator.id})", inline=False)
+        
+        try:
+            await log_channel.send(embed=embed)
+        except Exception as e:
+            print(f"Error logging bulk action: {e}")
+    
+    @staticmethod
+    async def log_raid_alert(guild: discord.Guild, event: str, count: int, window: int, lockdown_minutes: int):
+        """Log an automatic raid lockdown"""
+        # File logging
+        logger = setup_file_logging(guild.id)
+        logger.warning(f"Raid lockdown - Event: {event}, Count: {count} in {window}s, Lockdown: {lockdown_minutes} minutes")
+        
+        log_channel = await BotLogger.get_log_channel(guild)
+        if not log_channel:
+            return
+        
+        embed = discord.Embed(
+            title="🚨 Raid Detected - Tickets Locked",
+            description=f"Ticket panels are paused for **{lockdown_minutes} minutes**. Use `/lockdown minutes:0` to lift it early.",
+            color=0xe74c3c,  # Red
+            timestamp=datetime.utcnow()
+        )
+        embed.add_field(name="Trigger", value=event.title(), inline=True)
+        embed.add_field(name="Events", value=f"{count} in {window} seconds", inline=True)
+        
+        try:
+            await log_channel.send(embed=embed)
+        except Exception as e:
+            print(f"Error logging raid alert: {e}")
+    
     @staticmethod
     async def log_vouch_submitted(guild: discord.Guild, user: discord.Member, seller: discord.Member, rating: int):
         """Log when a vouch is submitted"""
@@ -0,0 +1,152 @@
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, List, Optional, Union
+import discord
+from src import storage
+from src.utils.runtime_profile import get_runtime_profile
+
+# Members per gateway member query (Discord's limit)
+QUERY_CHUNK = 100
+
+def get_member_cache_config() -> dict:
+    """Get the member_cache section of config.json, with defaults from the runtime profile"""
+    cfg = storage.load_app_config().get("member_cache", {}) or {}
+    profile = get_runtime_profile()
+    cache_all = bool(cfg.get("cache_all_members", profile["cache_all_members"]))
+    return {
+        # Without the full cache (or the members intent) there is nothing to chunk into
+        "chunk_at_startup": bool(cfg.get("chunk_at_startup", profile["chunk_at_startup"])) and cache_all
+                            and profile["features"]["member_events"],
+        "cache_all_members": cache_all,
+        "max_kept_per_guild": int(cfg.get("max_kept_per_guild", 2000)),
+    }
+
+class MemberCache:
+    """Member lookups under a configurable cache policy
+
+    With cache_all_members on, discord.py caches every member as usual and
+    chunk_at_startup decides whether guilds are chunked at startup or as they
+    are needed. With it off, discord.py keeps no members and this class keeps
+    only staff and ticket participants, at most max_kept_per_guild per guild
+    (least recently seen dropped first). Either way, resolve() fetches the IDs
+    that aren't cached in batches instead of one request per user.
+    """
+
+    def __init__(self):
+        self._config: Optional[dict] = None
+        # Structure: {guild_id: OrderedDict(user_id: Member)}, least recently seen first
+        self._kept: Dict[int, "OrderedDict[int, discord.Member]"] = defaultdict(OrderedDict)
+        # Structure: {guild_id: staff_role_id}
+        self._staff_roles: Dict[int, Optional[int]] = {}
+        storage.add_config_listener(self.invalidate)
+
+    @property
+    def config(self) -> dict:
+        # Loaded on first use, since src.bot imports this module before config.json is needed
+        if self._config is None:
+            self._config = get_member_cache_config()
+        return self._config
+
+    def invalidate(self, guild_id: int):
+        self._staff_roles.pop(int(guild_id), None)
+
+    def client_options(self) -> dict:
+        """Client keyword arguments for the configured policy"""
+        options = {"chunk_guilds_at_startup": self.config["chunk_at_startup"]}
+        if not self.config["cache_all_members"]:
+            options["member_cache_flags"] = discord.MemberCacheFlags.none()
+        return options
+
+    def remember(self, member: discord.Member):
+        """Keep a staff member or ticket participant (only needed without the full cache)"""
+        if self.config["cache_all_members"] or not isinstance(member, discord.Member):
+            return
+        kept = self._kept[member.guild.id]
+        kept[member.id] = member
+        kept.move_to_end(member.id)
+        while len(kept) > self.config["max_kept_per_guild"]:
+            kept.popitem(last=False)
+
+    @property
+    def keeps_participants(self) -> bool:
+        """Whether ticket participants have to be remembered here (the full cache is off)"""
+        return not self.config["cache_all_members"]
+
+    def forget(self, guild_id: int, user_id: int):
+        self._kept.get(int(guild_id), {}).pop(int(user_id), None)
+
+    def _staff_role(self, guild_id: int) -> Optional[int]:
+        if guild_id not in self._staff_roles:
+            self._staff_roles[guild_id] = storage.get_config(guild_id).get("staff_role")
+        return self._staff_roles[guild_id]
+
+    def note_interaction(self, interaction: discord.Interaction):
+        """Keep the member behind an interaction if they are staff"""
+        if self.config["cache_all_members"] or not isinstance(interaction.user, discord.Member):
+            return
+        staff_role = self._staff_role(interaction.guild_id)
+        if staff_role and interaction.user.get_role(staff_role):
+            self.remember(interaction.user)
+
+    def get(self, guild: discord.Guild, user_id: int) -> Optional[discord.Member]:
+        """Get a cached member without any API calls"""
+        return guild.get_member(user_id) or self._kept.get(guild.id, {}).get(user_id)
+
+    async def resolve(
+        self,
+        guild: discord.Guild,
+        user_ids: Iterable[int],
+        client: Optional[discord.Client] = None
+    ) -> Dict[int, Union[discord.Member, discord.User]]:
+        """Look up many users, preferring members
+
+        Cached members are used first, the rest are queried over the gateway
+        100 at a time, and (given the client) users who are no longer members
+        are taken from the user cache or fetched. IDs that can't be found are
+        left out of the result.
+        """
+        from src.utils.bulk import run_bulk
+
+        found = {}
+        missing = []
+        for user_id in dict.fromkeys(int(user_id) for user_id in user_ids if user_id):
+            member = self.get(guild, user_id)
+            if member is not None:
+                found[user_id] = member
+            else:
+                missing.append(user_id)
+
+        for start in range(0, len(missing), QUERY_CHUNK):
+            try:
+                members = await guild.query_members(user_ids=missing[start:start + QUERY_CHUNK], cache=self.config["cache_all_members"])
+            except (TimeoutError, discord.ClientException) as e:
+                print(f"Error querying members in {guild.id}: {e}")
+                continue
+            for member in members:
+                found[member.id] = member
+
+        left = [user_id for user_id in missing if user_id not in found]
+        if client is None or not left:
+            return found
+
+        to_fetch = []
+        for user_id in left:
+            user = client.get_user(user_id)
+            if user is not None:
+                found[user_id] = user
+            else:
+                to_fetch.append(user_id)
+
+        async def fetch(user_id: int):
+            found[user_id] = await client.fetch_user(user_id)
+
+        await run_bulk(to_fetch, fetch)
+        return found
+
+    async def members(self, guild: discord.Guild) -> List[discord.Member]:
+        """Get every member of a guild, chunking it first if it hasn't been"""
+        if guild.chunked:
+            return list(guild.members)
+        return await guild.chunk(cache=self.config["cache_all_members"])
+
+# Global member cache instance
+member_cache = MemberCache()
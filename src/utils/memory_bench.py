@@ -0,0 +1,117 @@
+"""Offline memory benchmark for the runtime profiles
+
+Feeds synthetic GUILD_CREATE and MESSAGE_CREATE payloads into a discord.py
+client built with each profile's cache settings and reports the resident
+memory they cost per 1000 guilds. Every profile runs in its own process so
+one profile's allocations don't hide another's. Nothing connects to Discord.
+
+    python main.py --memory-benchmark
+"""
+import gc
+import multiprocessing
+import os
+import resource
+import sys
+from datetime import datetime, timezone
+import discord
+from src.utils.runtime_profile import FEATURE_DEFAULTS, PROFILES, build_intents
+
+def rss_bytes() -> int:
+    """Current resident set size (peak RSS where /proc isn't available)"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS reports bytes, Linux kilobytes
+        return peak if sys.platform == "darwin" else peak * 1024
+
+def _user(user_id: int) -> dict:
+    return {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0", "global_name": None, "avatar": None}
+
+def _guild_payload(guild_id: int, members: int, channels: int) -> dict:
+    joined_at = datetime.now(timezone.utc).isoformat()
+    return {
+        "id": str(guild_id),
+        "name": f"Guild {guild_id}",
+        "member_count": members,
+        "roles": [{"id": str(guild_id), "name": "@everyone", "permissions": "0", "position": 0, "color": 0,
+                   "hoist": False, "managed": False, "mentionable": False}],
+        "channels": [
+            {"id": str(guild_id * 1000 + index), "type": 0, "name": f"ticket-{index}", "position": index,
+             "permission_overwrites": [], "guild_id": str(guild_id)}
+            for index in range(channels)
+        ],
+        "members": [
+            {"user": _user(guild_id * 100000 + index), "roles": [], "joined_at": joined_at,
+             "deaf": False, "mute": False, "flags": 0}
+            for index in range(members)
+        ],
+        "features": [], "emojis": [], "stickers": [], "threads": [], "voice_states": [], "presences": [],
+    }
+
+def _message_payload(message_id: int, guild_id: int, channel_id: int, author_id: int, content: str) -> dict:
+    return {
+        "id": str(message_id), "channel_id": str(channel_id), "guild_id": str(guild_id),
+        "author": _user(author_id), "content": content, "timestamp": datetime.now(timezone.utc).isoformat(),
+        "edited_timestamp": None, "tts": False, "mention_everyone": False, "mentions": [], "mention_roles": [],
+        "attachments": [], "embeds": [], "pinned": False, "type": 0,
+    }
+
+def measure_profile(name: str, guilds: int, members: int, channels: int, messages: int) -> dict:
+    """Measure one profile in this process"""
+    profile = dict(PROFILES[name], name=name, features=dict(FEATURE_DEFAULTS))
+    intents = build_intents(profile)
+    options = {"max_messages": profile["max_messages"]}
+    if not profile["cache_all_members"]:
+        options["member_cache_flags"] = discord.MemberCacheFlags.none()
+    client = discord.Client(intents=intents, **options)
+    state = client._connection
+    state.user = discord.ClientUser(state=state, data=_user(1))
+
+    gc.collect()
+    before = rss_bytes()
+    message_id = 1
+    for guild_index in range(guilds):
+        guild_id = 10_000 + guild_index
+        state._add_guild_from_data(_guild_payload(guild_id, members, channels))
+        for index in range(messages):
+            channel_id = guild_id * 1000 + index % channels
+            content = "Ticket message " * 8 if intents.message_content else ""
+            state.parse_message_create(_message_payload(message_id, guild_id, channel_id, guild_id * 100000, content))
+            message_id += 1
+    gc.collect()
+    used = rss_bytes() - before
+
+    return {
+        "profile": name,
+        "rss_per_1k_guilds": used / guilds * 1000,
+        "cached_members": sum(len(guild._members) for guild in state._guilds.values()),
+        "cached_messages": len(state._messages or ()),
+        "intents": intents.value,
+    }
+
+def _worker(name, guilds, members, channels, messages, queue):
+    queue.put(measure_profile(name, guilds, members, channels, messages))
+
+def run_benchmark(guilds: int = 1000, members: int = 100, channels: int = 10, messages: int = 20) -> str:
+    """Measure every profile in its own process and format the results"""
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    for name in PROFILES:
+        queue = ctx.Queue()
+        process = ctx.Process(target=_worker, args=(name, guilds, members, channels, messages, queue))
+        process.start()
+        results.append(queue.get())
+        process.join()
+
+    lines = [
+        f"Memory benchmark: {guilds} guilds, {members} members, {channels} channels and {messages} messages per guild",
+        f"{'Profile':<10} {'RSS / 1k guilds':>16} {'Members cached':>15} {'Messages cached':>16} {'Intents':>9}",
+    ]
+    for result in results:
+        lines.append(
+            f"{result['profile']:<10} {result['rss_per_1k_guilds'] / 1024 / 1024:>13.1f} MB "
+            f"{result['cached_members']:>15} {result['cached_messages']:>16} {result['intents']:>9}"
+        )
+    return "\n".join(lines)
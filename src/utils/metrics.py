@@ -0,0 +1,58 @@
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+class Metrics:
+    """In-memory counters and gauges with an optional per-shard breakdown"""
+
+    def __init__(self):
+        # Structure: {(name, shard_id): value}
+        self.counters: Dict[Tuple[str, Optional[int]], float] = defaultdict(float)
+        # Structure: {(name, shard_id): value}
+        self.gauges: Dict[Tuple[str, Optional[int]], float] = {}
+
+    def incr(self, name: str, value: float = 1, shard_id: Optional[int] = None):
+        """Increment a counter"""
+        self.counters[(name, shard_id)] += value
+
+    def set_gauge(self, name: str, value: float, shard_id: Optional[int] = None):
+        """Set a gauge to its current value"""
+        self.gauges[(name, shard_id)] = value
+
+    def get(self, name: str, shard_id: Optional[int] = None) -> float:
+        """Get a counter or gauge value for one shard (or the unsharded value)"""
+        key = (name, shard_id)
+        if key in self.gauges:
+            return self.gauges[key]
+        return self.counters.get(key, 0)
+
+    def total(self, name: str) -> float:
+        """Sum a counter across all shards"""
+        return sum(value for (metric, _), value in self.counters.items() if metric == name)
+
+    def by_shard(self, name: str) -> Dict[Optional[int], float]:
+        """Get a {shard_id: value} breakdown for a counter or gauge"""
+        result = {}
+        for (metric, shard_id), value in self.counters.items():
+            if metric == name:
+                result[shard_id] = value
+        for (metric, shard_id), value in self.gauges.items():
+            if metric == name:
+                result[shard_id] = value
+        return result
+
+    def snapshot(self) -> Dict[str, float]:
+        """Flatten all metrics into {"name" or "name{shard=N}": value}"""
+        result = {}
+        for source in (self.counters, self.gauges):
+            for (name, shard_id), value in source.items():
+                key = name if shard_id is None else f"{name}{{shard={shard_id}}}"
+                result[key] = value
+        return result
+
+    def reset(self):
+        """Clear all metrics"""
+        self.counters.clear()
+        self.gauges.clear()
+
+# Global metrics instance
+metrics = Metrics()
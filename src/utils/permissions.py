@@ -1,6 +1,11 @@
 import discord
 from src import storage
 
+def is_bot_owner(interaction: discord.Interaction) -> bool:
+    """Check if user is the bot owner from config.json (not just a guild owner)"""
+    app_cfg = storage.load_app_config()
+    return bool(app_cfg.get("owner_id")) and str(interaction.user.id) == str(app_cfg["owner_id"])
+
 def is_owner(interaction: discord.Interaction) -> bool:
     """Check if user is a bot owner or guild owner"""
     app_cfg = storage.load_app_config()
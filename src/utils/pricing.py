@@ -0,0 +1,148 @@
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from src import storage
+
+RANKS = ["NON", "VIP", "VIP+", "MVP", "MVP+"]
+# Products with a price per rank; coins are priced per million
+MFA_PRODUCTS = {"buy_mfa", "sell_mfa"}
+COIN_PRODUCTS = {"buy_coins", "sell_coins"}
+PRODUCTS = COIN_PRODUCTS | MFA_PRODUCTS
+
+# Used when neither the guild nor the config.json defaults set a price
+FALLBACK_COIN_PRICES = {"buy_coins": 0.0375, "sell_coins": 0.015}
+FALLBACK_MFA_PRICES = {
+    "buy_mfa": {"NON": 7.0, "VIP": 8.0, "VIP+": 9.5, "MVP": 11.0, "MVP+": 17.0},
+    "sell_mfa": {"NON": 6.0, "VIP": 7.0, "VIP+": 8.5, "MVP": 10.0, "MVP+": 15.0},
+}
+
+def describe_discount(discount: float) -> str:
+    """Format a tier discount, e.g. "5% off" (negative discounts raise the price: "5% extra")"""
+    return f"{discount:g}% off" if discount >= 0 else f"{-discount:g}% extra"
+
+class Quote(NamedTuple):
+    product: str
+    rank: Optional[str]
+    quantity: float
+    # Unit price before any volume tier
+    base_price: float
+    unit_price: float
+    total: float
+    # Percent taken off the unit price by the volume tier (0 without one)
+    discount: float
+
+class _Line(NamedTuple):
+    base_price: float
+    # Ascending tier minimums and the unit price/discount each one gives
+    mins: List[float]
+    prices: List[Tuple[float, float]]
+
+class PricingEngine:
+    """Per-guild quote tables compiled from the guild config
+
+    A guild's prices and volume tiers are compiled into a table the first
+    time they are needed and kept until its config is saved again, so a
+    quote is a dict lookup and a bisect instead of a config read.
+    """
+
+    def __init__(self):
+        # Structure: {guild_id: {(product, rank): _Line}}
+        self._tables: Dict[int, Dict[Tuple[str, Optional[str]], _Line]] = {}
+        # Bumped on every config change so a compile that raced with a save is not cached
+        self._generations: Dict[int, int] = defaultdict(int)
+        storage.add_config_listener(self.invalidate)
+
+    def invalidate(self, guild_id: int):
+        """Drop a guild's compiled table (runs after every config save, possibly off the event loop)"""
+        guild_id = int(guild_id)
+        self._generations[guild_id] += 1
+        self._tables.pop(guild_id, None)
+
+    @staticmethod
+    def parse_tiers(raw) -> List[Tuple[float, float]]:
+        """Turn [{"min": qty, "discount": percent}] into sorted (min, discount) pairs, skipping bad entries"""
+        tiers = {}
+        for tier in raw if isinstance(raw, list) else []:
+            try:
+                minimum, discount = float(tier["min"]), float(tier.get("discount", 0))
+            except (KeyError, TypeError, ValueError):
+                continue
+            if minimum > 0 and discount < 100:
+                tiers[minimum] = discount
+        return sorted(tiers.items())
+
+    @staticmethod
+    def _compile_line(base_price: float, tiers: List[Tuple[float, float]]) -> _Line:
+        return _Line(
+            base_price=base_price,
+            mins=[minimum for minimum, _ in tiers],
+            prices=[(base_price * (1 - discount / 100), discount) for _, discount in tiers]
+        )
+
+    def compile(self, guild_id: int) -> Dict[Tuple[str, Optional[str]], _Line]:
+        """Build a guild's quote table from its config"""
+        guild_id = int(guild_id)
+        generation = self._generations[guild_id]
+        cfg = storage.get_config(guild_id)
+        defaults = storage.load_app_config().get("defaults", {})
+
+        coins = cfg.get("coins") or {}
+        mfa_prices = cfg.get("mfa_prices") if isinstance(cfg.get("mfa_prices"), dict) else {}
+        default_mfa = defaults.get("mfa_prices", {})
+        all_tiers = cfg.get("volume_tiers", defaults.get("volume_tiers", {})) or {}
+
+        table = {}
+        for product in COIN_PRODUCTS:
+            side = product.split("_")[0]
+            price = float(coins.get(f"{side}_base_price", FALLBACK_COIN_PRICES[product]))
+            table[(product, None)] = self._compile_line(price, self.parse_tiers(all_tiers.get(product)))
+
+        for product in MFA_PRODUCTS:
+            side = product.split("_")[0]
+            # An empty price list falls back to the defaults, like the MFA panel always did
+            prices = mfa_prices.get(side) or default_mfa.get(side) or FALLBACK_MFA_PRICES[product]
+            tiers = self.parse_tiers(all_tiers.get(product))
+            for rank in RANKS:
+                table[(product, rank)] = self._compile_line(float(prices.get(rank, 0.0)), tiers)
+
+        if self._generations[guild_id] == generation:
+            self._tables[guild_id] = table
+        return table
+
+    def table(self, guild_id: int) -> Dict[Tuple[str, Optional[str]], _Line]:
+        table = self._tables.get(int(guild_id))
+        return table if table is not None else self.compile(guild_id)
+
+    def quote(self, guild_id: int, product: str, quantity: float, rank: Optional[str] = None) -> Quote:
+        """Price `quantity` of a product (millions for coins, MFAs of `rank` for MFA products)"""
+        if product not in PRODUCTS:
+            raise ValueError(f"Unknown product: {product}")
+        if product in MFA_PRODUCTS:
+            rank = rank if rank in RANKS else "NON"
+        else:
+            rank = None
+
+        line = self.table(guild_id)[(product, rank)]
+        unit_price, discount = line.base_price, 0.0
+        index = bisect_right(line.mins, quantity)
+        if index:
+            unit_price, discount = line.prices[index - 1]
+        return Quote(product, rank, quantity, line.base_price, unit_price, unit_price * quantity, discount)
+
+    def unit_price(self, guild_id: int, product: str, rank: Optional[str] = None) -> float:
+        """Get the base unit price of a product"""
+        return self.quote(guild_id, product, 1, rank).base_price
+
+    def tiers(self, guild_id: int, product: str) -> List[Tuple[float, float]]:
+        """Get a product's (minimum quantity, discount percent) tiers"""
+        rank = "NON" if product in MFA_PRODUCTS else None
+        line = self.table(guild_id)[(product, rank)]
+        return [(minimum, discount) for minimum, (_, discount) in zip(line.mins, line.prices)]
+
+    def tier_text(self, guild_id: int, product: str, unit: str) -> Optional[str]:
+        """Describe a product's volume tiers for embeds, e.g. "100+ mil: 5% off" (None without tiers)"""
+        lines = [f"{minimum:g}+ {unit}: {describe_discount(discount)}" for minimum, discount in self.tiers(guild_id, product)]
+        return "\n".join(lines) or None
+
+# Global pricing engine instance
+pricing = PricingEngine()
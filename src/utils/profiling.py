@@ -0,0 +1,109 @@
+import builtins
+import importlib.util
+import sys
+import time
+from contextlib import contextmanager
+
+class StartupProfiler:
+    """Measure per-module import cost and setup_hook phases during startup"""
+
+    def __init__(self):
+        self.enabled = False
+        self.started_at = time.perf_counter()
+        self.ready_at = None
+        self.reported = False
+        # Structure: {module_name: [inclusive_seconds, self_seconds]}
+        self.imports = {}
+        # Time spent in imports made outside any other timed import
+        self.top_level_seconds = 0.0
+        # Structure: [(phase_name, seconds)]
+        self.phases = []
+        self._stack = []
+        self._original_import = None
+
+    def install(self):
+        """Start timing imports. Must be called before the bot modules are imported."""
+        if self._original_import is not None:
+            return
+        self.enabled = True
+        self.started_at = time.perf_counter()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def uninstall(self):
+        """Stop timing imports"""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        full_name = name
+        if level:
+            package = (globals or {}).get("__package__")
+            try:
+                full_name = importlib.util.resolve_name("." * level + name, package)
+            except (ImportError, ValueError):
+                return original(name, globals, locals, fromlist, level)
+
+        # Already imported modules cost nothing, don't record them
+        if full_name in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+
+        start = time.perf_counter()
+        self._stack.append(0.0)
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            else:
+                self.top_level_seconds += elapsed
+            record = self.imports.setdefault(full_name, [0.0, 0.0])
+            record[0] += elapsed
+            record[1] += elapsed - children
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a named startup phase (no-op unless profiling is enabled)"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def mark_ready(self):
+        """Record the moment the bot became ready"""
+        if self.ready_at is None:
+            self.ready_at = time.perf_counter()
+
+    def report(self, limit: int = 25) -> str:
+        """Build a human readable startup report"""
+        lines = ["=" * 50, "Startup profile", "=" * 50]
+
+        lines.append(f"Imports: {len(self.imports)} module(s), {self.top_level_seconds * 1000:.1f}ms in top-level imports")
+        lines.append(f"{'self ms':>9} {'total ms':>9}  module")
+        by_self = sorted(self.imports.items(), key=lambda item: item[1][1], reverse=True)
+        for name, (inclusive, own) in by_self[:limit]:
+            lines.append(f"{own * 1000:>9.1f} {inclusive * 1000:>9.1f}  {name}")
+
+        if self.phases:
+            lines.append("")
+            lines.append("setup_hook phases:")
+            for name, seconds in self.phases:
+                lines.append(f"{seconds * 1000:>9.1f}ms  {name}")
+            lines.append(f"{sum(s for _, s in self.phases) * 1000:>9.1f}ms  total")
+
+        if self.ready_at is not None:
+            lines.append("")
+            lines.append(f"Time to ready: {self.ready_at - self.started_at:.2f}s")
+        lines.append("=" * 50)
+        return "\n".join(lines)
+
+# Global startup profiler instance
+startup_profiler = StartupProfiler()
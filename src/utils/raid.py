@@ -0,0 +1,166 @@
+import asyncio
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, NamedTuple, Optional
+import discord
+from src import storage
+from src.utils.metrics import metrics
+
+# Event kinds and the raid_settings key holding each one's limit per window
+EVENT_LIMITS = {"ticket_open": "max_ticket_opens", "join": "max_joins", "button": "max_button_presses"}
+# Each window is split into this many buckets, so a counter is a fixed size
+BUCKETS = 12
+
+class RaidSettings(NamedTuple):
+    enabled: bool
+    window: int
+    # Structure: {event_kind: max weighted events per window}
+    limits: Dict[str, int]
+    # Events from accounts younger than this (or members who joined more
+    # recently than min_join_age) count new_account_weight times
+    min_account_age: float
+    min_join_age: float
+    new_account_weight: int
+    lockdown: int
+
+DEFAULT_SETTINGS = {
+    "enabled": True,
+    "window": 60,
+    "max_ticket_opens": 15,
+    "max_joins": 20,
+    "max_button_presses": 60,
+    "min_account_age_days": 7,
+    "min_join_age_minutes": 10,
+    "new_account_weight": 3,
+    "lockdown_minutes": 15
+}
+
+class _WindowCounter:
+    """Sliding-window event count over a fixed ring of buckets"""
+    __slots__ = ("window", "bucket_size", "counts", "current")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.bucket_size = max(window / BUCKETS, 1.0)
+        self.counts = [0] * BUCKETS
+        # Index of the newest bucket since the epoch
+        self.current = 0
+
+    def _advance(self, now: float):
+        index = int(now // self.bucket_size)
+        if index - self.current >= BUCKETS:
+            self.counts = [0] * BUCKETS
+        else:
+            for stale in range(self.current + 1, index + 1):
+                self.counts[stale % BUCKETS] = 0
+        self.current = max(self.current, index)
+
+    def add(self, now: float, weight: int = 1) -> int:
+        """Record an event and return the window's total"""
+        self._advance(now)
+        self.counts[self.current % BUCKETS] += weight
+        return sum(self.counts)
+
+class RaidDetector:
+    """Guild-wide sliding-window counters for ticket opens, joins and panel presses
+
+    When a guild goes over one of its limits it is locked down for
+    lockdown_minutes: ticket panels and /ticket answer with a "try later"
+    message, and an alert is posted to the log channel. Every guild keeps
+    one fixed-size counter per event kind.
+    """
+
+    def __init__(self):
+        # Structure: {guild_id: {event_kind: _WindowCounter}}
+        self._counters: Dict[int, Dict[str, _WindowCounter]] = defaultdict(dict)
+        # Structure: {guild_id: lockdown end (epoch seconds)}
+        self._lockdowns: Dict[int, float] = {}
+        # Structure: {guild_id: RaidSettings}
+        self._settings: Dict[int, RaidSettings] = {}
+        storage.add_config_listener(self.invalidate)
+
+    def invalidate(self, guild_id: int):
+        guild_id = int(guild_id)
+        # Counters are kept across saves so a raid in progress stays counted;
+        # record() only rebuilds one when the window itself changed
+        self._settings.pop(guild_id, None)
+
+    def settings(self, guild_id: int) -> RaidSettings:
+        guild_id = int(guild_id)
+        cached = self._settings.get(guild_id)
+        if cached is None:
+            raw = dict(DEFAULT_SETTINGS, **(storage.get_config(guild_id).get("raid_settings") or {}))
+            cached = self._settings[guild_id] = RaidSettings(
+                enabled=bool(raw["enabled"]),
+                window=max(int(raw["window"]), BUCKETS),
+                limits={kind: int(raw[key]) for kind, key in EVENT_LIMITS.items()},
+                min_account_age=float(raw["min_account_age_days"]) * 86400,
+                min_join_age=float(raw["min_join_age_minutes"]) * 60,
+                new_account_weight=max(int(raw["new_account_weight"]), 1),
+                lockdown=int(raw["lockdown_minutes"]) * 60
+            )
+        return cached
+
+    @staticmethod
+    def _is_new(member: discord.abc.User, settings: RaidSettings) -> bool:
+        now = datetime.now(timezone.utc)
+        if (now - member.created_at).total_seconds() < settings.min_account_age:
+            return True
+        joined_at = getattr(member, "joined_at", None)
+        return joined_at is not None and (now - joined_at).total_seconds() < settings.min_join_age
+
+    def lockdown_remaining(self, guild_id: int) -> float:
+        """Seconds left in a guild's lockdown (0 when it isn't locked down)"""
+        until = self._lockdowns.get(int(guild_id))
+        if until is None:
+            return 0.0
+        remaining = until - time.time()
+        if remaining <= 0:
+            del self._lockdowns[int(guild_id)]
+            return 0.0
+        return remaining
+
+    def record(self, guild: discord.Guild, kind: str, member: discord.abc.User) -> bool:
+        """Count an event. Returns True if it started a lockdown"""
+        settings = self.settings(guild.id)
+        limit = settings.limits.get(kind, 0)
+        if not settings.enabled or limit <= 0 or member.bot:
+            return False
+
+        counter = self._counters[guild.id].get(kind)
+        if counter is None or counter.window != settings.window:
+            counter = self._counters[guild.id][kind] = _WindowCounter(settings.window)
+        weight = settings.new_account_weight if self._is_new(member, settings) else 1
+        total = counter.add(time.time(), weight)
+        if total <= limit or self.lockdown_remaining(guild.id):
+            return False
+
+        self.lock(guild.id, settings.lockdown)
+        metrics.incr("raid.lockdowns", shard_id=guild.shard_id)
+        asyncio.get_running_loop().create_task(self._alert(guild, kind, total, settings))
+        return True
+
+    def lock(self, guild_id: int, seconds: float):
+        """Start (or extend) a lockdown; 0 seconds lifts it"""
+        if seconds > 0:
+            self._lockdowns[int(guild_id)] = time.time() + seconds
+        else:
+            self._lockdowns.pop(int(guild_id), None)
+
+    async def _alert(self, guild: discord.Guild, kind: str, total: int, settings: RaidSettings):
+        from src.utils.logging import BotLogger
+        await BotLogger.log_raid_alert(guild, kind.replace("_", " "), total, settings.window, settings.lockdown // 60)
+
+    def check(self, interaction: discord.Interaction, kind: str = "button") -> Optional[str]:
+        """Count a panel interaction. Returns the message to send instead if the guild is locked down"""
+        if not interaction.guild:
+            return None
+        self.record(interaction.guild, kind, interaction.user)
+        remaining = self.lockdown_remaining(interaction.guild_id)
+        if remaining:
+            return f"🔒 Tickets are temporarily paused because of unusual activity. Please try again in {max(int(remaining // 60), 1)} minute(s)."
+        return None
+
+# Global raid detector instance
+raid_detector = RaidDetector()
@@ -0,0 +1,54 @@
+import discord
+from src import storage
+
+# Runtime profiles. Values not set in config.json's runtime section come from here.
+#   max_messages:      messages discord.py keeps in its cache (None disables it)
+#   chunk_at_startup / cache_all_members: member_cache defaults, see src/utils/members.py
+#   trim_intents:      only request the gateway intents the enabled features need
+PROFILES = {
+    "default": {
+        "max_messages": 1000,
+        "chunk_at_startup": True,
+        "cache_all_members": True,
+        "trim_intents": False,
+    },
+    "lean": {
+        # Enough for recent ticket activity; transcripts fetch history instead
+        "max_messages": 100,
+        "chunk_at_startup": False,
+        "cache_all_members": False,
+        "trim_intents": True,
+    },
+}
+
+# Features that need gateway intents beyond guilds and guild messages
+#   transcripts:    message_content, so transcripts and channel backups include message text
+#   member_events:  members, for raid join detection, member lookups and /bulk by role
+FEATURE_DEFAULTS = {"transcripts": True, "member_events": True}
+
+def get_runtime_profile() -> dict:
+    """Get the runtime section of config.json resolved against its profile"""
+    cfg = storage.load_app_config().get("runtime", {}) or {}
+    name = cfg.get("profile", "default")
+    if name not in PROFILES:
+        print(f"Unknown runtime profile {name!r}, using default")
+        name = "default"
+    profile = dict(PROFILES[name], name=name)
+    profile.update({key: cfg[key] for key in PROFILES[name] if key in cfg})
+    profile["features"] = dict(FEATURE_DEFAULTS, **(cfg.get("features") or {}))
+    return profile
+
+def build_intents(profile: dict) -> discord.Intents:
+    """Gateway intents for a profile"""
+    features = profile["features"]
+    if not profile["trim_intents"]:
+        intents = discord.Intents.default()
+        intents.guilds = True
+    else:
+        # Ticket channels, panels and auto-close only need guild and message events
+        intents = discord.Intents.none()
+        intents.guilds = True
+        intents.guild_messages = True
+    intents.message_content = features["transcripts"]
+    intents.members = features["member_events"]
+    return intents
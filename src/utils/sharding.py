@@ -0,0 +1,52 @@
+from typing import List
+from src import storage
+
+def parse_shard_range(value) -> List[int]:
+    """Parse a shard range like "0-3", "4,5,7" or [0, 1] into a list of shard IDs"""
+    if isinstance(value, int):
+        return [value]
+    if isinstance(value, (list, tuple)):
+        return [int(x) for x in value]
+
+    shard_ids = []
+    for part in str(value).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            start, end = int(start), int(end)
+            if end < start:
+                raise ValueError(f"Invalid shard range: {part}")
+            shard_ids.extend(range(start, end + 1))
+        else:
+            shard_ids.append(int(part))
+    return shard_ids
+
+def get_sharding_config() -> dict:
+    """Get the sharding section of config.json with defaults applied"""
+    cfg = storage.load_app_config().get("sharding", {}) or {}
+    return {
+        "enabled": bool(cfg.get("enabled", False)),
+        "shard_count": cfg.get("shard_count"),
+        "clusters": cfg.get("clusters", []) or [],
+    }
+
+def get_clusters(sharding_cfg: dict) -> List[List[int]]:
+    """Resolve the configured clusters into lists of shard IDs and validate them"""
+    shard_count = sharding_cfg.get("shard_count")
+    clusters = [parse_shard_range(c) for c in sharding_cfg.get("clusters", [])]
+    if not clusters:
+        return []
+    if not shard_count:
+        raise ValueError("sharding.shard_count must be set when clusters are configured")
+
+    seen = set()
+    for shard_ids in clusters:
+        for shard_id in shard_ids:
+            if shard_id < 0 or shard_id >= shard_count:
+                raise ValueError(f"Shard {shard_id} is outside 0-{shard_count - 1}")
+            if shard_id in seen:
+                raise ValueError(f"Shard {shard_id} is assigned to more than one cluster")
+            seen.add(shard_id)
+    return clusters
@@ -0,0 +1,41 @@
+from collections import defaultdict
+from typing import Dict, Iterable, Optional
+
+class GuildStats:
+    """Per-guild counters kept up to date by the code that changes them
+
+    Used for values shown often (presence, panels) so showing them never
+    needs a storage read.
+    """
+
+    def __init__(self):
+        # Structure: {name: {guild_id: value}}
+        self._values: Dict[str, Dict[int, float]] = defaultdict(dict)
+        # Structure: {name: total_over_all_guilds}
+        self._totals: Dict[str, float] = defaultdict(float)
+
+    def set(self, name: str, guild_id: int, value: float):
+        """Set a counter for one guild"""
+        values = self._values[name]
+        self._totals[name] += value - values.get(guild_id, 0)
+        values[guild_id] = value
+
+    def incr(self, name: str, guild_id: int, value: float = 1):
+        """Increment a counter for one guild"""
+        self.set(name, guild_id, self._values[name].get(guild_id, 0) + value)
+
+    def get(self, name: str, guild_id: int) -> float:
+        return self._values[name].get(guild_id, 0)
+
+    def has(self, name: str, guild_id: int) -> bool:
+        return guild_id in self._values[name]
+
+    def total(self, name: str, guild_ids: Optional[Iterable[int]] = None) -> float:
+        """Sum a counter over all guilds, or over the given guilds"""
+        if guild_ids is None:
+            return self._totals[name]
+        values = self._values[name]
+        return sum(values.get(guild_id, 0) for guild_id in guild_ids)
+
+# Global guild stats instance
+guild_stats = GuildStats()
@@ -0,0 +1,135 @@
+import asyncio
+import heapq
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from src import storage
+
+# Timers set in DMs are stored under this key instead of a guild ID
+DM_KEY = 0
+
+class TimerService:
+    """Persisted timers driven by a single task
+
+    Deadlines live in one min-heap; the task sleeps until the earliest one
+    (or until a sooner timer is added) and hands due timers to a callback.
+    Timers are stored per guild in timers.json and reloaded on startup.
+    """
+
+    def __init__(self):
+        # Structure: [(end_time, guild_id, timer_id)]
+        self._heap: List[Tuple[float, int, int]] = []
+        # Structure: {guild_id: {"next_id": int, "timers": {timer_id: timer}}}
+        self._guilds: Dict[int, dict] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def _ensure_loaded(self, guild_id: int) -> dict:
+        guild_id = int(guild_id)
+        data = self._guilds.get(guild_id)
+        if data is None:
+            stored = storage.load_guild_json(storage.TIMERS_PATH, guild_id) or {}
+            data = {
+                "next_id": stored.get("next_id", 1),
+                "timers": {int(k): v for k, v in stored.get("timers", {}).items()}
+            }
+            self._guilds[guild_id] = data
+            for timer_id, timer in data["timers"].items():
+                heapq.heappush(self._heap, (timer["end_time"], guild_id, timer_id))
+        return data
+
+    def _persist(self, guild_id: int):
+        data = self._guilds[guild_id]
+        storage.save_guild_json(storage.TIMERS_PATH, guild_id, {
+            "next_id": data["next_id"],
+            "timers": {str(k): v for k, v in data["timers"].items()}
+        })
+
+    def load_guild(self, guild_id: int):
+        """Load a guild's stored timers into the heap"""
+        self._ensure_loaded(guild_id)
+
+    def add(self, guild_id: int, channel_id: int, user_id: int, seconds: float, reason: str = None) -> dict:
+        """Schedule a timer and return it"""
+        guild_id = int(guild_id)
+        data = self._ensure_loaded(guild_id)
+        timer_id = data["next_id"]
+        data["next_id"] += 1
+        timer = {
+            "id": timer_id,
+            "channel_id": channel_id,
+            "user_id": user_id,
+            "created_at": time.time(),
+            "end_time": time.time() + seconds,
+            "reason": reason
+        }
+        data["timers"][timer_id] = timer
+        self._persist(guild_id)
+
+        is_earliest = not self._heap or timer["end_time"] < self._heap[0][0]
+        heapq.heappush(self._heap, (timer["end_time"], guild_id, timer_id))
+        if is_earliest and self._wakeup:
+            self._wakeup.set()
+        return dict(timer)
+
+    def list_timers(self, guild_id: int, user_id: Optional[int] = None) -> List[dict]:
+        """Get a guild's pending timers (optionally only one user's), soonest first"""
+        timers = self._ensure_loaded(guild_id)["timers"].values()
+        if user_id is not None:
+            timers = [t for t in timers if t["user_id"] == user_id]
+        return sorted((dict(t) for t in timers), key=lambda t: t["end_time"])
+
+    def cancel(self, guild_id: int, timer_ids: List[int], user_id: Optional[int] = None) -> List[int]:
+        """Cancel timers by ID (only a user's own if user_id is given). Returns the cancelled IDs"""
+        guild_id = int(guild_id)
+        data = self._ensure_loaded(guild_id)
+        cancelled = []
+        for timer_id in timer_ids:
+            timer = data["timers"].get(timer_id)
+            if timer and (user_id is None or timer["user_id"] == user_id):
+                # The heap entry is skipped when it comes due
+                del data["timers"][timer_id]
+                cancelled.append(timer_id)
+        if cancelled:
+            self._persist(guild_id)
+        return cancelled
+
+    def pop_due(self, now: float = None) -> List[Tuple[int, dict]]:
+        """Remove and return (guild_id, timer) for every timer that has ended"""
+        now = now if now is not None else time.time()
+        due = []
+        changed = set()
+        while self._heap and self._heap[0][0] <= now:
+            _, guild_id, timer_id = heapq.heappop(self._heap)
+            timer = self._guilds.get(guild_id, {}).get("timers", {}).pop(timer_id, None)
+            if timer:
+                due.append((guild_id, timer))
+                changed.add(guild_id)
+        for guild_id in changed:
+            self._persist(guild_id)
+        return due
+
+    async def run(self, deliver: Callable[[int, dict], Awaitable[None]]):
+        """Deliver timers as they end. Runs until cancelled"""
+        self._wakeup = asyncio.Event()
+        semaphore = asyncio.Semaphore(5)
+
+        async def send(guild_id: int, timer: dict):
+            async with semaphore:
+                try:
+                    await deliver(guild_id, timer)
+                except Exception as e:
+                    print(f"Error delivering timer {timer.get('id')} in {guild_id}: {e}")
+
+        while True:
+            due = self.pop_due()
+            if due:
+                await asyncio.gather(*(send(guild_id, timer) for guild_id, timer in due))
+
+            self._wakeup.clear()
+            timeout = self._heap[0][0] - time.time() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+# Global timer service instance
+timer_service = TimerService()
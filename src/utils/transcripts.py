@@ -5,6 +5,7 @@ from datetime import datetime
 from typing import List, Optional
 from src import storage
 from src.tickets.utils import get_ticket
+from src.utils.members import member_cache
 
 
 class TranscriptGenerator:
@@ -19,7 +20,12 @@ class TranscriptGenerator:
         return guild_dir
     
     @staticmethod
-    async def generate_transcript(channel: discord.TextChannel, ticket_data: dict = None) -> Optional[str]:
+    async def fetch_messages(channel: discord.abc.Messageable) -> List[discord.Message]:
+        """Fetch the full history of a ticket channel or thread, oldest first"""
+        return [message async for message in channel.history(limit=None, oldest_first=True)]
+    
+    @staticmethod
+    async def generate_transcript(channel: discord.TextChannel, ticket_data: dict = None, messages: List[discord.Message] = None) -> Optional[str]:
         """Generate a transcript file for a ticket channel"""
         try:
             # Get ticket data if not provided
@@ -42,7 +48,7 @@ class TranscriptGenerator:
                 
                 opener_id = ticket_data.get('opened_by')
                 if opener_id:
-                    opener = channel.guild.get_member(opener_id)
+                    opener = (await member_cache.resolve(channel.guild, [opener_id])).get(opener_id)
                     if opener:
                         transcript_lines.append(f"Opened By: {opener.name}#{opener.discriminator} (ID: {opener.id})")
                     else:
@@ -80,10 +86,9 @@ class TranscriptGenerator:
             transcript_lines.append("=" * 80)
             transcript_lines.append("")
             
-            # Fetch all messages
-            messages = []
-            async for message in channel.history(limit=None, oldest_first=True):
-                messages.append(message)
+            # Fetch all messages (unless the caller already did)
+            if messages is None:
+                messages = await TranscriptGenerator.fetch_messages(channel)
             
             # Format messages
             for message in messages:
@@ -151,7 +156,7 @@ class TranscriptGenerator:
             return None
     
     @staticmethod
-    async def generate_html_transcript(channel: discord.TextChannel, ticket_data: dict = None) -> Optional[str]:
+    async def generate_html_transcript(channel: discord.TextChannel, ticket_data: dict = None, messages: List[discord.Message] = None) -> Optional[str]:
         """Generate an HTML transcript for a ticket channel"""
         try:
             # Get ticket data if not provided
@@ -243,7 +248,7 @@ class TranscriptGenerator:
                 
                 opener_id = ticket_data.get('opened_by')
                 if opener_id:
-                    opener = channel.guild.get_member(opener_id)
+                    opener = (await member_cache.resolve(channel.guild, [opener_id])).get(opener_id)
                     if opener:
                         html_parts.append(f"<div class='info-item'><strong>Opened By:</strong> {opener.name}#{opener.discriminator}</div>")
                     else:
@@ -255,9 +260,8 @@ class TranscriptGenerator:
             # Messages
             html_parts.append("<h2>Conversation Log</h2>")
             
-            messages = []
-            async for message in channel.history(limit=None, oldest_first=True):
-                messages.append(message)
+            if messages is None:
+                messages = await TranscriptGenerator.fetch_messages(channel)
             
             for message in messages:
                 if message.type != discord.MessageType.default:
@@ -0,0 +1,126 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+import discord
+from src import storage
+from src.utils.deferral import describe_interaction
+from src.utils.metrics import metrics
+
+# Frames kept from the blocking stack
+STACK_LIMIT = 15
+
+def get_watchdog_config() -> dict:
+    """Get the watchdog section of config.json with defaults applied"""
+    cfg = storage.load_app_config().get("watchdog", {}) or {}
+    return {
+        "enabled": bool(cfg.get("enabled", True)),
+        # Seconds between heartbeats
+        "interval": float(cfg.get("interval", 0.5)),
+        # Lag that counts as blocking
+        "threshold_ms": float(cfg.get("threshold_ms", 250)),
+        # asyncio debug mode reports every callback slower than the threshold, at some cost
+        "asyncio_debug": bool(cfg.get("asyncio_debug", False)),
+    }
+
+def describe_frame(frame) -> Optional[str]:
+    """Name the interaction (command or component) a blocked stack is handling, if any"""
+    while frame is not None:
+        interaction = frame.f_locals.get("interaction")
+        if isinstance(interaction, discord.Interaction):
+            return describe_interaction(interaction)
+        frame = frame.f_back
+    return None
+
+class LoopWatchdog:
+    """Measures event loop lag and reports what is blocking the loop
+
+    A heartbeat task on the loop records how late each wake-up is. A
+    separate thread notices when the heartbeat stops for longer than the
+    threshold and captures the loop thread's stack while it is still
+    blocked, along with the interaction or command being handled.
+    """
+
+    def __init__(self):
+        self._config: Optional[dict] = None
+        self.max_lag_ms = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        # Set by the monitor thread once it has reported the current stall
+        self._stall_reported = False
+
+    @property
+    def config(self) -> dict:
+        if self._config is None:
+            self._config = get_watchdog_config()
+        return self._config
+
+    def start(self):
+        """Start watching the running loop"""
+        if not self.config["enabled"] or self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._loop.slow_callback_duration = self.config["threshold_ms"] / 1000
+        if self.config["asyncio_debug"]:
+            self._loop.set_debug(True)
+
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = self._loop.create_task(self._heartbeat(), name="loop-watchdog")
+        self._thread = threading.Thread(target=self._monitor, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _heartbeat(self):
+        interval = self.config["interval"]
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(interval)
+            self._last_beat = now = time.monotonic()
+            lag_ms = max(now - started - interval, 0.0) * 1000
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+            metrics.set_gauge("loop.lag_ms", lag_ms)
+            metrics.set_gauge("loop.max_lag_ms", self.max_lag_ms)
+            if lag_ms >= self.config["threshold_ms"]:
+                metrics.incr("loop.stalls")
+
+            if self._stall_reported:
+                self._stall_reported = False
+                print(f"⏱️ Event loop unblocked, the heartbeat was {lag_ms:.0f} ms late")
+
+    def _monitor(self):
+        interval = self.config["interval"]
+        threshold = self.config["threshold_ms"] / 1000
+        while not self._stop.wait(interval / 2):
+            behind = time.monotonic() - self._last_beat - interval
+            if behind >= threshold and not self._stall_reported:
+                self._stall_reported = True
+                self._report(behind)
+
+    def _report(self, behind: float):
+        """Print the loop thread's current stack (runs in the monitor thread)"""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        source = describe_frame(frame)
+        task = asyncio.current_task(self._loop) if self._loop else None
+        stack = "".join(traceback.format_stack(frame)[-STACK_LIMIT:])
+        print(
+            f"⚠️ Event loop blocked for {behind * 1000:.0f} ms"
+            f" (handling: {source or 'no interaction'}, task: {task.get_name() if task else 'none'})\n{stack}"
+        )
+
+# Global event loop watchdog instance
+loop_watchdog = LoopWatchdog()